@@ -0,0 +1,111 @@
+"""Baglanti benchmark'i: her cagrida connect/close vs. havuzlanmis baglanti.
+
+500 kartlik bir calisma seansini taklit eder. Her kart icin ayni 4 SQL
+islemi calisir (kelime oku, review oku, review yaz, istatistik yaz);
+iki yol arasindaki tek fark baglantinin nasil alindigidir. Her iki yol da
+db.get_connection ile ayni PRAGMA profilini kullanir; profil etkisi ile
+havuz etkisi ayri ayri raporlanir.
+
+Kullanim:
+    python benchmarks/bench_db_connections.py [--cards 500]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import db  # noqa: E402
+from data import init_db  # noqa: E402
+
+
+def _steps(card_id):
+    """Bir kartin (sql, parametreler, yazma_mi) islemleri."""
+    today = date.today().isoformat()
+    next_day = (date.today() + timedelta(days=1)).isoformat()
+    return [
+        ("SELECT * FROM vocabulary WHERE id = ?", (card_id,), False),
+        ("SELECT * FROM reviews WHERE card_type = 'vocabulary' AND card_id = ?", (card_id,), False),
+        ("""INSERT INTO reviews (card_type, card_id, ease_factor, interval, repetitions, next_review, last_review)
+            VALUES ('vocabulary', ?, 2.5, 1, 1, ?, ?)
+            ON CONFLICT(card_type, card_id) DO UPDATE SET repetitions = repetitions + 1
+         """, (card_id, next_day, today), True),
+        ("""INSERT INTO stats (date, cards_reviewed, cards_correct) VALUES (?, 1, 1)
+            ON CONFLICT(date) DO UPDATE SET cards_reviewed = cards_reviewed + 1
+         """, (today,), True),
+    ]
+
+
+@contextlib.contextmanager
+def _connect_per_call(write):
+    """Eski davranis: her islem kendi baglantisini acip kapatir (ayni PRAGMA'lar)."""
+    conn = db.get_connection()
+    try:
+        yield conn
+        if write:
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def _pooled(write):
+    """Yeni davranis: thread'in kalici baglantisi."""
+    return db.transaction() if write else db.connection()
+
+
+def run_session(card_ids, acquire):
+    for card_id in card_ids:
+        for sql, params, write in _steps(card_id):
+            with acquire(write) as conn:
+                conn.execute(sql, params).fetchall()
+
+
+def bench_profile(profile, card_ids, tmp):
+    """Verilen PRAGMA profiliyle iki yolu calistir: {yol: saniye}."""
+    db.active_profile = lambda: profile
+    db.DB_PATH = os.path.join(tmp, f"bench-{profile}.db")
+    db.init_db()
+    results = {}
+    for name, acquire in (("connect-per-call", _connect_per_call), ("pooled", _pooled)):
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM reviews")
+            conn.execute("DELETE FROM stats")
+        start = time.perf_counter()
+        run_session(card_ids, acquire)
+        results[name] = time.perf_counter() - start
+    db.close_connections()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            init_db.ensure_content_db()
+        with contextlib.closing(sqlite3.connect(db.CONTENT_DB_PATH)) as conn:
+            card_ids = [r[0] for r in conn.execute(
+                "SELECT id FROM vocabulary ORDER BY id LIMIT ?", (args.cards,))]
+        results = {profile: bench_profile(profile, card_ids, tmp) for profile in ("classic", "wal")}
+
+    print(f"{len(card_ids)} kart, kart basina 4 DB islemi")
+    base = results["classic"]["connect-per-call"]
+    print(f"  {'profil':<8} {'yol':<18} {'sure':>10}  {'toplam':>7}  {'havuz':>6}")
+    for profile, timings in results.items():
+        per_call = timings["connect-per-call"]
+        for name, elapsed in timings.items():
+            print(f"  {profile:<8} {name:<18} {elapsed * 1000:7.1f} ms  "
+                  f"{base / elapsed:6.1f}x  {per_call / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,15 @@ if ! python -m PyInstaller --version &>/dev/null; then
     pip install pyinstaller
 fi
 
+# Bağımlılıklar (rich, numpy) binary'ye gömülür
+if ! python -c "import rich, numpy" &>/dev/null; then
+    echo "Bağımlılıklar yükleniyor..."
+    pip install -r requirements.txt
+fi
+
+echo "İçerik veritabanı derleniyor..."
+python src/data/init_db.py --force
+
 echo "Binary derleniyor..."
 python -m PyInstaller nihongo.spec --clean --noconfirm
 
@@ -23,7 +23,8 @@ a = Analysis(
     pathex=[os.path.join(ROOT, 'src')],
     binaries=[],
     datas=[
-        ('src/data/*.json', 'data'),
+        # build.sh içerik DB'sini JSON'dan önceden derler (src/data/init_db.py)
+        ('src/data/content.db', 'data'),
         ('src/lang/*.json', 'lang'),
     ],
     hiddenimports=_rich_unicode,
@@ -1,197 +1,237 @@
 """Japonca fiil çekim motoru.
 
-3 grup:
+4 sınıf:
   - ichidan (一段): ~える/~いる son eki düşür + form eki
-  - godan (五段): son hece değişir (u-satırı → a/i/e satırı)
-  - irregular: する→します, くる→きます
+  - godan (五段): son hece değişir (u-satırı → a/i/e/o satırı)
+  - suru: する→します (勉強する→勉強します)
+  - kuru: くる→きます/こない (来る→来ます)
+
+Her fiilin sınıfı ve tüm çekim tablosu (paradigm) content.db derlenirken bir
+kez hesaplanır (data/init_db.py -> verbs / conjugations tabloları); quiz
+çalışırken sadece tablodan okur. Her çekim hem okuma (kana) hem yazılış
+(kanji) biçimiyle saklanır.
 """
 
+# Sözlükte fiil olarak işaretlenen sözcük türleri
+VERB_POS = ("fiil", "動詞")
 
 # Godan fiil: son karakter → satır dönüşümleri
 _GODAN_MAP = {
-    # dict → a-dan, i-dan, e-dan, te-form, ta-form
-    "う": ("わ", "い", "え", "って", "った"),
-    "く": ("か", "き", "け", "いて", "いた"),
-    "ぐ": ("が", "ぎ", "げ", "いで", "いだ"),
-    "す": ("さ", "し", "せ", "して", "した"),
-    "つ": ("た", "ち", "て", "って", "った"),
-    "ぬ": ("な", "に", "ね", "んで", "んだ"),
-    "ぶ": ("ば", "び", "べ", "んで", "んだ"),
-    "む": ("ま", "み", "め", "んで", "んだ"),
-    "る": ("ら", "り", "れ", "って", "った"),
+    # dict → a-dan, i-dan, e-dan, o-dan, te-form, ta-form
+    "う": ("わ", "い", "え", "お", "って", "った"),
+    "く": ("か", "き", "け", "こ", "いて", "いた"),
+    "ぐ": ("が", "ぎ", "げ", "ご", "いで", "いだ"),
+    "す": ("さ", "し", "せ", "そ", "して", "した"),
+    "つ": ("た", "ち", "て", "と", "って", "った"),
+    "ぬ": ("な", "に", "ね", "の", "んで", "んだ"),
+    "ぶ": ("ば", "び", "べ", "ぼ", "んで", "んだ"),
+    "む": ("ま", "み", "め", "も", "んで", "んだ"),
+    "る": ("ら", "り", "れ", "ろ", "って", "った"),
 }
 
-# 行く は特殊: いって/いった
-_SPECIAL_GODAN = {
-    "いく": {"te": "いって", "ta": "いった"},
-    "行く": {"te": "行って", "ta": "行った"},
+# Godan olmasına rağmen ~える/~いる ile biten fiiller (yazılışa göre;
+# かえる/きる/いる gibi okumalar iki sınıfta da olduğu için okumaya bakılmaz)
+_GODAN_EXCEPTIONS = {
+    "帰る", "入る", "走る", "知る", "切る", "要る", "参る", "散る", "陥る",
+    "しゃべる", "喋る", "焦る", "限る", "握る", "練る", "蹴る", "滑る", "減る",
+    "遮る", "茂る", "湿る", "覆る", "嘲る", "罵る", "捻る", "蘇る", "翻る", "耽る",
+    "侮る", "照る", "競る", "混じる", "詰る",
+}
+
+_ICHIDAN_VOWELS = "いきしちにひみりぎじびぴえけせてねへめれげぜでべぺ"
+
+# Form → çekim eki; godan için (satır, ek), satır: a/i/e/o sütunu
+_GODAN_FORMS = {
+    "masu": ("i", "ます"),
+    "masen": ("i", "ません"),
+    "mashita": ("i", "ました"),
+    "masen_deshita": ("i", "ませんでした"),
+    "nai": ("a", "ない"),
+    "potential": ("e", "る"),
+    "passive": ("a", "れる"),
+    "causative": ("a", "せる"),
+    "volitional": ("o", "う"),
+    "conditional": ("e", "ば"),
+    "imperative": ("e", ""),
 }
+_ROWS = {"a": 0, "i": 1, "e": 2, "o": 3}
 
-# Ichidan olduğu bilinen yaygın fiiller (godan ~える/~いる ile karışmaması için)
-_ICHIDAN_ENDINGS = [
-    "える", "いる",
-]
+_ICHIDAN_FORMS = {
+    "masu": "ます", "masen": "ません", "mashita": "ました", "masen_deshita": "ませんでした",
+    "nai": "ない", "te": "て", "ta": "た", "potential": "られる", "passive": "られる",
+    "causative": "させる", "volitional": "よう", "conditional": "れば", "imperative": "ろ",
+}
 
-# Godan olmasına rağmen ~える/~いる ile biten fiiller
-_GODAN_EXCEPTIONS = {
-    "帰る", "入る", "走る", "知る", "切る", "要る", "参る", "散る",
-    "しゃべる", "焦る", "限る", "握る", "練る", "蹴る", "滑る",
-    "かえる", "はいる", "はしる", "しる", "きる", "いる",
+# する'nın yerine geçen ek
+_SURU_FORMS = {
+    "masu": "します", "masen": "しません", "mashita": "しました", "masen_deshita": "しませんでした",
+    "nai": "しない", "te": "して", "ta": "した", "potential": "できる", "passive": "される",
+    "causative": "させる", "volitional": "しよう", "conditional": "すれば", "imperative": "しろ",
+}
+
+# くる: (kök hecesi, ek); yazılışta kök hecesi yerine 来 gelir
+_KURU_FORMS = {
+    "masu": ("き", "ます"), "masen": ("き", "ません"), "mashita": ("き", "ました"),
+    "masen_deshita": ("き", "ませんでした"), "nai": ("こ", "ない"), "te": ("き", "て"),
+    "ta": ("き", "た"), "potential": ("こ", "られる"), "passive": ("こ", "られる"),
+    "causative": ("こ", "させる"), "volitional": ("こ", "よう"), "conditional": ("く", "れば"),
+    "imperative": ("こ", "い"),
+}
+
+# Kurala uymayan godan çekimleri: okuma -> {form: (düşen_karakter, ek)}
+_SPECIAL_GODAN = {
+    "いく": {"te": (1, "って"), "ta": (1, "った")},
+    "ある": {"nai": (2, "ない")},
+    "とう": {"te": (1, "うて"), "ta": (1, "うた")},   # 問う -> 問うて
+    "こう": {"te": (1, "うて"), "ta": (1, "うた")},   # 請う -> 請うて
+}
+# 敬語 ~aru fiilleri: ます ve emir kökü い (いらっしゃいます, ください)
+for _reading in ("いらっしゃる", "おっしゃる", "くださる", "なさる", "ござる"):
+    _SPECIAL_GODAN[_reading] = {form: (1, "い" + suffix) for form, (row, suffix)
+                                in _GODAN_FORMS.items() if row == "i"}
+    _SPECIAL_GODAN[_reading]["imperative"] = (1, "い")
+
+
+# Fiilde kullanılmayan formlar (あれる, できられる...): okuma -> formlar; tabloya girmez
+_MISSING_FORMS = {
+    "ある": ("potential", "imperative"),
+    "できる": ("potential", "passive", "causative", "volitional", "imperative"),
+    "わかる": ("potential",),
 }
 
 
-def _is_ichidan(word, reading):
-    """Fiil ichidan mı?"""
-    # する/くる irregular
-    if reading in ("する", "くる") or word in ("する", "来る"):
-        return False
-    # Godan exception listesi
-    if word in _GODAN_EXCEPTIONS or reading in _GODAN_EXCEPTIONS:
-        return False
-    # ~える veya ~いる ile bitiyorsa ichidan
-    if reading.endswith("える") or reading.endswith("いる"):
-        return True
-    if reading.endswith("る") and len(reading) >= 2:
-        prev = reading[-2]
-        if prev in "えいけせてねべめれげぜでぺ":
-            return True
-    return False
-
-
-def _is_irregular(word, reading):
-    """する veya くる mu?"""
-    if reading == "する" or word == "する":
+def verb_class(word, reading):
+    """Fiilin çekim sınıfı: 'godan', 'ichidan', 'suru', 'kuru' ya da None."""
+    if not reading:
+        return None
+    # 磨る (する) godan, 出来る (できる) ichidan: sınıf yazılışla birlikte belirlenir
+    if word.endswith("する"):
         return "suru"
-    if reading == "くる" or word == "来る":
+    if reading.endswith("くる") and ("来" in word or word.endswith("くる")):
         return "kuru"
-    if reading.endswith("する") or word.endswith("する"):
-        return "suru_compound"
-    if reading.endswith("くる") or word.endswith("来る"):
-        return "kuru_compound"
-    return None
-
+    if reading[-1] not in _GODAN_MAP:
+        return None
+    if reading.endswith("る") and word not in _GODAN_EXCEPTIONS:
+        if len(reading) >= 2 and reading[-2] in _ICHIDAN_VOWELS:
+            return "ichidan"
+    return "godan"
 
-def conjugate(word, reading, form):
-    """Fiili çekimle.
 
-    form: 'masu', 'nai', 'te', 'ta', 'dict' (sözlük formu)
+def _inflect(word, reading, drop, suffix):
+    """Okumanın son `drop` karakterini `suffix` ile değiştir; yazılışa da aynısını uygula.
 
-    Returns: çekimlenmiş hali (reading bazlı)
+    Returns: (kana, kanji); yazılış okumayla aynı kana ile bitmiyorsa kanji = kana
     """
-    if form == "dict":
-        return reading
+    kana = reading[:-drop] + suffix
+    if word.endswith(reading[-drop:]):
+        return kana, word[:-drop] + suffix
+    return kana, kana
+
 
-    irr = _is_irregular(word, reading)
-    if irr:
-        return _conjugate_irregular(reading, form, irr)
+def paradigm(word, reading, cls=None):
+    """Fiilin tüm çekimleri: {form: (kana, kanji)}, FORMS sırasıyla.
 
-    if _is_ichidan(word, reading):
-        return _conjugate_ichidan(reading, form)
+    Fiilde kullanılmayan formlar (ある'nın emir hali gibi) atlanır; sınıfı
+    belirlenemeyen fiil için boş dict döner.
+    """
+    cls = cls or verb_class(word, reading)
+    if cls is None:
+        return {}
+    table = {}
+    if cls == "ichidan":
+        for form in FORMS:
+            table[form] = _inflect(word, reading, 1, _ICHIDAN_FORMS[form])
+    elif cls == "suru":
+        for form in FORMS:
+            table[form] = _inflect(word, reading, 2, _SURU_FORMS[form])
+    elif cls == "kuru":
+        prefix = reading[:-2]
+        stem = word[:-2] + "来" if word.endswith("来る") else word[:-2]
+        for form in FORMS:
+            syllable, suffix = _KURU_FORMS[form]
+            kanji = stem + suffix if word.endswith("来る") else stem + syllable + suffix
+            table[form] = (prefix + syllable + suffix, kanji)
     else:
-        return _conjugate_godan(reading, form)
+        a_dan, i_dan, e_dan, o_dan, te_form, ta_form = _GODAN_MAP[reading[-1]]
+        columns = (a_dan, i_dan, e_dan, o_dan)
+        special = _SPECIAL_GODAN.get(reading, {})
+        for form in FORMS:
+            if form in special:
+                table[form] = _inflect(word, reading, *special[form])
+            elif form == "te":
+                table[form] = _inflect(word, reading, 1, te_form)
+            elif form == "ta":
+                table[form] = _inflect(word, reading, 1, ta_form)
+            else:
+                row, suffix = _GODAN_FORMS[form]
+                table[form] = _inflect(word, reading, 1, columns[_ROWS[row]] + suffix)
+    for form in _MISSING_FORMS.get(reading, ()):
+        table.pop(form, None)
+    return table
+
+
+# Kendisi ichidan fiil gibi çekimlenen türev formlar (書かせる -> 書かせられた)
+_DERIVED = ("potential", "passive", "causative")
+
+# Ekli formlardan türeyenler: kaynak form -> [(düşen_karakter, ek)]
+_EXTENDED = {
+    "nai": [(1, "かった"), (1, "くて"), (1, "ければ")],              # 書かなかった
+    "masu": [(2, "たい"), (2, "たくない"), (2, "たかった")],        # 書きたい
+}
 
 
-def _conjugate_ichidan(reading, form):
-    """Ichidan fiil çekimi: stem = reading[:-1]"""
-    stem = reading[:-1]  # る'yu düşür
-    if form == "masu":
-        return stem + "ます"
-    elif form == "nai":
-        return stem + "ない"
-    elif form == "te":
-        return stem + "て"
-    elif form == "ta":
-        return stem + "た"
-    return reading
+def _with_extended(table, derived=True):
+    """Tablonun biçimleri + _EXTENDED; derived=False ise türev formlar atlanır
+    (türevin türevi, ör. 食べさせさせる, üretilmez)."""
+    forms = {pair for form, pair in table.items() if derived or form not in _DERIVED}
+    for source, rules in _EXTENDED.items():
+        kana, kanji = table[source]
+        forms.update(_inflect(kanji, kana, drop, suffix) for drop, suffix in rules)
+    return forms
 
 
-def _conjugate_godan(reading, form):
-    """Godan fiil çekimi."""
-    if not reading:
-        return reading
-
-    last = reading[-1]
-    stem = reading[:-1]
-
-    # Özel durum: 行く
-    if reading in _SPECIAL_GODAN:
-        spec = _SPECIAL_GODAN[reading]
-        if form == "te" and "te" in spec:
-            return spec["te"]
-        elif form == "ta" and "ta" in spec:
-            return spec["ta"]
-
-    if last not in _GODAN_MAP:
-        return reading
-
-    a_dan, i_dan, e_dan, te_form, ta_form = _GODAN_MAP[last]
-
-    if form == "masu":
-        return stem + i_dan + "ます"
-    elif form == "nai":
-        if last == "う":
-            return stem + "わない"
-        return stem + a_dan + "ない"
-    elif form == "te":
-        return stem + te_form
-    elif form == "ta":
-        return stem + ta_form
-    return reading
-
-
-def _conjugate_irregular(reading, form, irr_type):
-    """Düzensiz fiil çekimi."""
-    if irr_type == "suru":
-        if form == "masu":
-            return "します"
-        elif form == "nai":
-            return "しない"
-        elif form == "te":
-            return "して"
-        elif form == "ta":
-            return "した"
-        return reading
-    elif irr_type == "kuru":
-        if form == "masu":
-            return "きます"
-        elif form == "nai":
-            return "こない"
-        elif form == "te":
-            return "きて"
-        elif form == "ta":
-            return "きた"
-        return reading
-    elif irr_type == "suru_compound":
-        prefix = reading[:-2]  # ~する'yu çıkar
-        if form == "masu":
-            return prefix + "します"
-        elif form == "nai":
-            return prefix + "しない"
-        elif form == "te":
-            return prefix + "して"
-        elif form == "ta":
-            return prefix + "した"
-        return reading
-    elif irr_type == "kuru_compound":
-        prefix = reading[:-2]
-        if form == "masu":
-            return prefix + "きます"
-        elif form == "nai":
-            return prefix + "こない"
-        elif form == "te":
-            return prefix + "きて"
-        elif form == "ta":
-            return prefix + "きた"
-        return reading
-    return reading
+def inflections(word, reading, cls=None):
+    """Fiilin arama için çekimli biçimleri: {(kana, kanji)}.
+
+    Çekim tablosuna ek olarak olumsuz geçmiş (~なかった), istek (~たい) ve
+    türev fiillerin (ettirgen, edilgen, yeterlilik, ettirgen-edilgen)
+    kendi çekimleri de üretilir. Deinflection indeksi (data/init_db.py ->
+    deinflections) bu kümeden derlenir.
+    """
+    cls = cls or verb_class(word, reading)
+    if cls is None:
+        return set()
+    table = paradigm(word, reading, cls)
+    forms = _with_extended(table)
+    for derived in _DERIVED:
+        if derived not in table:
+            continue  # ある/できる'nın yeterlilik hali yok
+        kana, kanji = table[derived]
+        sub = paradigm(kanji, kana, "ichidan")
+        forms |= _with_extended(sub, derived=False)
+        if derived == "causative":
+            kana, kanji = sub["passive"]  # 書かせられる
+            forms |= _with_extended(paradigm(kanji, kana, "ichidan"), derived=False)
+    return forms
 
 
 # Form adları (quiz'de gösterilecek)
 FORM_NAMES = {
     "masu": ("ます形", "masu form"),
+    "masen": ("ません形", "polite negative"),
+    "mashita": ("ました形", "polite past"),
+    "masen_deshita": ("ませんでした形", "polite past negative"),
     "nai": ("ない形", "nai form"),
     "te": ("て形", "te form"),
     "ta": ("た形", "ta form"),
+    "potential": ("可能形", "potential"),
+    "passive": ("受身形", "passive"),
+    "causative": ("使役形", "causative"),
+    "volitional": ("意向形", "volitional"),
+    "conditional": ("仮定形 (ば)", "conditional"),
+    "imperative": ("命令形", "imperative"),
 }
 
-FORMS = ["masu", "nai", "te", "ta"]
+CLASS_NAMES = {"godan": "五段", "ichidan": "一段", "suru": "する", "kuru": "来る"}
+
+FORMS = list(FORM_NAMES)
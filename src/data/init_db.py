@@ -1,14 +1,48 @@
-"""Veritabanını oluştur ve başlangıç verilerini yükle."""
+"""İçerik veritabanını (content.db) JSON veri dosyalarından derle.
 
+Derleme adımı (build.sh) bu betiği çalıştırır; üretilen content.db binary
+ile birlikte dağıtılır ve çalışma zamanında salt okunur ATTACH edilir.
+Kullanıcı DB'si sadece reviews/stats tutar.
+
+Veri dosyaları (data/*.json) içerik hash'leri ile data_manifest tablosuna
+kaydedilir. Mevcut bir content.db güncellenirken sadece hash'i değişen
+dosyalar uygulanır; o dosyalarda da sadece eklenen/değişen satırlar yazılır.
+
+Kart id'leri doğal anahtara (db.CARD_KEYS) bağlıdır ve data/card_ids.json
+dosyasında (anahtar -> id) saklanır; dosyadaki sıra id'yi etkilemez. Yeni
+kartlar tablodaki en büyük id'nin ardından numaralanır, kaynaktan silinen
+kartlar tablodan da silinir (id'leri tekrar kullanılmaz). Böylece temiz
+derleme ile artımlı derleme aynı id'leri üretir ve kullanıcıların tekrar
+kayıtları yeni content.db ile geçerliliğini korur. card_ids.json derlemede
+güncellenir ve veri dosyalarıyla birlikte commit edilir.
+
+Kullanım:
+    python3 src/data/init_db.py [--force] [hedef.db]
+"""
+
+import hashlib
 import json
 import os
+import sqlite3
 import sys
+import time
+from datetime import datetime
 
 # Proje kök dizinini path'e ekle
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db import init_db, get_connection
-from paths import DATA_DIR
+from db import (content_transaction, init_content_db, fts_text,
+                create_content_indexes, drop_content_indexes,
+                CARD_KEYS, SEARCH_FIELDS, READING_FIELDS, MEANING_FIELDS)
+import kana
+from kana import reading_forms, is_kana
+import conjugation
+import distractors
+import sentences
+from paths import DATA_DIR, CONTENT_DB_PATH, FROZEN
+from version import __version__
+
+CARD_IDS_FILE = "card_ids.json"
 
 
 def load_json(filename):
@@ -23,252 +57,469 @@ VOCAB_FILES = [
 ]
 
 
-def seed_vocabulary():
-    conn = get_connection()
-
-    for level_file, level in VOCAB_FILES:
-        filepath = os.path.join(DATA_DIR, level_file)
-        if not os.path.exists(filepath):
-            continue
-        count = conn.execute(
-            "SELECT COUNT(*) as cnt FROM vocabulary WHERE level = ?", (level,)
-        ).fetchone()["cnt"]
-        if count > 0:
-            continue
-        data = load_json(level_file)
-        for item in data:
-            conn.execute("""
-                INSERT INTO vocabulary (word, reading, meaning_tr, meaning_en,
-                    meaning_de, meaning_fr, meaning_es, meaning_pt, meaning_ko, meaning_zh,
-                    level, example_jp, example_tr, part_of_speech)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                item["word"], item["reading"], item["meaning_tr"], item["meaning_en"],
-                item.get("meaning_de", ""), item.get("meaning_fr", ""),
-                item.get("meaning_es", ""), item.get("meaning_pt", ""),
-                item.get("meaning_ko", ""), item.get("meaning_zh", ""),
-                level, item.get("example_jp", ""), item.get("example_tr", ""),
-                item.get("part_of_speech", "")
-            ))
-        print(f"  {level}: {len(data)} kelime yüklendi.")
-
-    conn.commit()
-    conn.close()
-
-
 KANJI_FILES = [
     ("n5_kanji.json", "N5"), ("n4_kanji.json", "N4"), ("n3_kanji.json", "N3"),
     ("n2_kanji.json", "N2"), ("n1_kanji.json", "N1"),
 ]
 
-
-def seed_kanji():
-    conn = get_connection()
-
-    for level_file, level in KANJI_FILES:
-        filepath = os.path.join(DATA_DIR, level_file)
-        if not os.path.exists(filepath):
-            continue
-        count = conn.execute(
-            "SELECT COUNT(*) as cnt FROM kanji WHERE level = ?", (level,)
-        ).fetchone()["cnt"]
-        if count > 0:
-            continue
-        data = load_json(level_file)
-        for item in data:
-            conn.execute("""
-                INSERT OR IGNORE INTO kanji (kanji, on_yomi, kun_yomi, meaning_tr, meaning_en,
-                    meaning_de, meaning_fr, meaning_es, meaning_pt, meaning_ko, meaning_zh,
-                    level, stroke_count, compounds)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                item["kanji"], item["on_yomi"], item["kun_yomi"],
-                item["meaning_tr"], item["meaning_en"],
-                item.get("meaning_de", ""), item.get("meaning_fr", ""),
-                item.get("meaning_es", ""), item.get("meaning_pt", ""),
-                item.get("meaning_ko", ""), item.get("meaning_zh", ""),
-                level, item.get("stroke_count", 0), item.get("compounds", "")
-            ))
-        print(f"  {level}: {len(data)} kanji yüklendi.")
-
-    conn.commit()
-    conn.close()
-
-
-def seed_grammar():
-    conn = get_connection()
-    before = conn.execute("SELECT COUNT(*) as cnt FROM grammar").fetchone()["cnt"]
-
-    data = load_json("grammar.json")
-    # Ek grammar dosyalarini da yukle
-    for extra in ["grammar_n4_extra.json", "grammar_n3_extra.json"]:
-        extra_path = os.path.join(DATA_DIR, extra)
-        if os.path.exists(extra_path):
-            with open(extra_path, "r", encoding="utf-8") as f:
-                data.extend(json.load(f))
-
-    for item in data:
-        conn.execute("""
-            INSERT OR IGNORE INTO grammar (pattern, meaning_tr, meaning_en,
-                meaning_de, meaning_fr, meaning_es, meaning_pt, meaning_ko, meaning_zh,
-                level, example_jp, example_tr, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            item["pattern"], item["meaning_tr"], item["meaning_en"],
-            item.get("meaning_de", ""), item.get("meaning_fr", ""),
-            item.get("meaning_es", ""), item.get("meaning_pt", ""),
-            item.get("meaning_ko", ""), item.get("meaning_zh", ""),
-            item["level"], item.get("example_jp", ""), item.get("example_tr", ""),
-            item.get("notes", "")
-        ))
-
-    conn.commit()
-    after = conn.execute("SELECT COUNT(*) as cnt FROM grammar").fetchone()["cnt"]
-    added = after - before
-    if added > 0:
-        print(f"  Dilbilgisi: {added} yeni kural eklendi (toplam: {after}).")
-    else:
-        print(f"  Dilbilgisi: zaten güncel ({after} kural).")
-    conn.close()
-
-
-def migrate_extra_examples():
-    """Mevcut vocabulary tablosuna extra_examples sutunu ekle."""
-    conn = get_connection()
-    try:
-        conn.execute("ALTER TABLE vocabulary ADD COLUMN extra_examples TEXT DEFAULT ''")
-        conn.commit()
-    except Exception:
-        pass  # Column already exists
-    conn.close()
-
-
-def update_extra_examples():
-    """JSON'daki extra_examples verilerini DB'ye yaz."""
-    conn = get_connection()
-    for level_file, level in VOCAB_FILES:
-        filepath = os.path.join(DATA_DIR, level_file)
-        if not os.path.exists(filepath):
-            continue
-        data = load_json(level_file)
-        for item in data:
+GRAMMAR_FILES = ["grammar.json", "grammar_n4_extra.json", "grammar_n3_extra.json"]
+
+# Tablo -> (anahtar sütun, JSON'dan gelen sütunlar)
+_TABLES = {
+    "vocabulary": ("word", ["word", "reading"] + MEANING_FIELDS +
+                   ["level", "example_jp", "example_tr", "part_of_speech", "extra_examples"]),
+    "kanji": ("kanji", ["kanji", "on_yomi", "kun_yomi"] + MEANING_FIELDS +
+              ["level", "stroke_count", "compounds"]),
+    "grammar": ("pattern", ["pattern"] + MEANING_FIELDS +
+                ["level", "example_jp", "example_tr", "notes"]),
+}
+
+_LABELS = {"vocabulary": "kelime", "kanji": "kanji", "grammar": "dilbilgisi kuralı"}
+
+
+def data_sources():
+    """(tablo, seviye, dosyalar) listesi.
+
+    Grammar dosyaları tek kaynak sayılır: aynı pattern birden fazla dosyada
+    olabilir, ilk dosyadaki kayıt geçerlidir. Seviye None ise JSON'dan gelir.
+    """
+    sources = [("vocabulary", level, [f]) for f, level in VOCAB_FILES]
+    sources += [("kanji", level, [f]) for f, level in KANJI_FILES]
+    sources.append(("grammar", None, GRAMMAR_FILES))
+    result = []
+    for table, level, files in sources:
+        files = [f for f in files if os.path.exists(os.path.join(DATA_DIR, f))]
+        if files:
+            result.append((table, level, files))
+    return result
+
+
+def file_hash(filename):
+    with open(os.path.join(DATA_DIR, filename), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _item_values(item, level, columns):
+    values = []
+    for col in columns:
+        if col == "level":
+            values.append(level or item["level"])
+        elif col == "extra_examples":
             extras = item.get("extra_examples")
-            if extras:
-                conn.execute(
-                    "UPDATE vocabulary SET extra_examples = ? WHERE word = ? AND level = ?",
-                    (json.dumps(extras, ensure_ascii=False), item["word"], level)
-                )
-    conn.commit()
-    conn.close()
-
-
-def migrate_meanings():
-    """Mevcut tablolara çoklu dil meaning sütunları ekle."""
-    conn = get_connection()
-    langs = ["de", "fr", "es", "pt", "ko", "zh"]
-    for table in ["vocabulary", "kanji", "grammar"]:
-        for lang in langs:
-            col = f"meaning_{lang}"
-            try:
-                conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} TEXT DEFAULT ''")
-            except Exception:
-                pass
-    conn.commit()
-    conn.close()
-
-
-def update_meanings():
-    """JSON'daki çoklu dil meaning verilerini DB'ye yaz."""
-    conn = get_connection()
-    langs = ["de", "fr", "es", "pt", "ko", "zh"]
-
-    # Vocabulary
-    for level_file, level in VOCAB_FILES:
-        filepath = os.path.join(DATA_DIR, level_file)
-        if not os.path.exists(filepath):
-            continue
-        data = load_json(level_file)
-        for item in data:
-            sets = []
-            vals = []
-            for lang in langs:
-                key = f"meaning_{lang}"
-                if item.get(key):
-                    sets.append(f"{key} = ?")
-                    vals.append(item[key])
-            if sets:
-                vals.extend([item["word"], level])
-                conn.execute(
-                    f"UPDATE vocabulary SET {', '.join(sets)} WHERE word = ? AND level = ?",
-                    vals
-                )
-
-    # Kanji
-    for level_file, level in KANJI_FILES:
-        filepath = os.path.join(DATA_DIR, level_file)
-        if not os.path.exists(filepath):
+            values.append(json.dumps(extras, ensure_ascii=False) if extras else "")
+        elif col == "stroke_count":
+            values.append(item.get(col, 0))
+        else:
+            values.append(item.get(col, ""))
+    return tuple(values)
+
+
+def _card_key(row, keys):
+    return "\t".join(str(row[k]) for k in keys)
+
+
+def load_card_ids(conn):
+    """Kalıcı anahtar -> id haritasını yükle: {tablo: {anahtar: id}}.
+
+    card_ids.json esastır; dosyada olmayan mevcut satırlar (eski content.db)
+    id'leriyle eklenir. Returns: (harita, tutarlı) - tablo haritayla çelişiyorsa
+    (başka id ya da aynı id'de başka kart) tutarlı False olur.
+    """
+    path = os.path.join(DATA_DIR, CARD_IDS_FILE)
+    saved = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    card_ids = {table: dict(saved.get(table, {})) for table in CARD_KEYS}
+    consistent = True
+    for table, keys in CARD_KEYS.items():
+        ids = card_ids[table]
+        owners = {card_id: key for key, card_id in ids.items()}
+        for row in conn.execute(f"SELECT id, {', '.join(keys)} FROM {table}"):
+            key = _card_key(row, keys)
+            if key not in ids and row["id"] not in owners:
+                ids[key] = row["id"]
+                owners[row["id"]] = key
+            elif ids.get(key) != row["id"]:
+                consistent = False
+    return card_ids, consistent
+
+
+def save_card_ids(card_ids):
+    """Haritayı id sırasıyla, satır başına bir kart olacak şekilde yaz (değiştiyse)."""
+    path = os.path.join(DATA_DIR, CARD_IDS_FILE)
+    lines = []
+    for table in CARD_KEYS:
+        entries = sorted(card_ids[table].items(), key=lambda item: item[1])
+        body = ",\n".join(f"    {json.dumps(k, ensure_ascii=False)}: {v}" for k, v in entries)
+        lines.append(f'  "{table}": {{\n{body}\n  }}')
+    text = "{\n" + ",\n".join(lines) + "\n}\n"
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _source_rows(table, level, files):
+    """Kaynağın satırlarını (anahtar, değerler) olarak üret; tekrar edenleri atla."""
+    key, columns = _TABLES[table]
+    seen = set()
+    for filename in files:
+        for item in load_json(filename):
+            if item[key] in seen:
+                continue
+            seen.add(item[key])
+            yield item[key], _item_values(item, level, columns)
+
+
+def apply_source(conn, table, level, files, card_ids):
+    """Bir kaynağı tabloya uygula: yeni satırları ekle, değişenleri güncelle,
+    kaynakta artık olmayanları sil.
+
+    Yeni satırların id'si card_ids'ten gelir; haritada yoksa en büyük id'nin
+    ardından ayrılıp haritaya eklenir. Boş tabloda (ilk derleme) satırlar
+    doğrudan executemany'ye akıtılır.
+    Returns: (eklenen, güncellenen, silinen)
+    """
+    key, columns = _TABLES[table]
+    keys = CARD_KEYS[table]
+    ids = card_ids[table]
+    next_id = [max(ids.values(), default=0) + 1]
+
+    def with_id(values):
+        card_key = _card_key(dict(zip(columns, values)), keys)
+        if card_key not in ids:
+            ids[card_key] = next_id[0]
+            next_id[0] += 1
+        return (ids[card_key],) + values
+
+    insert_sql = (f"INSERT INTO {table} (id, {', '.join(columns)}) "
+                  f"VALUES ({', '.join('?' * (len(columns) + 1))})")
+    query = f"SELECT id, {', '.join(columns)} FROM {table}"
+    params = []
+    if table == "vocabulary":
+        query += " WHERE level = ?"  # kelimeler seviye içinde tekil
+        params.append(level)
+    existing = {r[key]: r for r in conn.execute(query, params)}
+
+    if not existing:
+        rows = _source_rows(table, level, files)
+        cur = conn.executemany(insert_sql, (with_id(values) for _, values in rows))
+        return cur.rowcount, 0, 0
+
+    inserts, updates, present = [], [], set()
+    for item_key, values in _source_rows(table, level, files):
+        present.add(item_key)
+        row = existing.get(item_key)
+        if row is None:
+            inserts.append(with_id(values))
+        elif level and row["level"] != level:
+            continue  # kanji daha düşük bir seviyede zaten kayıtlı
+        elif tuple(row)[1:] != values:
+            updates.append(values + (row["id"],))
+    # Kaynaktan çıkarılanlar (kanji'de sadece bu seviyede kayıtlı olanlar)
+    deletes = [(row["id"],) for item_key, row in existing.items()
+               if item_key not in present and (not level or row["level"] == level)]
+    conn.executemany(f"DELETE FROM {table} WHERE id = ?", deletes)
+    conn.executemany(
+        f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+        updates
+    )
+    conn.executemany(insert_sql, inserts)
+    return len(inserts), len(updates), len(deletes)
+
+
+def pending_sources(conn, force=False):
+    """Hash'i manifest'tekinden farklı olan kaynaklar: [(tablo, seviye, dosyalar, hash'ler)].
+
+    Bir tablonun tek dosyası değişse de o tablonun tüm kaynakları uygulanır;
+    seviyesi değişen kanji (bir dosyadan silinip diğerine eklenen) böylece
+    artımlı derlemede de temiz derlemedeki gibi yer alır.
+    """
+    manifest = {r["filename"]: r["sha256"]
+                for r in conn.execute("SELECT filename, sha256 FROM data_manifest")}
+    sources = [(table, level, files, {f: file_hash(f) for f in files})
+               for table, level, files in data_sources()]
+    changed = {table for table, _, _, digests in sources
+               if force or any(manifest.get(f) != d for f, d in digests.items())}
+    return [source for source in sources if source[0] in changed]
+
+
+def sync_data_files(conn, card_ids, force=False, verbose=True):
+    """Hash'i değişen veri kaynaklarını uygula (çağıranın transaction'ında).
+
+    Returns: uygulanan kaynaklar için (etiket, eklenen, güncellenen, saniye) listesi
+    """
+    applied = []
+    now = datetime.now().isoformat(timespec="seconds")
+    for table, level, files, digests in pending_sources(conn, force):
+        start = time.perf_counter()
+        inserted, updated, deleted = apply_source(conn, table, level, files, card_ids)
+        conn.executemany("""
+            INSERT INTO data_manifest (filename, sha256, applied_at) VALUES (?, ?, ?)
+            ON CONFLICT(filename) DO UPDATE SET
+                sha256 = excluded.sha256, applied_at = excluded.applied_at
+        """, [(f, d, now) for f, d in digests.items()])
+        label = f"{level} {_LABELS[table]}" if level else "Dilbilgisi"
+        applied.append((label, inserted, updated, time.perf_counter() - start))
+        if verbose and (inserted or updated or deleted):
+            print(f"  {level or 'Dilbilgisi'}: {inserted} {_LABELS[table]} eklendi, "
+                  f"{updated} güncellendi, {deleted} silindi.")
+    return applied
+
+
+def _search_row(card_type, row, fields, readings):
+    """search_index satiri: ham jp, hiragana'ya katlanmis kana, romaji, anlamlar."""
+    forms = [f for name in readings for f in reading_forms(row[name])]
+    return (
+        card_type, row["id"],
+        fts_text(" / ".join(row[f] or "" for f in fields)),
+        fts_text(" / ".join(hira for hira, _ in forms)),
+        " ".join(rom for hira, rom in forms if is_kana(hira)),
+        fts_text(" / ".join(row[f] or "" for f in MEANING_FIELDS)),
+    )
+
+
+def _has_search_index(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'search_index'"
+    ).fetchone() is not None
+
+
+def rebuild_search_index(conn, force=False):
+    """search_index FTS tablosunu içerik tablolarından yeniden oluştur.
+
+    Sürüm ve satır sayıları değişmediyse (force=False) atlanır.
+    """
+    if not _has_search_index(conn):
+        return
+    signature = _signature(conn, "search_index")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'search_index'").fetchone()
+    if not force and row and row["value"] == signature:
+        return
+    conn.execute("DELETE FROM search_index")
+    for card_type, fields in SEARCH_FIELDS.items():
+        readings = READING_FIELDS[card_type]
+        cols = list(dict.fromkeys(fields + readings + MEANING_FIELDS))
+        rows = conn.execute(f"SELECT id, {', '.join(cols)} FROM {card_type}").fetchall()
+        conn.executemany(
+            "INSERT INTO search_index (card_type, card_id, jp, kana, romaji, meaning) VALUES (?, ?, ?, ?, ?, ?)",
+            (_search_row(card_type, r, fields, readings) for r in rows)
+        )
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('search_index', ?)", (signature,))
+
+
+def _signature(conn, key):
+    """Türev tablonun imzası: sürüm, kaynak tablo satır sayıları ve tabloyu
+    üreten modülün kaynak hash'i (kural değişince tablo yeniden üretilir)."""
+    tables, module = DERIVED[key]
+    counts = [conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables]
+    with open(module.__file__, "rb") as f:
+        rules = hashlib.sha256(f.read()).hexdigest()[:12]
+    return f"{__version__}:{counts}:{rules}"
+
+
+# Derlemede üretilen türev tablolar: meta anahtarı -> (imzadaki tablolar, üreten modül).
+# Meta'daki imza güncel değilse content.db eskidir.
+DERIVED = {
+    "search_index": (tuple(SEARCH_FIELDS), kana),
+    "distractors": (("vocabulary", "kanji"), distractors),
+    "sentence_chunks": (("vocabulary",), sentences),
+    "conjugations": (("vocabulary",), conjugation),
+    "deinflections": (("vocabulary", "verbs"), conjugation),
+}
+
+
+def rebuild_distractors(conn, force=False):
+    """distractors tablosunu seviye ve anlam dili başına yeniden hesapla.
+
+    Sürüm ve satır sayıları değişmediyse (force=False) atlanır.
+    """
+    signature = _signature(conn, "distractors")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'distractors'").fetchone()
+    if not force and row and row["value"] == signature:
+        return
+    conn.execute("DELETE FROM distractors")
+    for card_type in ("vocabulary", "kanji"):
+        levels = [r[0] for r in conn.execute(f"SELECT DISTINCT level FROM {card_type}")]
+        for level in levels:
+            rows = conn.execute(f"SELECT * FROM {card_type} WHERE level = ?", (level,)).fetchall()
+            index = distractors.build(card_type, rows, MEANING_FIELDS)
+            conn.executemany(
+                "INSERT INTO distractors (card_type, lang, card_id, ids) VALUES (?, ?, ?, ?)",
+                ((card_type, field[len("meaning_"):], card_id, ",".join(map(str, ids)))
+                 for field, lists in index.items() for card_id, ids in lists.items())
+            )
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('distractors', ?)", (signature,))
+
+
+def rebuild_sentence_chunks(conn, force=False):
+    """sentence_chunks tablosunu kelime örnek cümlelerinden yeniden oluştur."""
+    signature = _signature(conn, "sentence_chunks")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'sentence_chunks'").fetchone()
+    if not force and row and row["value"] == signature:
+        return
+    conn.execute("DELETE FROM sentence_chunks")
+    rows = conn.execute("SELECT id, level, example_jp, extra_examples FROM vocabulary ORDER BY id")
+    conn.executemany(
+        "INSERT INTO sentence_chunks (vocab_id, level, sentence, chunks, chunk_count) VALUES (?, ?, ?, ?, ?)",
+        (chunk for r in rows.fetchall() for chunk in sentences.chunk_rows(r))
+    )
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('sentence_chunks', ?)", (signature,))
+
+
+def rebuild_conjugations(conn, force=False):
+    """verbs ve conjugations tablolarını fiillerin çekim tablolarıyla yeniden oluştur."""
+    signature = _signature(conn, "conjugations")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'conjugations'").fetchone()
+    if not force and row and row["value"] == signature:
+        return
+    conn.execute("DELETE FROM verbs")
+    conn.execute("DELETE FROM conjugations")
+    marks = ",".join("?" * len(conjugation.VERB_POS))
+    rows = conn.execute(
+        f"SELECT id, level, word, reading FROM vocabulary WHERE part_of_speech IN ({marks}) ORDER BY id",
+        conjugation.VERB_POS
+    ).fetchall()
+    for r in rows:
+        cls = conjugation.verb_class(r["word"] or "", r["reading"] or "")
+        if cls is None:
             continue
-        data = load_json(level_file)
-        for item in data:
-            sets = []
-            vals = []
-            for lang in langs:
-                key = f"meaning_{lang}"
-                if item.get(key):
-                    sets.append(f"{key} = ?")
-                    vals.append(item[key])
-            if sets:
-                vals.append(item["kanji"])
-                conn.execute(
-                    f"UPDATE kanji SET {', '.join(sets)} WHERE kanji = ?",
-                    vals
-                )
-
-    # Grammar
-    filepath = os.path.join(DATA_DIR, "grammar.json")
-    if os.path.exists(filepath):
-        data = load_json("grammar.json")
-        for item in data:
-            sets = []
-            vals = []
-            for lang in langs:
-                key = f"meaning_{lang}"
-                if item.get(key):
-                    sets.append(f"{key} = ?")
-                    vals.append(item[key])
-            if sets:
-                vals.append(item["pattern"])
-                conn.execute(
-                    f"UPDATE grammar SET {', '.join(sets)} WHERE pattern = ?",
-                    vals
-                )
-
-    conn.commit()
-    conn.close()
-
-
-def migrate_grammar_unique():
-    """Mevcut grammar tablosuna UNIQUE kısıtlaması ekle (yoksa)."""
-    conn = get_connection()
+        conn.execute("INSERT INTO verbs (vocab_id, level, verb_class) VALUES (?, ?, ?)",
+                     (r["id"], r["level"], cls))
+        conn.executemany(
+            "INSERT INTO conjugations (vocab_id, form, kana, kanji) VALUES (?, ?, ?, ?)",
+            ((r["id"], form, kana, kanji)
+             for form, (kana, kanji) in conjugation.paradigm(r["word"] or "", r["reading"], cls).items())
+        )
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('conjugations', ?)", (signature,))
+
+
+def rebuild_deinflections(conn, force=False):
+    """deinflections ters indeksini (çekimli biçim -> sözlük formu) verbs tablosundan
+    yeniden oluştur. rebuild_conjugations'tan sonra çağrılmalı."""
+    signature = _signature(conn, "deinflections")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'deinflections'").fetchone()
+    if not force and row and row["value"] == signature:
+        return
+    conn.execute("DELETE FROM deinflections")
+    rows = conn.execute(
+        "SELECT v.id, v.word, v.reading, b.verb_class FROM verbs b "
+        "JOIN vocabulary v ON v.id = b.vocab_id ORDER BY v.id"
+    ).fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO deinflections (form, vocab_id) VALUES (?, ?)",
+        ((form, r["id"])
+         for r in rows
+         for pair in conjugation.inflections(r["word"] or "", r["reading"], r["verb_class"])
+         for form in set(pair))
+    )
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('deinflections', ?)", (signature,))
+
+
+def build_content_db(path=CONTENT_DB_PATH, force=False, verbose=True):
+    """content.db'yi derle ya da güncelle.
+
+    Yeni dosyada ikincil indeksler yükleme bitince tek seferde kurulur;
+    mevcut dosyada sadece değişen kaynaklar uygulanır.
+    Returns: [(aşama, saniye)] süre listesi
+    """
+    fresh = not os.path.exists(path)
+    timings = []
+    with content_transaction(path) as conn:
+        start = time.perf_counter()
+        init_content_db(conn, indexes=not fresh)
+        if fresh:
+            drop_content_indexes(conn)
+        timings.append(("Şema", time.perf_counter() - start))
+
+        card_ids, consistent = load_card_ids(conn)
+        if not consistent:
+            # Tablo id haritasıyla çelişiyor: kart tabloları haritaya göre baştan yazılır
+            for table in CARD_KEYS:
+                conn.execute(f"DELETE FROM {table}")
+            force = True
+        applied = sync_data_files(conn, card_ids, force=force, verbose=verbose)
+        save_card_ids(card_ids)
+        timings += [(f"{label} ({inserted})", seconds) for label, inserted, _, seconds in applied]
+
+        start = time.perf_counter()
+        create_content_indexes(conn)
+        timings.append(("İndeksler", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        rebuild_search_index(conn, force=force or bool(applied))
+        timings.append(("Arama indeksi", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        rebuild_distractors(conn, force=force or bool(applied))
+        timings.append(("Çeldiriciler", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        rebuild_sentence_chunks(conn, force=force or bool(applied))
+        timings.append(("Cümle parçaları", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        rebuild_conjugations(conn, force=force or bool(applied))
+        timings.append(("Çekim tabloları", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        rebuild_deinflections(conn, force=force or bool(applied))
+        timings.append(("Ters çekim indeksi", time.perf_counter() - start))
+        start = time.perf_counter()
+    timings.append(("Commit", time.perf_counter() - start))
+    return timings
+
+
+def content_db_stale(path=CONTENT_DB_PATH):
+    """content.db yok mu, JSON dosyaları ondan sonra değişti mi ya da
+    türev tablolardan biri eksik/eski mi?"""
+    if not os.path.exists(path):
+        return True
     try:
-        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_grammar_pattern ON grammar(pattern)")
-        conn.commit()
-    except Exception:
-        pass
-    conn.close()
-
-
-def main():
-    print("Veritabanı oluşturuluyor...")
-    init_db()
-    migrate_grammar_unique()
-    print("Tablolar oluşturuldu.\n")
-
-    print("Veriler yükleniyor...")
-    seed_vocabulary()
-    seed_kanji()
-    seed_grammar()
-    print("\nVeritabanı hazır!")
+        with content_transaction(path) as conn:
+            if pending_sources(conn):
+                return True
+            done = {r["key"]: r["value"] for r in conn.execute("SELECT key, value FROM meta")}
+            keys = [k for k in DERIVED if k != "search_index" or _has_search_index(conn)]
+            return any(done.get(k) != _signature(conn, k) for k in keys)
+    except sqlite3.Error:
+        return True  # eski/bozuk dosya; yeniden derlenir
+
+
+def ensure_content_db():
+    """Kaynaktan çalışırken content.db'yi gerekirse derle.
+
+    Binary (frozen) içindeki content.db derleme adımında üretilmiştir;
+    orada JSON dosyaları dağıtılmaz, kontrol atlanır.
+    """
+    if FROZEN or not content_db_stale():
+        return False
+    print("İçerik veritabanı derleniyor...")
+    build_content_db(verbose=False)
+    return True
+
+
+def _print_timings(timings):
+    print("\nSüre raporu:")
+    for label, seconds in timings:
+        print(f"  {label:<24} {seconds * 1000:8.1f} ms")
+    total = sum(seconds for _, seconds in timings)
+    print(f"  {'Toplam':<24} {total * 1000:8.1f} ms")
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    force = "--force" in args
+    targets = [a for a in args if not a.startswith("--")]
+    path = targets[0] if targets else CONTENT_DB_PATH
+
+    print(f"İçerik veritabanı derleniyor: {path}")
+    timings = build_content_db(path, force=force)
+    _print_timings(timings)
+    print("\nİçerik veritabanı hazır!")
 
 
 if __name__ == "__main__":
@@ -1,123 +1,500 @@
 """Veritabanı işlemleri - SQLite3 ile JLPT öğrenme veritabanı."""
 
+import atexit
+import hashlib
+import json
 import sqlite3
 import os
+import re
 import shutil
-from datetime import datetime, date
-
-from paths import DB_PATH
+import threading
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from pathlib import Path
+
+import kana
+from paths import DB_PATH, CONTENT_DB_PATH
+from i18n import get_db_profile
+
+# Baglanti basina bir kez uygulanan PRAGMA profilleri. config.json'daki
+# "db_profile" anahtari ile secilir.
+#   wal     - WAL journal + synchronous=NORMAL: commit'ler ucuz, okumalar
+#             yazmalarla (TTS, import) eszamanli calisabilir
+#   classic - eski davranis: rollback journal, synchronous=FULL
+#             (WAL desteklemeyen ag dosya sistemleri icin)
+PRAGMA_PROFILES = {
+    "wal": [
+        ("foreign_keys", "ON"),
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", 64 * 1024 * 1024),
+        ("cache_size", -16000),  # KiB
+        ("temp_store", "MEMORY"),
+        ("busy_timeout", 5000),
+    ],
+    "classic": [
+        ("foreign_keys", "ON"),
+        ("journal_mode", "DELETE"),
+        ("synchronous", "FULL"),
+    ],
+}
+
+
+def active_profile():
+    name = get_db_profile()
+    return name if name in PRAGMA_PROFILES else "wal"
 
 
 def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+    """Yeni (havuz disi) bir baglanti ac. Cagiran kapatmakla sorumlu.
+
+    Kullanici DB'si (reviews, stats, meta) main semasidir; icerik DB'si
+    (vocabulary, kanji, grammar, search_index) salt okunur olarak
+    'content' adiyla eklenir. Tablo adlari niteliksiz kullanilabilir.
+    """
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, uri=True)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    for pragma, value in PRAGMA_PROFILES[active_profile()]:
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    if os.path.exists(CONTENT_DB_PATH):
+        conn.execute("ATTACH DATABASE ? AS content",
+                     (Path(CONTENT_DB_PATH).resolve().as_uri() + "?mode=ro",))
     return conn
 
 
-def init_db():
-    """Veritabanı tablolarını oluştur."""
-    conn = get_connection()
-    c = conn.cursor()
-
-    c.executescript("""
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            word TEXT NOT NULL,
-            reading TEXT NOT NULL,
-            meaning_tr TEXT NOT NULL,
-            meaning_en TEXT NOT NULL,
-            meaning_de TEXT DEFAULT '',
-            meaning_fr TEXT DEFAULT '',
-            meaning_es TEXT DEFAULT '',
-            meaning_pt TEXT DEFAULT '',
-            meaning_ko TEXT DEFAULT '',
-            meaning_zh TEXT DEFAULT '',
-            level TEXT NOT NULL CHECK(level IN ('N5','N4','N3','N2','N1')),
-            example_jp TEXT DEFAULT '',
-            example_tr TEXT DEFAULT '',
-            part_of_speech TEXT DEFAULT '',
-            extra_examples TEXT DEFAULT ''
-        );
-
-        CREATE TABLE IF NOT EXISTS kanji (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            kanji TEXT NOT NULL UNIQUE,
-            on_yomi TEXT NOT NULL,
-            kun_yomi TEXT NOT NULL,
-            meaning_tr TEXT NOT NULL,
-            meaning_en TEXT NOT NULL,
-            meaning_de TEXT DEFAULT '',
-            meaning_fr TEXT DEFAULT '',
-            meaning_es TEXT DEFAULT '',
-            meaning_pt TEXT DEFAULT '',
-            meaning_ko TEXT DEFAULT '',
-            meaning_zh TEXT DEFAULT '',
-            level TEXT NOT NULL CHECK(level IN ('N5','N4','N3','N2','N1')),
-            stroke_count INTEGER DEFAULT 0,
-            compounds TEXT DEFAULT ''
-        );
-
-        CREATE TABLE IF NOT EXISTS grammar (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            pattern TEXT NOT NULL UNIQUE,
-            meaning_tr TEXT NOT NULL,
-            meaning_en TEXT NOT NULL,
-            meaning_de TEXT DEFAULT '',
-            meaning_fr TEXT DEFAULT '',
-            meaning_es TEXT DEFAULT '',
-            meaning_pt TEXT DEFAULT '',
-            meaning_ko TEXT DEFAULT '',
-            meaning_zh TEXT DEFAULT '',
-            level TEXT NOT NULL CHECK(level IN ('N5','N4','N3','N2','N1')),
-            example_jp TEXT DEFAULT '',
-            example_tr TEXT DEFAULT '',
-            notes TEXT DEFAULT ''
-        );
-
-        CREATE TABLE IF NOT EXISTS reviews (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            card_type TEXT NOT NULL CHECK(card_type IN ('vocabulary','kanji','grammar')),
-            card_id INTEGER NOT NULL,
-            ease_factor REAL NOT NULL DEFAULT 2.5,
-            interval INTEGER NOT NULL DEFAULT 0,
-            repetitions INTEGER NOT NULL DEFAULT 0,
-            next_review TEXT NOT NULL,
-            last_review TEXT,
-            UNIQUE(card_type, card_id)
-        );
-
-        CREATE TABLE IF NOT EXISTS stats (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT NOT NULL,
-            cards_reviewed INTEGER DEFAULT 0,
-            cards_correct INTEGER DEFAULT 0,
-            cards_new INTEGER DEFAULT 0,
-            study_seconds INTEGER DEFAULT 0,
-            UNIQUE(date)
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_reviews_next ON reviews(next_review);
-        CREATE INDEX IF NOT EXISTS idx_reviews_type ON reviews(card_type);
-        CREATE INDEX IF NOT EXISTS idx_vocab_level ON vocabulary(level);
-        CREATE INDEX IF NOT EXISTS idx_kanji_level ON kanji(level);
-        CREATE INDEX IF NOT EXISTS idx_grammar_level ON grammar(level);
-    """)
-
-    # Migration: weak_kanji kolonu (okuma biliyor ama kanji bilmiyor)
+def describe_profile():
+    """Aktif profili ve baglantidaki gercek PRAGMA degerlerini dondur.
+
+    Returns:
+        (profil_adi, [(pragma, beklenen, gercek), ...])
+    """
+    name = active_profile()
+    rows = []
+    with connection() as conn:
+        for pragma, value in PRAGMA_PROFILES[name]:
+            actual = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+            rows.append((pragma, value, actual))
+    return name, rows
+
+
+# --- Baglanti havuzu ---
+# Her thread icin tek, uzun omurlu bir baglanti. Fonksiyonlar her cagrida
+# connect/close yapmak yerine connection()/transaction() kullanir.
+
+_local = threading.local()
+_pool = {}
+_pool_lock = threading.Lock()
+
+
+def _pooled_connection():
+    tid = threading.get_ident()
+    conn = _pool.get(tid)
+    if conn is None:
+        conn = get_connection()
+        with _pool_lock:
+            _pool[tid] = conn
+    return conn
+
+
+@contextmanager
+def connection():
+    """Thread'in kalici baglantisini ver (okuma icin, commit yapmaz)."""
+    yield _pooled_connection()
+
+
+@contextmanager
+def transaction():
+    """Yazma blogu: basarida commit, hatada rollback.
+    Ic ice kullanimda sadece en distaki blok commit eder."""
+    conn = _pooled_connection()
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
     try:
-        conn.execute("ALTER TABLE reviews ADD COLUMN weak_kanji INTEGER DEFAULT 0")
+        yield conn
+    except BaseException:
+        _local.depth = depth
+        if depth == 0:
+            conn.rollback()
+        raise
+    _local.depth = depth
+    if depth == 0:
+        conn.commit()
+
+
+def close_connections():
+    """Havuzdaki tum baglantilari kapat (restore, --init gibi dosya islemlerinden once)."""
+    with _pool_lock:
+        conns = list(_pool.values())
+        _pool.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+atexit.register(close_connections)
+
+
+# --- Icerik DB'si (content.db) ---
+# data/init_db.py JSON dosyalarindan derleme adiminda uretir; calisma
+# zamaninda salt okunur eklenir.
+
+CONTENT_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vocabulary (
+        id INTEGER PRIMARY KEY,
+        word TEXT NOT NULL,
+        reading TEXT NOT NULL,
+        meaning_tr TEXT NOT NULL,
+        meaning_en TEXT NOT NULL,
+        meaning_de TEXT DEFAULT '',
+        meaning_fr TEXT DEFAULT '',
+        meaning_es TEXT DEFAULT '',
+        meaning_pt TEXT DEFAULT '',
+        meaning_ko TEXT DEFAULT '',
+        meaning_zh TEXT DEFAULT '',
+        level TEXT NOT NULL CHECK(level IN ('N5','N4','N3','N2','N1')),
+        example_jp TEXT DEFAULT '',
+        example_tr TEXT DEFAULT '',
+        part_of_speech TEXT DEFAULT '',
+        extra_examples TEXT DEFAULT ''
+    );
+
+    CREATE TABLE IF NOT EXISTS kanji (
+        id INTEGER PRIMARY KEY,
+        kanji TEXT NOT NULL UNIQUE,
+        on_yomi TEXT NOT NULL,
+        kun_yomi TEXT NOT NULL,
+        meaning_tr TEXT NOT NULL,
+        meaning_en TEXT NOT NULL,
+        meaning_de TEXT DEFAULT '',
+        meaning_fr TEXT DEFAULT '',
+        meaning_es TEXT DEFAULT '',
+        meaning_pt TEXT DEFAULT '',
+        meaning_ko TEXT DEFAULT '',
+        meaning_zh TEXT DEFAULT '',
+        level TEXT NOT NULL CHECK(level IN ('N5','N4','N3','N2','N1')),
+        stroke_count INTEGER DEFAULT 0,
+        compounds TEXT DEFAULT ''
+    );
+
+    CREATE TABLE IF NOT EXISTS grammar (
+        id INTEGER PRIMARY KEY,
+        pattern TEXT NOT NULL UNIQUE,
+        meaning_tr TEXT NOT NULL,
+        meaning_en TEXT NOT NULL,
+        meaning_de TEXT DEFAULT '',
+        meaning_fr TEXT DEFAULT '',
+        meaning_es TEXT DEFAULT '',
+        meaning_pt TEXT DEFAULT '',
+        meaning_ko TEXT DEFAULT '',
+        meaning_zh TEXT DEFAULT '',
+        level TEXT NOT NULL CHECK(level IN ('N5','N4','N3','N2','N1')),
+        example_jp TEXT DEFAULT '',
+        example_tr TEXT DEFAULT '',
+        notes TEXT DEFAULT ''
+    );
+
+    CREATE TABLE IF NOT EXISTS data_manifest (
+        filename TEXT PRIMARY KEY,
+        sha256 TEXT NOT NULL,
+        applied_at TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+
+    -- Coktan secmeli quiz celdiricileri (distractors.py), derlemede uretilir.
+    -- ids: en benzerden baslayarak virgulle ayrilmis kart id'leri
+    CREATE TABLE IF NOT EXISTS distractors (
+        card_type TEXT NOT NULL,
+        lang TEXT NOT NULL,
+        card_id INTEGER NOT NULL,
+        ids TEXT NOT NULL,
+        PRIMARY KEY (card_type, lang, card_id)
+    ) WITHOUT ROWID;
+
+    -- Fiil cekim tablosu (conjugation.py), derlemede uretilir
+    CREATE TABLE IF NOT EXISTS verbs (
+        vocab_id INTEGER PRIMARY KEY,
+        level TEXT NOT NULL,
+        verb_class TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS conjugations (
+        vocab_id INTEGER NOT NULL,
+        form TEXT NOT NULL,
+        kana TEXT NOT NULL,
+        kanji TEXT NOT NULL,
+        PRIMARY KEY (vocab_id, form)
+    ) WITHOUT ROWID;
+
+    -- Ters cekim indeksi: cekimli bicim (kana/kanji) -> sozluk formu (vocab_id)
+    CREATE TABLE IF NOT EXISTS deinflections (
+        form TEXT NOT NULL,
+        vocab_id INTEGER NOT NULL,
+        PRIMARY KEY (form, vocab_id)
+    ) WITHOUT ROWID;
+
+    -- Cumle siralama quiz'i icin hazir parcalar (sentences.py), derlemede uretilir.
+    -- chunks: JSON liste; example_jp ve extra_examples cumleleri
+    CREATE TABLE IF NOT EXISTS sentence_chunks (
+        id INTEGER PRIMARY KEY,
+        vocab_id INTEGER NOT NULL,
+        level TEXT NOT NULL,
+        sentence TEXT NOT NULL,
+        chunks TEXT NOT NULL,
+        chunk_count INTEGER NOT NULL
+    );
+"""
+
+# Icerik tablolarinin ikincil indeksleri. Toplu yuklemede (data/init_db)
+# yukleme bitene kadar ertelenir, sonra tek seferde olusturulur.
+CONTENT_INDEXES = {
+    "idx_vocab_level": "vocabulary(level)",
+    "idx_kanji_level": "kanji(level)",
+    "idx_grammar_level": "grammar(level)",
+    "idx_sentence_chunks_count": "sentence_chunks(level, chunk_count)",
+    "idx_verbs_level": "verbs(level)",
+}
+
+# Kartlarin dogal anahtarlari (id'ler surumler arasi bunlara gore eslenir)
+CARD_KEYS = {
+    "vocabulary": ("word", "level"),
+    "kanji": ("kanji",),
+    "grammar": ("pattern",),
+}
+
+
+def create_content_indexes(conn):
+    for name, target in CONTENT_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def drop_content_indexes(conn):
+    for name in CONTENT_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def init_content_db(conn, indexes=True):
+    """Verilen (yazilabilir) icerik DB baglantisinda semayi olustur."""
+    conn.executescript(CONTENT_SCHEMA)
+    if indexes:
+        create_content_indexes(conn)
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                card_type UNINDEXED, card_id UNINDEXED, jp, kana, romaji, meaning,
+                tokenize = 'unicode61', prefix = '2 3'
+            )
+        """)
     except sqlite3.OperationalError:
-        pass  # zaten var
+        pass  # FTS5 derlenmemis; search_all LIKE'a duser
+
+
+@contextmanager
+def content_transaction(path=None):
+    """Icerik DB'sine yazilabilir, havuz disi baglanti (derleme adimi icin).
+
+    Basarida commit edip kapatir; havuzdaki baglantilar yeniden acilir.
+    """
+    conn = sqlite3.connect(path or CONTENT_DB_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = DELETE")  # tek dosya olarak dagitilir
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+    close_connections()
 
-    conn.commit()
-    conn.close()
+
+def has_content_db():
+    with connection() as conn:
+        return any(r["name"] == "content" for r in conn.execute("PRAGMA database_list"))
+
+
+def content_version():
+    """Ekli content.db'nin surumu (veri dosyasi hash'lerinden); yoksa None."""
+    if not has_content_db():
+        return None
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT sha256 FROM content.data_manifest ORDER BY filename"
+        ).fetchall()
+    return hashlib.sha1("".join(r["sha256"] for r in rows).encode()).hexdigest()[:16]
+
+
+# --- Kullanici DB'si ---
+
+def init_db():
+    """Kullanıcı veritabanı tablolarını (reviews, stats, meta) oluştur."""
+    legacy = _legacy_content_tables() if has_content_db() else []
+    if legacy:
+        backup_db(os.path.splitext(DB_PATH)[0] + "-legacy.db")
+
+    with transaction() as conn:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                card_type TEXT NOT NULL CHECK(card_type IN ('vocabulary','kanji','grammar')),
+                card_id INTEGER NOT NULL,
+                ease_factor REAL NOT NULL DEFAULT 2.5,
+                interval INTEGER NOT NULL DEFAULT 0,
+                repetitions INTEGER NOT NULL DEFAULT 0,
+                next_review TEXT NOT NULL,
+                last_review TEXT,
+                UNIQUE(card_type, card_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS stats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                cards_reviewed INTEGER DEFAULT 0,
+                cards_correct INTEGER DEFAULT 0,
+                cards_new INTEGER DEFAULT 0,
+                study_seconds INTEGER DEFAULT 0,
+                UNIQUE(date)
+            );
+
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS progress_counters (
+                card_type TEXT NOT NULL,
+                level TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (card_type, level, bucket)
+            ) WITHOUT ROWID;
+
+            -- Calisma serisi: tek satir, update_stats ile artimli guncellenir
+            CREATE TABLE IF NOT EXISTS streak (
+                id INTEGER PRIMARY KEY CHECK(id = 1),
+                current INTEGER NOT NULL DEFAULT 0,
+                last_active TEXT,
+                longest INTEGER NOT NULL DEFAULT 0
+            );
+
+            -- Ana menu ozeti: tek satir, yazma yolunda yerinde guncellenir
+            CREATE TABLE IF NOT EXISTS daily_summary (
+                id INTEGER PRIMARY KEY CHECK(id = 1),
+                date TEXT NOT NULL,
+                reviewed INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                due INTEGER NOT NULL DEFAULT 0,
+                streak_before INTEGER NOT NULL DEFAULT 0
+            );
+
+            -- Gun basina vadesi gelen kart sayisi (yuk dengeleme icin)
+            CREATE TABLE IF NOT EXISTS due_histogram (
+                day TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID;
+
+            -- Tekrar gecmisi: her cevap bir satir, sadece ekleme yapilir.
+            -- Analiz sorgulari reviews yerine bu tabloyu okur.
+            CREATE TABLE IF NOT EXISTS review_log (
+                id INTEGER PRIMARY KEY,
+                card_type TEXT NOT NULL,
+                card_id INTEGER NOT NULL,
+                reviewed_at TEXT NOT NULL,
+                quality INTEGER NOT NULL,
+                prev_interval INTEGER,
+                new_interval INTEGER NOT NULL,
+                response_ms INTEGER,
+                mode TEXT
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_reviews_next ON reviews(next_review);
+            CREATE INDEX IF NOT EXISTS idx_reviews_type ON reviews(card_type);
+            CREATE INDEX IF NOT EXISTS idx_review_log_time ON review_log(reviewed_at);
+            CREATE INDEX IF NOT EXISTS idx_review_log_card ON review_log(card_type, card_id, reviewed_at);
+        """)
+
+        # Migration: weak_kanji kolonu (okuma biliyor ama kanji bilmiyor)
+        try:
+            conn.execute("ALTER TABLE reviews ADD COLUMN weak_kanji INTEGER DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass  # zaten var
+
+        # Migration: FSRS hafiza durumu (srs.FSRSScheduler; SM-2 kullanmaz)
+        for col in ("stability", "difficulty"):
+            try:
+                conn.execute(f"ALTER TABLE reviews ADD COLUMN {col} REAL")
+            except sqlite3.OperationalError:
+                pass
+
+        # Bekleyen tekrar taramasi: _due_query'nin ORDER BY sirasinda, boylece
+        # LIMIT'li sorgu gecici siralama yapmadan ilk satirlarda durur
+        conn.execute("DROP INDEX IF EXISTS idx_reviews_due")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reviews_due_order
+            ON reviews(card_type, weak_kanji DESC, next_review, id)
+        """)
+
+        if legacy:
+            _migrate_legacy_content(conn, legacy)
+
+        if conn.execute("SELECT 1 FROM streak WHERE id = 1").fetchone() is None:
+            rebuild_streak()
+
+        if get_meta("due_histogram") is None:
+            rebuild_due_histogram()
+            set_meta("due_histogram", "1")
+
+        # Icerik degistiyse (yeni content.db) sayaclari bastan hesapla
+        version = content_version()
+        if version and get_meta("progress_counters") != version:
+            rebuild_progress_counters()
+            set_meta("progress_counters", version)
+    if legacy:
+        with connection() as conn:
+            conn.execute("VACUUM")
+
+
+def _legacy_content_tables():
+    with connection() as conn:
+        return [r["name"] for r in conn.execute(
+            "SELECT name FROM main.sqlite_master WHERE type = 'table' AND name IN "
+            "('vocabulary', 'kanji', 'grammar', 'search_index', 'data_manifest')"
+        )]
+
+
+def _migrate_legacy_content(conn, legacy):
+    """Eski tek dosyali DB: icerik tablolari kullanici DB'sindeydi.
+
+    reviews.card_id'leri dogal anahtarlar uzerinden content.db id'lerine
+    eslenir (karsiligi olmayan tekrarlar silinir), sonra eski icerik
+    tablolari kaldirilir. init_db islemden once DB'nin yedegini alir.
+    """
+    for table, keys in CARD_KEYS.items():
+        if table not in legacy:
+            continue
+        on = " AND ".join(f"c.{k} = m.{k}" for k in keys)
+        match = f"FROM main.{table} m JOIN content.{table} c ON {on}"
+        conn.execute(f"""
+            DELETE FROM reviews WHERE card_type = ?
+              AND card_id NOT IN (SELECT m.id {match})
+        """, (table,))
+        # Gecici negatif id: UNIQUE(card_type, card_id) cakismasini onler
+        conn.execute(f"""
+            UPDATE reviews SET card_id = -(SELECT c.id {match} WHERE m.id = reviews.card_id)
+            WHERE card_type = ?
+        """, (table,))
+    conn.execute("UPDATE reviews SET card_id = -card_id WHERE card_id < 0")
+    for table in legacy:
+        conn.execute(f"DROP TABLE main.{table}")
+    conn.execute("DELETE FROM meta WHERE key IN ('search_index', 'progress_counters', 'due_histogram')")
 
 
 # --- Vocabulary ---
 
 def get_vocabulary(level=None, limit=None):
-    conn = get_connection()
     query = "SELECT * FROM vocabulary"
     params = []
     if level:
@@ -126,32 +503,27 @@ def get_vocabulary(level=None, limit=None):
     if limit:
         query += " LIMIT ?"
         params.append(limit)
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return rows
+    with connection() as conn:
+        return conn.execute(query, params).fetchall()
 
 
 def get_vocab_by_id(vocab_id):
-    conn = get_connection()
-    row = conn.execute("SELECT * FROM vocabulary WHERE id = ?", (vocab_id,)).fetchone()
-    conn.close()
-    return row
+    with connection() as conn:
+        return conn.execute("SELECT * FROM vocabulary WHERE id = ?", (vocab_id,)).fetchone()
 
 
 def count_vocabulary(level=None):
-    conn = get_connection()
-    if level:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM vocabulary WHERE level = ?", (level,)).fetchone()
-    else:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM vocabulary").fetchone()
-    conn.close()
+    with connection() as conn:
+        if level:
+            row = conn.execute("SELECT COUNT(*) as cnt FROM vocabulary WHERE level = ?", (level,)).fetchone()
+        else:
+            row = conn.execute("SELECT COUNT(*) as cnt FROM vocabulary").fetchone()
     return row["cnt"]
 
 
 # --- Kanji ---
 
 def get_kanji(level=None, limit=None):
-    conn = get_connection()
     query = "SELECT * FROM kanji"
     params = []
     if level:
@@ -160,32 +532,67 @@ def get_kanji(level=None, limit=None):
     if limit:
         query += " LIMIT ?"
         params.append(limit)
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return rows
+    with connection() as conn:
+        return conn.execute(query, params).fetchall()
+
+
+def get_card_columns(card_type, columns, level=None):
+    """Sadece istenen sutunlari tuple olarak getir (quiz_pool icin, Row nesnesi yok)."""
+    query = f"SELECT {', '.join(columns)} FROM {card_type}"
+    params = []
+    if level:
+        query += " WHERE level = ?"
+        params.append(level)
+    with connection() as conn:
+        cur = conn.execute(query + " ORDER BY id", params)
+        cur.row_factory = None
+        return cur.fetchall()
+
+
+def get_cards_by_ids(card_type, card_ids):
+    """Kartlari verilen id sirasiyla getir (tam satirlar)."""
+    with connection() as conn:
+        rows = {r["id"]: r for r in conn.execute(
+            f"SELECT * FROM {card_type} WHERE id IN (SELECT value FROM json_each(?))",
+            (_id_list(card_ids),)
+        )}
+    return [rows[i] for i in card_ids if i in rows]
 
 
 def get_kanji_by_id(kanji_id):
-    conn = get_connection()
-    row = conn.execute("SELECT * FROM kanji WHERE id = ?", (kanji_id,)).fetchone()
-    conn.close()
-    return row
+    with connection() as conn:
+        return conn.execute("SELECT * FROM kanji WHERE id = ?", (kanji_id,)).fetchone()
+
+
+def get_kanji_chars():
+    """{kanji_id: karakter} - tum kanji kartlari."""
+    with connection() as conn:
+        return dict(conn.execute("SELECT id, kanji FROM kanji").fetchall())
+
+
+def get_learned_kanji():
+    """En az bir kez dogru tekrarlanmis (repetitions >= 1) kanji karakterleri."""
+    with connection() as conn:
+        rows = conn.execute("""
+            SELECT k.kanji FROM kanji k
+            JOIN reviews r ON r.card_type = 'kanji' AND r.card_id = k.id
+            WHERE r.repetitions >= 1
+        """).fetchall()
+    return {r["kanji"] for r in rows}
 
 
 def count_kanji(level=None):
-    conn = get_connection()
-    if level:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM kanji WHERE level = ?", (level,)).fetchone()
-    else:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM kanji").fetchone()
-    conn.close()
+    with connection() as conn:
+        if level:
+            row = conn.execute("SELECT COUNT(*) as cnt FROM kanji WHERE level = ?", (level,)).fetchone()
+        else:
+            row = conn.execute("SELECT COUNT(*) as cnt FROM kanji").fetchone()
     return row["cnt"]
 
 
 # --- Grammar ---
 
 def get_grammar(level=None, limit=None):
-    conn = get_connection()
     query = "SELECT * FROM grammar"
     params = []
     if level:
@@ -194,270 +601,879 @@ def get_grammar(level=None, limit=None):
     if limit:
         query += " LIMIT ?"
         params.append(limit)
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return rows
+    with connection() as conn:
+        return conn.execute(query, params).fetchall()
 
 
 def get_grammar_by_id(grammar_id):
-    conn = get_connection()
-    row = conn.execute("SELECT * FROM grammar WHERE id = ?", (grammar_id,)).fetchone()
-    conn.close()
-    return row
+    with connection() as conn:
+        return conn.execute("SELECT * FROM grammar WHERE id = ?", (grammar_id,)).fetchone()
 
 
 def count_grammar(level=None):
-    conn = get_connection()
-    if level:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM grammar WHERE level = ?", (level,)).fetchone()
-    else:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM grammar").fetchone()
-    conn.close()
+    with connection() as conn:
+        if level:
+            row = conn.execute("SELECT COUNT(*) as cnt FROM grammar WHERE level = ?", (level,)).fetchone()
+        else:
+            row = conn.execute("SELECT COUNT(*) as cnt FROM grammar").fetchone()
     return row["cnt"]
 
 
 # --- Reviews (SRS) ---
 
-def get_due_reviews(card_type=None, limit=50):
-    """Bugün veya öncesinde tekrarlanması gereken kartları getir.
-    weak_kanji=1 olanlar önce gelir."""
-    conn = get_connection()
+def _due_query(columns, card_type=None, level=None, after=None):
+    """Bekleyen tekrar sorgusunun FROM/WHERE kismini ve parametrelerini olustur.
+
+    level verilirse icerik tablosuyla join yapilir (card_type zorunlu).
+    Siralama idx_reviews_due_order ile ayni, gecici B-tree gerekmez.
+    after: keyset sayfalama icin son satirin due_review_key degeri; tarama
+    index'te o satirdan devam eder.
+    """
     today = date.today().isoformat()
-    query = "SELECT * FROM reviews WHERE next_review <= ?"
+    query = f"SELECT {columns} FROM reviews r"
+    where = ["r.next_review <= ?"]
     params = [today]
+    if level:
+        if not card_type:
+            raise ValueError("level filtresi icin card_type gerekli")
+        query += f" JOIN {card_type} t ON t.id = r.card_id"
+        where.append("t.level = ?")
+        params.append(level)
     if card_type:
-        query += " AND card_type = ?"
+        where.append("r.card_type = ?")
         params.append(card_type)
-    query += " ORDER BY weak_kanji DESC, next_review ASC LIMIT ?"
-    params.append(limit)
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return rows
+    if after:
+        weak, next_review, review_id = after
+        # weak_kanji DESC, (next_review, id) ASC sirasinda after'dan sonrakiler
+        where.append("r.weak_kanji <= ? AND (r.weak_kanji < ? OR (r.next_review, r.id) > (?, ?))")
+        params.extend([weak, weak, next_review, review_id])
+    query += " WHERE " + " AND ".join(where)
+    query += " ORDER BY r.weak_kanji DESC, r.next_review ASC, r.id ASC"
+    return query, params
+
+
+def due_review_key(review):
+    """_due_query(after=...) icin keyset anahtari: (weak_kanji, next_review, id)."""
+    return review["weak_kanji"], review["next_review"], review["id"]
 
 
 def get_review(card_type, card_id):
-    conn = get_connection()
-    row = conn.execute(
-        "SELECT * FROM reviews WHERE card_type = ? AND card_id = ?",
-        (card_type, card_id)
-    ).fetchone()
-    conn.close()
-    return row
+    with connection() as conn:
+        return conn.execute(
+            "SELECT * FROM reviews WHERE card_type = ? AND card_id = ?",
+            (card_type, card_id)
+        ).fetchone()
+
+
+def _id_list(ids):
+    """IN (SELECT value FROM json_each(?)) icin id listesi (degisken siniri yok)."""
+    return "[" + ",".join(str(int(i)) for i in ids) + "]"
+
 
+def get_reviews(card_type, card_ids):
+    """Birden fazla kartin review kayitlari: {card_id: row} (tek sorgu)."""
+    card_ids = list(card_ids)
+    if not card_ids:
+        return {}
+    with connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM reviews WHERE card_type = ?
+              AND card_id IN (SELECT value FROM json_each(?))
+        """, (card_type, _id_list(card_ids))).fetchall()
+    return {r["card_id"]: r for r in rows}
 
-def upsert_review(card_type, card_id, ease_factor, interval, repetitions, next_review, weak_kanji=None):
-    conn = get_connection()
-    if weak_kanji is not None:
+
+# --- Ilerleme sayaclari ---
+# progress_counters: (card_type, level, bucket) -> kart sayisi. Kart
+# araligina gore kova: new (tekrar kaydi yok), learning (< 7 gun),
+# known (< 21 gun), mastered (>= 21 gun). upsert_review/apply_review_batch
+# kova degisimlerini yazarken uygular; okuyucular sabit sayida satir okur.
+
+BUCKETS = ("new", "learning", "known", "mastered")
+LEARNED_BUCKETS = ("learning", "known", "mastered")
+
+
+def interval_bucket(interval):
+    if interval is None:
+        return "new"
+    if interval >= 21:
+        return "mastered"
+    if interval >= 7:
+        return "known"
+    return "learning"
+
+
+def _sync_counters(conn, changes):
+    """Yazilmak uzere olan (card_type, card_id, yeni_interval, yeni_next_review)
+    kayitlari icin kova degisimlerini sayaclara, bekleyen kart degisimini
+    gunluk ozete ve due_histogram'a uygula. reviews guncellenmeden ONCE cagrilir."""
+    today = date.today().isoformat()
+    by_type = {}
+    days = {}
+    for card_type, card_id, interval, next_review in changes:
+        by_type.setdefault(card_type, {})[card_id] = (interval, next_review)
+
+    deltas = {}
+    due_delta = 0
+    for card_type, cards in by_type.items():
+        ids = _id_list(cards)
+        old = {r["card_id"]: r for r in conn.execute(
+            "SELECT card_id, interval, next_review FROM reviews "
+            "WHERE card_type = ? AND card_id IN (SELECT value FROM json_each(?))",
+            (card_type, ids)
+        )}
+        levels = dict(conn.execute(
+            f"SELECT id, level FROM {card_type} WHERE id IN (SELECT value FROM json_each(?))", (ids,)
+        ).fetchall())
+        for card_id, (interval, next_review) in cards.items():
+            prev = old.get(card_id)
+            due_delta += (next_review <= today) - (prev is not None and prev["next_review"] <= today)
+            days[next_review] = days.get(next_review, 0) + 1
+            if prev is not None:
+                days[prev["next_review"]] = days.get(prev["next_review"], 0) - 1
+            before = interval_bucket(prev["interval"] if prev else None)
+            after = interval_bucket(interval)
+            level = levels.get(card_id)
+            if before == after or level is None:
+                continue
+            for bucket, step in ((before, -1), (after, 1)):
+                key = (card_type, level, bucket)
+                deltas[key] = deltas.get(key, 0) + step
+
+    conn.executemany("""
+        INSERT INTO progress_counters (card_type, level, bucket, count) VALUES (?, ?, ?, ?)
+        ON CONFLICT(card_type, level, bucket) DO UPDATE SET count = count + excluded.count
+    """, [key + (step,) for key, step in deltas.items() if step])
+    changed = [(day, step) for day, step in days.items() if step]
+    if changed:
+        conn.executemany("""
+            INSERT INTO due_histogram (day, count) VALUES (?, ?)
+            ON CONFLICT(day) DO UPDATE SET count = count + excluded.count
+        """, changed)
+        conn.execute(
+            "DELETE FROM due_histogram WHERE day IN (SELECT value FROM json_each(?)) AND count <= 0",
+            (json.dumps([day for day, _ in changed]),))
+    if due_delta:
+        _bump_summary(conn, today, due=due_delta)
+
+
+def rebuild_progress_counters():
+    """Sayaclari reviews ve icerik tablolarindan bastan hesapla."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM progress_counters")
         conn.execute("""
-            INSERT INTO reviews (card_type, card_id, ease_factor, interval, repetitions, next_review, last_review, weak_kanji)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(card_type, card_id) DO UPDATE SET
-                ease_factor = excluded.ease_factor,
-                interval = excluded.interval,
-                repetitions = excluded.repetitions,
-                next_review = excluded.next_review,
-                last_review = excluded.last_review,
-                weak_kanji = excluded.weak_kanji
-        """, (card_type, card_id, ease_factor, interval, repetitions, next_review, date.today().isoformat(), weak_kanji))
-    else:
+            INSERT INTO progress_counters (card_type, level, bucket, count)
+            WITH cards AS (
+                SELECT 'vocabulary' AS card_type, id, level FROM vocabulary
+                UNION ALL SELECT 'kanji', id, level FROM kanji
+                UNION ALL SELECT 'grammar', id, level FROM grammar
+            )
+            SELECT c.card_type, c.level,
+                   CASE WHEN r.id IS NULL THEN 'new'
+                        WHEN r.interval >= 21 THEN 'mastered'
+                        WHEN r.interval >= 7 THEN 'known'
+                        ELSE 'learning' END AS bucket,
+                   COUNT(*)
+            FROM cards c
+            LEFT JOIN reviews r ON r.card_type = c.card_type AND r.card_id = c.id
+            GROUP BY c.card_type, c.level, bucket
+        """)
+
+
+def rebuild_due_histogram():
+    """due_histogram'i reviews tablosundan bastan hesapla."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM due_histogram")
         conn.execute("""
-            INSERT INTO reviews (card_type, card_id, ease_factor, interval, repetitions, next_review, last_review)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO due_histogram (day, count)
+            SELECT next_review, COUNT(*) FROM reviews GROUP BY next_review
+        """)
+
+
+def get_due_histogram(start=None, end=None):
+    """{gun: vadesi gelen kart} - start/end dahil, verilmezse tum gunler."""
+    query = "SELECT day, count FROM due_histogram WHERE day >= ? AND day <= ?"
+    with connection() as conn:
+        return dict(conn.execute(query, (start or "", end or "9999-12-31")).fetchall())
+
+
+def get_progress_counters():
+    """{(card_type, level): {bucket: sayi}} - eksik kovalar 0."""
+    result = {}
+    with connection() as conn:
+        for row in conn.execute("SELECT card_type, level, bucket, count FROM progress_counters"):
+            key = (row["card_type"], row["level"])
+            result.setdefault(key, dict.fromkeys(BUCKETS, 0))[row["bucket"]] = row["count"]
+    return result
+
+
+def upsert_review(card_type, card_id, ease_factor, interval, repetitions, next_review,
+                  weak_kanji=None, stability=None, difficulty=None):
+    apply_review_batch([(card_type, card_id, ease_factor, interval, repetitions, next_review,
+                         date.today().isoformat(), weak_kanji, stability, difficulty)], {})
+
+
+def apply_review_batch(reviews, stats, journal_seq=None, log=()):
+    """Biriktirilmis tekrar ve istatistik kayitlarini tek transaction'da yaz.
+
+    reviews: (card_type, card_id, ease_factor, interval, repetitions,
+              next_review, last_review, weak_kanji[, stability, difficulty])
+             tuple'lari. weak_kanji/stability/difficulty None ise mevcut
+             deger korunur.
+    stats: {date: (reviewed, correct, new, seconds)} artislari.
+    journal_seq: yazilan son journal kaydi (tekrar oynatmada atlamak icin).
+    log: review_log satirlari (bkz. LOG_COLS).
+    """
+    with transaction() as conn:
+        reviews = [tuple(r) + (None,) * (10 - len(r)) for r in reviews]
+        _sync_counters(conn, [(r[0], r[1], r[3], r[5]) for r in reviews])
+        conn.executemany("""
+            INSERT INTO reviews (card_type, card_id, ease_factor, interval, repetitions, next_review,
+                                 last_review, weak_kanji, stability, difficulty)
+            VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, COALESCE(?8, 0), ?9, ?10)
             ON CONFLICT(card_type, card_id) DO UPDATE SET
                 ease_factor = excluded.ease_factor,
                 interval = excluded.interval,
                 repetitions = excluded.repetitions,
                 next_review = excluded.next_review,
-                last_review = excluded.last_review
-        """, (card_type, card_id, ease_factor, interval, repetitions, next_review, date.today().isoformat()))
-    conn.commit()
-    conn.close()
+                last_review = excluded.last_review,
+                weak_kanji = COALESCE(?8, reviews.weak_kanji),
+                stability = COALESCE(?9, reviews.stability),
+                difficulty = COALESCE(?10, reviews.difficulty)
+        """, reviews)
+        conn.executemany("""
+            INSERT INTO stats (date, cards_reviewed, cards_correct, cards_new, study_seconds)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                cards_reviewed = cards_reviewed + excluded.cards_reviewed,
+                cards_correct = cards_correct + excluded.cards_correct,
+                cards_new = cards_new + excluded.cards_new,
+                study_seconds = study_seconds + excluded.study_seconds
+        """, [(d,) + tuple(v) for d, v in stats.items()])
+        if log:
+            _append_log(conn, log)
+        for d, v in sorted(stats.items()):
+            _bump_summary(conn, d, reviewed=v[0], correct=v[1])
+            if v[0] > 0:
+                _mark_active(conn, d)
+        if journal_seq is not None:
+            set_meta("journal_seq", journal_seq)
+
+
+# --- Tekrar gecmisi (review_log) ---
+
+LOG_COLS = ("card_type", "card_id", "reviewed_at", "quality", "prev_interval",
+            "new_interval", "response_ms", "mode")
+
+
+def _append_log(conn, rows):
+    conn.executemany(f"""
+        INSERT INTO review_log ({", ".join(LOG_COLS)})
+        VALUES ({", ".join("?" * len(LOG_COLS))})
+    """, rows)
+
+
+def get_review_log(since=None, until=None, card_type=None, by_card=False):
+    """Tarih araligindaki tekrar kayitlarini getir.
+
+    since/until: 'YYYY-MM-DD' (veya tam zaman damgasi); until haric.
+    by_card: True ise kart bazinda, kendi icinde zamana gore sirali
+             (idx_review_log_card), degilse zaman sirasinda (idx_review_log_time).
+    """
+    query = "SELECT * FROM review_log WHERE 1 = 1"
+    params = []
+    if card_type:
+        query += " AND card_type = ?"
+        params.append(card_type)
+    if since:
+        query += " AND reviewed_at >= ?"
+        params.append(since)
+    if until:
+        query += " AND reviewed_at < ?"
+        params.append(until)
+    query += " ORDER BY card_type, card_id, reviewed_at, id" if by_card else " ORDER BY reviewed_at, id"
+    with connection() as conn:
+        return conn.execute(query, params).fetchall()
 
 
-def get_new_cards(card_type, level, limit=10):
-    """Henüz SRS'e eklenmemiş kartları getir."""
-    conn = get_connection()
-    table = card_type  # vocabulary, kanji, grammar
-    rows = conn.execute(f"""
-        SELECT t.* FROM {table} t
-        LEFT JOIN reviews r ON r.card_type = ? AND r.card_id = t.id
-        WHERE r.id IS NULL AND t.level = ?
-        LIMIT ?
-    """, (card_type, level, limit)).fetchall()
-    conn.close()
-    return rows
+_REVIEW_COLS = ("id", "ease_factor", "interval", "repetitions", "next_review", "last_review", "weak_kanji")
 
 
-def count_due_reviews(card_type=None):
-    conn = get_connection()
-    today = date.today().isoformat()
+DUE_PAGE = 50  # seansa bir seferde alinan bekleyen kart sayisi
+
+
+def get_study_cards(card_type, level, new_limit=10, due_limit=DUE_PAGE, after=None):
+    """Seans kartlarini tek sorguda getir: bekleyen + yeni kartlar, review satiriyla birlikte.
+
+    Bekleyen kartlar idx_reviews_due_order sirasinda gelir; buyuk birikimin
+    sonraki sayfasi after=due_review_key(son_bekleyen_review) ile alinir.
+
+    Returns:
+        (due, new) - her biri (card, review) listesi. review yeni kartlarda None.
+    """
+    table = card_type  # vocabulary, kanji, grammar
+    r_cols = ", ".join(f"r.{c} AS r_{c}" for c in _REVIEW_COLS)
+    null_cols = ", ".join(f"NULL AS r_{c}" for c in _REVIEW_COLS)
+    due_query, due_params = _due_query(f"1 AS is_due, t.*, {r_cols}", card_type, level, after)
+    with connection() as conn:
+        rows = conn.execute(f"""
+            SELECT * FROM ({due_query} LIMIT ?)
+            UNION ALL
+            SELECT * FROM (
+                SELECT 0 AS is_due, t.*, {null_cols}
+                FROM {table} t
+                LEFT JOIN reviews r ON r.card_type = ? AND r.card_id = t.id
+                WHERE r.id IS NULL AND t.level = ?
+                LIMIT ?
+            )
+        """, due_params + [due_limit, card_type, level, new_limit]).fetchall()
+
+    due, new = [], []
+    for row in rows:
+        card, review = {}, {}
+        for key in row.keys():
+            if key.startswith("r_"):
+                review[key[2:]] = row[key]
+            elif key != "is_due":
+                card[key] = row[key]
+        if row["is_due"]:
+            due.append((card, review))
+        else:
+            new.append((card, None))
+    return due, new
+
+
+def _count_buckets(buckets, card_type=None, level=None):
+    query = f"SELECT COALESCE(SUM(count), 0) FROM progress_counters WHERE bucket IN ({', '.join('?' * len(buckets))})"
+    params = list(buckets)
     if card_type:
-        row = conn.execute(
-            "SELECT COUNT(*) as cnt FROM reviews WHERE next_review <= ? AND card_type = ?",
-            (today, card_type)
-        ).fetchone()
-    else:
-        row = conn.execute(
-            "SELECT COUNT(*) as cnt FROM reviews WHERE next_review <= ?",
-            (today,)
-        ).fetchone()
-    conn.close()
-    return row["cnt"]
+        query += " AND card_type = ?"
+        params.append(card_type)
+    if level:
+        query += " AND level = ?"
+        params.append(level)
+    with connection() as conn:
+        return conn.execute(query, params).fetchone()[0]
 
 
-def count_learned(card_type=None, level=None):
-    conn = get_connection()
-    if card_type and level:
-        table = card_type  # vocabulary, kanji, grammar
-        row = conn.execute(f"""
-            SELECT COUNT(*) as cnt FROM reviews r
-            JOIN {table} t ON t.id = r.card_id
-            WHERE r.card_type = ? AND t.level = ?
-        """, (card_type, level)).fetchone()
-    elif card_type:
-        row = conn.execute(
-            "SELECT COUNT(*) as cnt FROM reviews WHERE card_type = ?",
-            (card_type,)
-        ).fetchone()
-    else:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM reviews").fetchone()
-    conn.close()
-    return row["cnt"]
+def count_new_cards(card_type=None, level=None):
+    """Henuz hic tekrar edilmemis kart sayisi (progress_counters 'new' kovasi)."""
+    return _count_buckets(("new",), card_type, level)
 
 
-def count_mastered(card_type=None, level=None):
-    """interval >= 21 gun olan (iyi bilinen) kartlari say."""
-    conn = get_connection()
-    if card_type and level:
-        table = card_type
-        row = conn.execute(f"""
-            SELECT COUNT(*) as cnt FROM reviews r
-            JOIN {table} t ON t.id = r.card_id
-            WHERE r.card_type = ? AND t.level = ? AND r.interval >= 21
-        """, (card_type, level)).fetchone()
-    elif card_type:
-        row = conn.execute(
-            "SELECT COUNT(*) as cnt FROM reviews WHERE card_type = ? AND interval >= 21",
-            (card_type,)
-        ).fetchone()
-    else:
-        row = conn.execute("SELECT COUNT(*) as cnt FROM reviews WHERE interval >= 21").fetchone()
-    conn.close()
-    return row["cnt"]
+def get_schedules():
+    """Tum kartlarin planlama durumu: (next_review, interval, repetitions, ease_factor).
+
+    Tahmin simulasyonu (forecast.py) icin; tek tarama, satir nesnesi yok.
+    """
+    with connection() as conn:
+        cur = conn.execute("SELECT next_review, interval, repetitions, ease_factor FROM reviews")
+        cur.row_factory = None
+        return cur.fetchall()
+
+
+def get_dashboard_stats():
+    """Istatistik ekrani icin sayimlari progress_counters'dan getir.
+
+    Returns:
+        {card_type: {"total", "learned", "mastered", "due",
+                     "levels": {level: {"total", "learned", "mastered", <kovalar>}}}}
+    """
+    with connection() as conn:
+        due = dict(conn.execute(
+            "SELECT card_type, COUNT(*) FROM reviews WHERE next_review <= ? GROUP BY card_type",
+            (date.today().isoformat(),)
+        ).fetchall())
+
+    result = {ct: {"total": 0, "learned": 0, "mastered": 0, "due": due.get(ct, 0), "levels": {}}
+              for ct in ("vocabulary", "kanji", "grammar")}
+    for (card_type, level), buckets in get_progress_counters().items():
+        counts = dict(buckets)
+        counts["total"] = sum(buckets.values())
+        counts["learned"] = sum(buckets[b] for b in LEARNED_BUCKETS)
+        counts["mastered"] = buckets["mastered"]
+        entry = result[card_type]
+        entry["levels"][level] = counts
+        for k in ("total", "learned", "mastered"):
+            entry[k] += counts[k]
+    return result
 
 
 # --- Stats ---
 
 def update_stats(reviewed=0, correct=0, new=0, seconds=0):
-    conn = get_connection()
     today = date.today().isoformat()
-    conn.execute("""
-        INSERT INTO stats (date, cards_reviewed, cards_correct, cards_new, study_seconds)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT(date) DO UPDATE SET
-            cards_reviewed = cards_reviewed + excluded.cards_reviewed,
-            cards_correct = cards_correct + excluded.cards_correct,
-            cards_new = cards_new + excluded.cards_new,
-            study_seconds = study_seconds + excluded.study_seconds
-    """, (today, reviewed, correct, new, seconds))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO stats (date, cards_reviewed, cards_correct, cards_new, study_seconds)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                cards_reviewed = cards_reviewed + excluded.cards_reviewed,
+                cards_correct = cards_correct + excluded.cards_correct,
+                cards_new = cards_new + excluded.cards_new,
+                study_seconds = study_seconds + excluded.study_seconds
+        """, (today, reviewed, correct, new, seconds))
+        _bump_summary(conn, today, reviewed=reviewed, correct=correct)
+        if reviewed > 0:
+            _mark_active(conn, today)
 
 
 def get_stats(days=7):
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT * FROM stats ORDER BY date DESC LIMIT ?", (days,)
-    ).fetchall()
-    conn.close()
-    return rows
+    with connection() as conn:
+        return conn.execute(
+            "SELECT * FROM stats ORDER BY date DESC LIMIT ?", (days,)
+        ).fetchall()
 
 
 def get_today_stats():
-    conn = get_connection()
     today = date.today().isoformat()
-    row = conn.execute("SELECT * FROM stats WHERE date = ?", (today,)).fetchone()
-    conn.close()
-    return row
+    with connection() as conn:
+        return conn.execute("SELECT * FROM stats WHERE date = ?", (today,)).fetchone()
+
+
+# --- Seri ---
+# streak satiri: current (last_active'te biten seri), last_active, longest.
+# Okuma O(1); update_stats/apply_review_batch calisilan gunu isaretler.
+
+def _mark_active(conn, day):
+    """day gununu calisilmis say ve seriyi artimli guncelle."""
+    row = conn.execute("SELECT current, last_active, longest FROM streak WHERE id = 1").fetchone()
+    if row is None or row["last_active"] is None:
+        current = 1
+    elif day == row["last_active"]:
+        return
+    elif day < row["last_active"]:
+        # Gecmis bir gun (eski journal kaydi) - seriyi bastan hesapla
+        _rebuild_streak(conn)
+        return
+    elif date.fromisoformat(day) - timedelta(days=1) == date.fromisoformat(row["last_active"]):
+        current = row["current"] + 1
+    else:
+        current = 1
+    longest = max(current, row["longest"] if row else 0)
+    conn.execute("""
+        INSERT OR REPLACE INTO streak (id, current, last_active, longest) VALUES (1, ?, ?, ?)
+    """, (current, day, longest))
 
 
-def get_streak():
-    """Ard arda calisilan gun sayisini hesapla."""
-    conn = get_connection()
+def _rebuild_streak(conn):
     rows = conn.execute(
-        "SELECT date FROM stats WHERE cards_reviewed > 0 ORDER BY date DESC"
+        "SELECT date FROM stats WHERE cards_reviewed > 0 ORDER BY date"
     ).fetchall()
-    conn.close()
-
-    if not rows:
-        return 0
-
-    from datetime import timedelta
-    streak = 0
-    expected = date.today()
-
+    current = longest = 0
+    last = None
     for row in rows:
         d = date.fromisoformat(row["date"])
-        if d == expected:
-            streak += 1
-            expected -= timedelta(days=1)
-        elif d < expected:
-            break
-
-    return streak
+        current = current + 1 if last is not None and d - last == timedelta(days=1) else 1
+        longest = max(longest, current)
+        last = d
+    conn.execute("""
+        INSERT OR REPLACE INTO streak (id, current, last_active, longest) VALUES (1, ?, ?, ?)
+    """, (current, last.isoformat() if last else None, longest))
+    # Gunluk ozetteki "dunku seri" de degismis olabilir
+    conn.execute("DELETE FROM daily_summary")
+    reset_daily_summary()
+
+
+def rebuild_streak():
+    """Seri kaydini stats tablosundan bastan hesapla (onarim icin)."""
+    with transaction() as conn:
+        _rebuild_streak(conn)
+    return get_streak_record()
+
+
+def get_streak_record():
+    """{"current", "last_active", "longest"}"""
+    with connection() as conn:
+        row = conn.execute("SELECT current, last_active, longest FROM streak WHERE id = 1").fetchone()
+    if row is None:
+        return {"current": 0, "last_active": None, "longest": 0}
+    return dict(row)
+
+
+def get_streak(as_of=None):
+    """as_of gununde (dahil, varsayilan bugun) biten ardisik calisma gunu sayisi."""
+    as_of = as_of or date.today()
+    record = get_streak_record()
+    if record["last_active"] is None:
+        return 0
+    last = date.fromisoformat(record["last_active"])
+    if last == as_of:
+        return record["current"]
+    if last < as_of:
+        return 0
+    # Kayit as_of'tan sonraki bir gune ait: seri as_of'a kadar kesintisizse geriye say
+    return max(record["current"] - (last - as_of).days, 0)
 
 
-# --- Arama ---
+# --- Gunluk ozet ---
+# Ana menu her cizimde sorgu atmasin diye bugunun ozeti (calisilan, dogru,
+# bekleyen kart, seri) bellekte ve daily_summary satirinda tutulur. Yazma
+# yolu (_bump_summary) ikisini de yerinde gunceller; gun degisince bir kez
+# yeniden hesaplanir.
 
-def search_all(query):
-    """3 tabloda LIKE araması yap. Sonuçları dict olarak döndür."""
-    conn = get_connection()
-    q = f"%{query}%"
+_summary = None
 
-    vocab = conn.execute("""
-        SELECT * FROM vocabulary
-        WHERE word LIKE ? OR reading LIKE ? OR meaning_tr LIKE ? OR meaning_en LIKE ?
-    """, (q, q, q, q)).fetchall()
 
-    kanji = conn.execute("""
-        SELECT * FROM kanji
-        WHERE kanji LIKE ? OR on_yomi LIKE ? OR kun_yomi LIKE ?
-              OR meaning_tr LIKE ? OR meaning_en LIKE ?
-    """, (q, q, q, q, q)).fetchall()
+def _summary_view(summary):
+    view = dict(summary)
+    view["streak"] = summary["streak_before"] + 1 if summary["reviewed"] > 0 else 0
+    return view
 
-    grammar = conn.execute("""
-        SELECT * FROM grammar
-        WHERE pattern LIKE ? OR meaning_tr LIKE ? OR meaning_en LIKE ?
-    """, (q, q, q)).fetchall()
 
-    conn.close()
+def _compute_summary(conn, today):
+    row = conn.execute(
+        "SELECT cards_reviewed, cards_correct FROM stats WHERE date = ?", (today,)
+    ).fetchone()
+    due = conn.execute(
+        "SELECT COUNT(*) FROM reviews WHERE next_review <= ?", (today,)
+    ).fetchone()[0]
+    yesterday = date.fromisoformat(today) - timedelta(days=1)
     return {
-        "vocabulary": [dict(r) for r in vocab],
-        "kanji": [dict(r) for r in kanji],
-        "grammar": [dict(r) for r in grammar],
+        "date": today,
+        "reviewed": row["cards_reviewed"] if row else 0,
+        "correct": row["cards_correct"] if row else 0,
+        "due": due,
+        "streak_before": get_streak(yesterday),
     }
 
 
-# --- Export / Import ---
+def get_daily_summary():
+    """Bugunun ozeti: date, reviewed, correct, due, streak.
+
+    Ayni gun icinde tekrar cagrildiginda DB'ye gitmez.
+    """
+    global _summary
+    today = date.today().isoformat()
+    if _summary is None or _summary["date"] != today:
+        with transaction() as conn:
+            row = conn.execute("SELECT * FROM daily_summary WHERE id = 1").fetchone()
+            if row and row["date"] == today:
+                summary = {k: row[k] for k in row.keys() if k != "id"}
+            else:
+                summary = _compute_summary(conn, today)
+                conn.execute("""
+                    INSERT OR REPLACE INTO daily_summary (id, date, reviewed, correct, due, streak_before)
+                    VALUES (1, :date, :reviewed, :correct, :due, :streak_before)
+                """, summary)
+        _summary = summary
+    return _summary_view(_summary)
+
+
+def _bump_summary(conn, day, reviewed=0, correct=0, due=0):
+    """Yazma yolundan: bugunun ozetine artislari uygula (satir + bellek)."""
+    if day != date.today().isoformat():
+        return
+    conn.execute("""
+        UPDATE daily_summary SET reviewed = reviewed + ?, correct = correct + ?, due = due + ?
+        WHERE id = 1 AND date = ?
+    """, (reviewed, correct, due, day))
+    if _summary is not None and _summary["date"] == day:
+        _summary["reviewed"] += reviewed
+        _summary["correct"] += correct
+        _summary["due"] += due
+
+
+def reset_daily_summary():
+    """Bellekteki ozeti at (DB dosyasi degistiginde)."""
+    global _summary
+    _summary = None
+
+
+# --- Meta ---
+
+def get_meta(key, default=None):
+    with connection() as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else default
+
+
+def set_meta(key, value):
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO meta (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """, (key, str(value)))
 
-def export_anki_tsv(card_type, filepath):
-    """Anki uyumlu front\\tback TSV dosyası oluştur."""
-    conn = get_connection()
 
+# --- Arama ---
+
+MEANING_FIELDS = ["meaning_tr", "meaning_en", "meaning_de", "meaning_fr",
+                  "meaning_es", "meaning_pt", "meaning_ko", "meaning_zh"]
+
+# card_type -> FTS "jp" sutununa giren alanlar (tam eslesme siralamasinda da kullanilir)
+SEARCH_FIELDS = {
+    "vocabulary": ["word", "reading"],
+    "kanji": ["kanji", "on_yomi", "kun_yomi"],
+    "grammar": ["pattern"],
+}
+
+# card_type -> hiragana'ya katlanip kana/romaji sutunlarina giren okuma alanlari
+READING_FIELDS = {
+    "vocabulary": ["reading", "word"],
+    "kanji": ["on_yomi", "kun_yomi"],
+    "grammar": ["pattern"],
+}
+
+# Kana/kanji karakterleri tek tek token olsun diye etraflarina bosluk koyulur.
+# Boylece unicode61 tokenizer ile phrase sorgusu = alt dize aramasi olur.
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f]")
+
+
+def fts_text(text):
+    """Metni search_index icin tokenlara uygun hale getir."""
+    return _CJK_RE.sub(lambda m: f" {m.group()} ", text or "")
+
+
+def _fts_phrase(text):
+    tokens = fts_text(text).replace('"', " ").split()
+    if not tokens:
+        return None
+    return '"' + " ".join(tokens) + '"*'
+
+
+def _fts_query(query):
+    """Kullanici sorgusunu FTS5 sorgusuna cevir.
+
+    Ham metin jp/meaning sutunlarinda, katakana->hiragana katlanmis hali kana
+    sutununda, romaji ise hem romaji sutununda hem kanaya cevrilmis haliyle
+    aranir. Son kelime prefix olarak eslesir.
+
+    Returns:
+        (match, kana_form) - match None ise aranacak token yok
+    """
+    parts = []
+    phrase = _fts_phrase(query)
+    if phrase:
+        parts.append("{jp meaning} : " + phrase)
+    fold = kana.to_hiragana(query)
+    folds = [fold]
+    if kana.is_romaji(query):
+        rom = _fts_phrase(query.lower())
+        if rom:
+            parts.append("romaji : " + rom)
+        folds = kana.romaji_readings(query)  # belirsiz yazimlarin tum okumalari
+        fold = folds[0] if folds else ""
+    for form in folds:
+        if form and any(kana.is_kana(ch) for ch in form):
+            parts.append("kana : " + _fts_phrase(form))
+    return (" OR ".join(parts) or None), fold
+
+
+def get_distractors(card_type, lang, card_ids):
+    """Kartlarin onceden hesaplanmis celdiricileri: {card_id: [id, ...]}.
+
+    Indeks yoksa (eski content.db) bos dict doner; cagiran rastgele secime duser.
+    """
+    if not has_content_db():
+        return {}
+    with connection() as conn:
+        try:
+            rows = conn.execute(
+                "SELECT card_id, ids FROM distractors WHERE card_type = ? AND lang = ? "
+                "AND card_id IN (SELECT value FROM json_each(?))",
+                (card_type, lang, _id_list(card_ids))
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return {}
+    return {r["card_id"]: [int(i) for i in r["ids"].split(",")] for r in rows if r["ids"]}
+
+
+def get_sentence_chunks(level, min_chunks, limit):
+    """Seviyeden rastgele `limit` cumle: [(vocab_id, cumle, [parcalar])].
+
+    Uygunluk (parca sayisi) idx_sentence_chunks_count ile tek sorguda.
+    """
+    if not has_content_db():
+        return []
+    with connection() as conn:
+        try:
+            rows = conn.execute(
+                "SELECT vocab_id, sentence, chunks FROM sentence_chunks "
+                "WHERE level = ? AND chunk_count >= ? ORDER BY random() LIMIT ?",
+                (level, min_chunks, limit)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return []
+    return [(r["vocab_id"], r["sentence"], json.loads(r["chunks"])) for r in rows]
+
+
+def get_conjugations(level, limit):
+    """Seviyeden rastgele `limit` fiilin cekim tablosu.
+
+    Returns: [(vocab_id, verb_class, {form: (kana, kanji)})]
+    """
+    if not has_content_db():
+        return []
+    with connection() as conn:
+        try:
+            verbs = conn.execute(
+                "SELECT vocab_id, verb_class FROM verbs WHERE level = ? ORDER BY random() LIMIT ?",
+                (level, limit)
+            ).fetchall()
+            if not verbs:
+                return []
+            ids = [v["vocab_id"] for v in verbs]
+            forms = {}
+            for r in conn.execute(
+                f"SELECT vocab_id, form, kana, kanji FROM conjugations "
+                f"WHERE vocab_id IN ({','.join('?' * len(ids))})", ids
+            ):
+                forms.setdefault(r["vocab_id"], {})[r["form"]] = (r["kana"], r["kanji"])
+        except sqlite3.OperationalError:
+            return []
+    return [(v["vocab_id"], v["verb_class"], forms.get(v["vocab_id"], {})) for v in verbs]
+
+
+def has_search_index():
+    if not has_content_db():
+        return False
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM content.sqlite_master WHERE name = 'search_index'"
+        ).fetchone()
+    return row is not None
+
+
+def search_cards(card_type, query, level=None, limit=100):
+    """Tek bir tabloda search_index uzerinden ara (seviye filtresi opsiyonel).
+
+    Japonca alanlar, kana/romaji okumalar ve 8 dildeki anlamlar aranir;
+    sonuclar tam eslesme + bm25 ile siralanir. Kelimelerde cekimli fiil
+    sorgusunun sozluk formu (bkz. deinflect) tam/onek eslesmelerinin
+    hemen ardindan gelir.
+    """
+    if not has_search_index():
+        return _search_like(query, level)[card_type]
+
+    match, fold = _fts_query(query)
+    if match is None:
+        return []
+
+    fields = SEARCH_FIELDS[card_type]
+    exact = " OR ".join(f"t.{f} = :q OR t.{f} = :fold" for f in fields)
+    sql = f"""
+        SELECT t.* FROM search_index s
+        JOIN {card_type} t ON t.id = s.card_id
+        WHERE search_index MATCH :match AND s.card_type = :card_type
+    """
+    if level:
+        sql += " AND t.level = :level"
+    sql += f"""
+        ORDER BY CASE WHEN {exact} THEN 0 ELSE 1 END,
+                 bm25(search_index, 0.0, 0.0, 4.0, 3.0, 3.0, 1.0)
+        LIMIT :limit
+    """
+    params = {"match": match, "card_type": card_type, "q": query, "fold": fold,
+              "level": level, "limit": -1 if limit is None else limit}
+    with connection() as conn:
+        rows = [dict(r) for r in conn.execute(sql, params).fetchall()]
     if card_type == "vocabulary":
-        rows = conn.execute("SELECT word, reading, meaning_tr, meaning_en FROM vocabulary").fetchall()
-        lines = [f"{r['word']} ({r['reading']})\t{r['meaning_tr']} / {r['meaning_en']}" for r in rows]
-    elif card_type == "kanji":
-        rows = conn.execute("SELECT kanji, on_yomi, kun_yomi, meaning_tr, meaning_en FROM kanji").fetchall()
-        lines = [f"{r['kanji']}\t{r['meaning_tr']} / {r['meaning_en']} (On: {r['on_yomi']}, Kun: {r['kun_yomi']})" for r in rows]
-    elif card_type == "grammar":
-        rows = conn.execute("SELECT pattern, meaning_tr, meaning_en, example_jp FROM grammar").fetchall()
-        lines = [f"{r['pattern']}\t{r['meaning_tr']} / {r['meaning_en']}" for r in rows]
-    else:
-        conn.close()
-        return 0
+        rows = _with_lemmas(query, rows, level, limit)
+    return rows
 
-    conn.close()
+
+def _query_forms(query):
+    """Sorgunun ham, hiragana'ya katlanmis ve (romajiyse) kanaya cevrilmis halleri."""
+    forms = {query, kana.to_hiragana(query)}
+    if kana.is_romaji(query):
+        forms.update(kana.romaji_readings(query))
+    return forms
+
+
+def deinflect(query, level=None):
+    """Cekimli fiil bicimini sozluk formuna cevir (食べなかった -> 食べる).
+
+    deinflections tablosunda birincil anahtar uzerinden tek arama; sorgu,
+    hiragana/romaji katlanmis haliyle birlikte denenir. Returns: vocabulary dict'leri
+    """
+    if not has_content_db():
+        return []
+    forms = list(_query_forms(query))
+    sql = f"""
+        SELECT DISTINCT v.* FROM deinflections d
+        JOIN vocabulary v ON v.id = d.vocab_id
+        WHERE d.form IN ({','.join('?' * len(forms))})
+    """
+    if level:
+        sql += " AND v.level = ?"
+        forms.append(level)
+    with connection() as conn:
+        try:
+            return [dict(r) for r in conn.execute(sql + " ORDER BY v.id", forms).fetchall()]
+        except sqlite3.OperationalError:
+            return []
+
+
+def _with_lemmas(query, rows, level=None, limit=None):
+    """Cekimden bulunan sozluk formlarini kelime sonuclarina yerlestir.
+
+    Kelimesi/okumasi sorguyla ayni olan ya da onunla baslayan sonuclar onde
+    kalir (した -> 下); sozluk formlari (した -> する) onlardan sonra, diger
+    eslesmelerden once gelir.
+    """
+    lemmas = deinflect(query, level)
+    if not lemmas:
+        return rows
+    forms = _query_forms(query)
+    fields = SEARCH_FIELDS["vocabulary"]
+
+    def direct(row):
+        return any(kana.to_hiragana(row[f] or "").startswith(form) or (row[f] or "").startswith(form)
+                   for f in fields for form in forms)
+
+    head = [r for r in rows if direct(r)]
+    seen = {r["id"] for r in head}
+    lemmas = [r for r in lemmas if r["id"] not in seen]
+    seen.update(r["id"] for r in lemmas)
+    merged = head + lemmas + [r for r in rows if r["id"] not in seen]
+    return merged if limit is None else merged[:limit]
+
+
+def search_all(query, limit=100):
+    """3 tabloda ara (bkz. search_cards). Sonuçları dict olarak döndür.
+    FTS5 yoksa LIKE taramasina duser."""
+    if not has_search_index():
+        return _search_like(query)
+    return {card_type: search_cards(card_type, query, limit=limit) for card_type in SEARCH_FIELDS}
+
+
+def _search_like(query, level=None):
+    """FTS5 olmayan SQLite kurulumlari icin LIKE aramasi."""
+    q = f"%{query}%"
+    results = {}
+    with connection() as conn:
+        for card_type, fields in SEARCH_FIELDS.items():
+            cols = fields + MEANING_FIELDS
+            where = " OR ".join(f"{c} LIKE ?" for c in cols)
+            params = [q] * len(cols)
+            if level:
+                where = f"({where}) AND level = ?"
+                params.append(level)
+            rows = conn.execute(
+                f"SELECT * FROM {card_type} WHERE {where}", params
+            ).fetchall()
+            results[card_type] = [dict(r) for r in rows]
+    results["vocabulary"] = _with_lemmas(query, results["vocabulary"], level)
+    return results
+
+
+# --- Export / Import ---
+
+def export_anki_tsv(card_type, filepath):
+    """Anki uyumlu front\\tback TSV dosyası oluştur."""
+    with connection() as conn:
+        if card_type == "vocabulary":
+            rows = conn.execute("SELECT word, reading, meaning_tr, meaning_en FROM vocabulary").fetchall()
+            lines = [f"{r['word']} ({r['reading']})\t{r['meaning_tr']} / {r['meaning_en']}" for r in rows]
+        elif card_type == "kanji":
+            rows = conn.execute("SELECT kanji, on_yomi, kun_yomi, meaning_tr, meaning_en FROM kanji").fetchall()
+            lines = [f"{r['kanji']}\t{r['meaning_tr']} / {r['meaning_en']} (On: {r['on_yomi']}, Kun: {r['kun_yomi']})" for r in rows]
+        elif card_type == "grammar":
+            rows = conn.execute("SELECT pattern, meaning_tr, meaning_en, example_jp FROM grammar").fetchall()
+            lines = [f"{r['pattern']}\t{r['meaning_tr']} / {r['meaning_en']}" for r in rows]
+        else:
+            return 0
 
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     with open(filepath, "w", encoding="utf-8") as f:
@@ -467,13 +1483,29 @@ def export_anki_tsv(card_type, filepath):
 
 
 def backup_db(dest_path):
-    """Veritabanını yedekle."""
+    """Veritabanını yedekle (WAL'daki commit'ler dahil, SQLite backup API ile)."""
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    shutil.copy2(DB_PATH, dest_path)
+    dest = sqlite3.connect(dest_path)
+    try:
+        with connection() as conn:
+            conn.backup(dest)
+    finally:
+        dest.close()
+
+
+def delete_db():
+    """Veritabani dosyasini ve WAL yan dosyalarini sil."""
+    close_connections()
+    reset_daily_summary()
+    for path in (DB_PATH, DB_PATH + "-wal", DB_PATH + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
 
 
 def restore_db(src_path):
     """Yedekten veritabanını geri yükle."""
     if not os.path.exists(src_path):
         raise FileNotFoundError(f"Yedek dosyası bulunamadı: {src_path}")
+    delete_db()
     shutil.copy2(src_path, DB_PATH)
+    init_db()  # eski (icerik tablolu) yedekler content.db'ye gore tasinir
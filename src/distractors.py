@@ -0,0 +1,162 @@
+"""Çoktan seçmeli quizler için çeldirici (yanlış şık) indeksi.
+
+Her kart için, aynı seviyedeki kartlar arasından benzerliğe göre sıralı
+bir çeldirici listesi hesaplanır. Benzerlik:
+  - ortak kanji karakterleri (kelimede / birleşiklerde)
+  - okuma: aynı ilk/son hece, ortak on/kun okuması
+  - anlam: ortak anlam kelimeleri (anlam dili başına ayrı)
+  - sözcük türü (kelime) / çizgi sayısı yakınlığı (kanji)
+
+Ortak özellikler nadirliklerine göre (idf) ağırlıklandırılır; aday kartlar
+ters indeksten gelir, tüm çiftler karşılaştırılmaz. Liste eksik kalırsa aynı
+sözcük türünden / yakın çizgi sayısındaki kartlarla tamamlanır. Aynı anlamı
+taşıyan kartlar (iki doğru şık olmasın diye) hiçbir zaman listeye girmez.
+
+İndeks content.db derlenirken üretilir (data/init_db.py) ve
+db.get_distractors ile kart başına tek satır okunarak kullanılır.
+"""
+
+import math
+import re
+
+DISTRACTOR_COUNT = 8  # kart başına saklanan çeldirici
+_MAX_POSTING = 40     # bundan sık görülen özellikler aday üretmez (ör. "to", "bir")
+
+# Özellik türü ağırlıkları
+_WEIGHTS = {"k": 2.0, "m": 1.5, "on": 1.2, "kun": 1.0, "r^": 0.6, "r$": 0.6, "c": 0.4}
+_POS_BONUS = 1.0
+
+_CJK_RE = re.compile(r"[一-鿿㐀-䶿]")
+_WORD_RE = re.compile(r"\w+")
+_SPLIT_RE = re.compile(r"[、,;/・\s]+")
+
+# İçerikte iki dilde yazılmış sözcük türlerini tek anahtara indir
+_POS = {"動詞": "fiil", "名詞": "isim", "い形容詞": "sıfat", "i-sıfat": "sıfat",
+        "な形容詞": "na-sıfat", "副詞": "zarf"}
+
+
+def _meaning_key(text):
+    return " ".join(_WORD_RE.findall((text or "").lower()))
+
+
+def meaning_tokens(text):
+    """Anlam metnini kelimelere ayır; Çince/Kanji kelimeler ayrıca karakterlerine."""
+    tokens = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        if len(word) > 1 or _CJK_RE.match(word):
+            tokens.add(word)
+        if len(word) > 1 and _CJK_RE.search(word):
+            tokens.update(_CJK_RE.findall(word))
+    return tokens
+
+
+def _readings(text):
+    return [p.replace(".", "").replace("-", "") for p in _SPLIT_RE.split(text or "") if p]
+
+
+def vocabulary_features(row):
+    """Dilden bağımsız kelime özellikleri ve tamamlama grubu."""
+    feats = {("k", ch) for ch in _CJK_RE.findall(row["word"] or "")}
+    reading = row["reading"] or ""
+    if reading:
+        feats.add(("r^", reading[0]))
+        feats.add(("r$", reading[-1]))
+    pos = _POS.get(row["part_of_speech"], row["part_of_speech"])
+    return feats, pos, len(reading)
+
+
+def kanji_features(row):
+    feats = {("on", r) for r in _readings(row["on_yomi"])}
+    feats |= {("kun", r.split(".")[0]) for r in _SPLIT_RE.split(row["kun_yomi"] or "") if r}
+    feats |= {("c", ch) for ch in _CJK_RE.findall(row["compounds"] or "") if ch != row["kanji"]}
+    return feats, None, row["stroke_count"] or 0
+
+
+_FEATURES = {"vocabulary": vocabulary_features, "kanji": kanji_features}
+
+
+def build(card_type, rows, meaning_fields):
+    """Bir seviyedeki kartlar için çeldirici listelerini hesapla.
+
+    Args:
+        rows: aynı seviyedeki kart satırları (dict/Row)
+        meaning_fields: ["meaning_tr", ...]
+
+    Returns:
+        {meaning_field: {card_id: [çeldirici_id, ...]}}
+    """
+    featurize = _FEATURES[card_type]
+    ids = [r["id"] for r in rows]
+    base, groups, order = {}, {}, {}
+    for r in rows:
+        feats, group, size = featurize(r)
+        base[r["id"]] = feats
+        order[r["id"]] = (group, size)
+        groups.setdefault(group, []).append(r["id"])
+    # Tamamlama: aynı gruptaki (sözcük türü) kartlar boyut yakınlığına göre
+    for members in groups.values():
+        members.sort(key=lambda i: (order[i][1], i))
+    position = {i: n for members in groups.values() for n, i in enumerate(members)}
+    shared = _scores(base)
+
+    result = {}
+    for field in meaning_fields:
+        meanings = {r["id"]: r[field] for r in rows}
+        keys = {i: _meaning_key(m) for i, m in meanings.items()}
+        scores = _scores({i: {("m", t) for t in meaning_tokens(m)} for i, m in meanings.items()})
+        lists = {}
+        for card_id in ids:
+            group = order[card_id][0]
+            combined = dict(shared.get(card_id, ()))
+            for other, score in scores.get(card_id, {}).items():
+                combined[other] = combined.get(other, 0.0) + score
+            for other in combined:
+                if order[other][0] == group and group is not None:
+                    combined[other] += _POS_BONUS
+            ranked = sorted(combined, key=lambda o: (-combined[o], o))
+            lists[card_id] = _pick(card_id, ranked, keys, groups[group], position[card_id])
+        result[field] = lists
+    return result
+
+
+def _scores(features):
+    """Ters indeks üzerinden çift skorları: {id: {diğer_id: skor}}."""
+    postings = {}
+    for card_id, feats in features.items():
+        for feat in feats:
+            postings.setdefault(feat, []).append(card_id)
+    n = max(len(features), 2)
+    scores = {}
+    for feat, members in postings.items():
+        if len(members) < 2 or len(members) > _MAX_POSTING:
+            continue
+        weight = _WEIGHTS[feat[0]] * math.log(n / len(members))
+        for a in members:
+            acc = scores.setdefault(a, {})
+            for b in members:
+                if a != b:
+                    acc[b] = acc.get(b, 0.0) + weight
+    return scores
+
+
+def _pick(card_id, ranked, keys, group, pos):
+    """En benzer adaylardan anlamı farklı olanları seç; eksikse gruptan tamamla."""
+    seen = {keys[card_id]}
+    picked = []
+
+    def take(other):
+        key = keys[other]
+        if other != card_id and key and key not in seen:
+            seen.add(key)
+            picked.append(other)
+        return len(picked) >= DISTRACTOR_COUNT
+
+    for other in ranked:
+        if take(other):
+            return picked
+    # Gruptaki komşular: pos-1, pos+1, pos-2, ...
+    for step in range(1, len(group)):
+        for n in (pos - step, pos + step):
+            if 0 <= n < len(group) and take(group[n]):
+                return picked
+    return picked
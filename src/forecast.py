@@ -0,0 +1,163 @@
+"""Tekrar yükü tahmini - önümüzdeki günlerin tekrar sayılarını simüle eder.
+
+Tüm kartların SM-2 durumu (kalan gün, aralık, tekrar sayısı, kolaylık)
+kompakt dizilere yüklenir; her gün o gün gelen kartlar srs.sm2_batch ile
+tek seferde planlanır ve yeni vadelerine göre gün kovalarına dağıtılır.
+Her gün card_limit kadar yeni kart eklenir (yeni kart havuzu bitene kadar).
+
+Cevaplar hedef hatırlama oranına göre (varsayılan %90) kart ve güne bağlı
+sabit bir karma ile üretilir: doğru -> kalite 4, yanlış -> kalite 1. Böylece
+aynı veriyle hep aynı tahmin çıkar ve card_limit senaryoları karşılaştırılabilir.
+"""
+
+from array import array
+from datetime import date
+
+import db
+import srs
+from i18n import get_card_limit
+
+try:
+    import numpy as np
+except ImportError:  # NumPy bağımlılık (requirements.txt); yoksa yavaş saf Python yolu
+    np = None
+
+DEFAULT_DAYS = 30
+
+
+def load_schedules(today=None):
+    """reviews tablosunu (due_gün, aralık, tekrar, kolaylık) dizilerine yükle.
+
+    due_gün bugüne göredir; gecikmiş kartlar 0 (bugün) sayılır.
+    """
+    today = today or date.today()
+    base = today.toordinal()
+    due, ivls, reps, efs = array("l"), array("l"), array("l"), array("d")
+    for next_review, interval, repetitions, ease_factor in db.get_schedules():
+        due.append(max(date.fromisoformat(next_review).toordinal() - base, 0))
+        ivls.append(interval)
+        reps.append(repetitions)
+        efs.append(ease_factor)
+    return due, ivls, reps, efs
+
+
+def _passed(ids, day, retention):
+    """Kart/gün çifti için sabit sözde-rastgele cevap: True=doğru.
+
+    32 bitlik karıştırma (taşmasız, int64 içinde kalır) kullanılır; NumPy ve
+    saf Python yolları aynı sonucu verir.
+    """
+    h = (ids * 0x9E3779B1 + day * 0x85EBCA77) & 0xFFFFFFFF
+    h = ((h ^ (h >> 15)) * 0x2C1B3C6D) & 0xFFFFFFFF
+    h = h ^ (h >> 12)
+    return h % 1000 < retention * 1000
+
+
+def simulate(schedules, days=DEFAULT_DAYS, card_limit=0, new_cards=0, retention=0.9):
+    """Günlük tekrar yükünü simüle et.
+
+    Args:
+        schedules: load_schedules() çıktısı (değiştirilmez)
+        days: simülasyon süresi (gün)
+        card_limit: günde eklenen yeni kart
+        new_cards: yeni kart havuzunun büyüklüğü
+        retention: doğru cevap olasılığı
+
+    Returns:
+        (reviews, new) - gün başına tekrar ve yeni kart sayıları listeleri
+    """
+    due, ivls, reps, efs = schedules
+    total_new = min(new_cards, card_limit * days)
+    added = [min(card_limit, max(total_new - card_limit * d, 0)) for d in range(days)]
+    if np is not None:
+        reviews = _simulate_numpy(due, ivls, reps, efs, days, added, retention)
+    else:
+        reviews = _simulate_python(due, ivls, reps, efs, days, added, retention)
+    return reviews, added
+
+
+def _simulate_numpy(due, ivls, reps, efs, days, added, retention):
+    n = len(due)
+    size = n + sum(added)
+    ivls = np.concatenate([np.asarray(ivls, dtype=np.int64), np.zeros(size - n, dtype=np.int64)])
+    reps = np.concatenate([np.asarray(reps, dtype=np.int64), np.zeros(size - n, dtype=np.int64)])
+    efs = np.concatenate([np.asarray(efs, dtype=np.float64), np.full(size - n, 2.5)])
+
+    # Gün kovaları: buckets[d] o gün gelen kart indekslerinin parçaları
+    buckets = [[] for _ in range(days)]
+    _scatter(buckets, np.arange(n), np.asarray(due, dtype=np.int64), days)
+
+    reviews = []
+    start = n
+    for day in range(days):
+        parts = buckets[day]
+        buckets[day] = None  # işlenen kova bellekte tutulmaz
+        reviews.append(sum(len(p) for p in parts))
+        if added[day]:
+            parts.append(np.arange(start, start + added[day]))
+            start += added[day]
+        if not parts:
+            continue
+        ids = np.concatenate(parts)
+        qualities = np.where(_passed(ids, day, retention), 4, 1)
+        new_reps, new_efs, new_ivls = srs.sm2_batch(qualities, reps[ids], efs[ids], ivls[ids])
+        reps[ids], efs[ids], ivls[ids] = new_reps, new_efs, new_ivls
+        _scatter(buckets, ids, day + new_ivls, days)
+    return reviews
+
+
+def _scatter(buckets, ids, targets, days):
+    """Kartları vade günlerine göre kovalara dağıt (sıralayıp bölerek)."""
+    keep = targets < days
+    ids, targets = ids[keep], targets[keep]
+    if not len(ids):
+        return
+    order = np.argsort(targets, kind="stable")
+    ids, targets = ids[order], targets[order]
+    days_, starts = np.unique(targets, return_index=True)
+    for d, chunk in zip(days_.tolist(), np.split(ids, starts[1:])):
+        buckets[d].append(chunk)
+
+
+def _simulate_python(due, ivls, reps, efs, days, added, retention):
+    ivls, reps, efs = array("l", ivls), array("l", reps), array("d", efs)
+    buckets = [[] for _ in range(days)]
+    for i, d in enumerate(due):
+        if d < days:
+            buckets[d].append(i)
+
+    reviews = []
+    for day in range(days):
+        ids = buckets[day]
+        buckets[day] = None
+        reviews.append(len(ids))
+        if added[day]:
+            start = len(ivls)
+            ivls.extend([0] * added[day])
+            reps.extend([0] * added[day])
+            efs.extend([2.5] * added[day])
+            ids.extend(range(start, start + added[day]))
+        if not ids:
+            continue
+        qualities = [4 if _passed(i, day, retention) else 1 for i in ids]
+        new_reps, new_efs, new_ivls = srs.sm2_batch(
+            qualities, [reps[i] for i in ids], [efs[i] for i in ids], [ivls[i] for i in ids])
+        for i, nr, ne, ni in zip(ids, new_reps, new_efs, new_ivls):
+            reps[i], efs[i], ivls[i] = nr, ne, ni
+            if day + ni < days:
+                buckets[day + ni].append(i)
+    return reviews
+
+
+def scenarios(days=DEFAULT_DAYS, limits=None, retention=0.9):
+    """Birden fazla card_limit için simülasyon (kartlar bir kez yüklenir).
+
+    Returns:
+        {card_limit: (reviews, new)}; limits verilmezse 0, mevcut limit ve iki katı
+    """
+    if limits is None:
+        current = get_card_limit()
+        limits = sorted({0, current, current * 2})
+    schedules = load_schedules()
+    pool = db.count_new_cards()
+    return {limit: simulate(schedules, days, limit, pool, retention) for limit in limits}
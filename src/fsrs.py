@@ -0,0 +1,188 @@
+"""FSRS benzeri hafıza modeli - kararlılık (stability) / zorluk (difficulty).
+
+SM-2'nin sabit çarpanları yerine her kart için iki durum tutulur:
+  stability  - hatırlama olasılığının %90'a düştüğü gün sayısı
+  difficulty - 1 (kolay) .. 10 (zor)
+
+Bir sonraki tekrar, hedef hatırlama oranına (varsayılan 0.9) göre seçilir.
+Model parametreleri (W) kullanıcının kendi tekrar geçmişinden çevrimdışı
+olarak fit_parameters ile öğrenilebilir. Formüller FSRS-4.5 ile uyumludur.
+
+Kalite (0-5) FSRS notuna çevrilir: 0-2 -> 1 (tekrar), 3 -> 2 (zor),
+4 -> 3 (iyi), 5 -> 4 (kolay).
+"""
+
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsiyonel; yoksa saf Python kayıp fonksiyonu
+    np = None
+
+DEFAULT_PARAMS = (
+    0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+    0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+)
+# Optimizasyon sırasında parametre sınırları
+_BOUNDS = (
+    (0.1, 100), (0.1, 100), (0.1, 100), (0.1, 100), (1, 10), (0.01, 5), (0.01, 5),
+    (0, 0.8), (0, 4), (0, 0.8), (0.01, 3), (0.1, 5), (0.01, 0.5), (0.01, 0.9),
+    (0.01, 4), (0, 1), (1, 6),
+)
+DECAY = -0.5
+FACTOR = 19 / 81  # R(S, S) = 0.9
+MAX_INTERVAL = 36500
+
+
+def grade(quality):
+    """SM-2 kalite puanını (0-5) FSRS notuna (1-4) çevir."""
+    if quality <= 2:
+        return 1
+    return quality - 1
+
+
+def retrievability(elapsed, stability):
+    return (1 + FACTOR * elapsed / stability) ** DECAY
+
+
+def next_interval(stability, retention=0.9):
+    days = stability / FACTOR * (retention ** (1 / DECAY) - 1)
+    return min(max(round(days), 1), MAX_INTERVAL)
+
+
+def _clamp_d(d):
+    return min(max(d, 1.0), 10.0)
+
+
+def init_state(g, w=DEFAULT_PARAMS):
+    """İlk tekrardan sonraki (stability, difficulty)."""
+    return max(w[g - 1], 0.1), _clamp_d(w[4] - (g - 3) * w[5])
+
+
+def next_state(stability, difficulty, elapsed, g, w=DEFAULT_PARAMS):
+    """Bir tekrardan sonraki (stability, difficulty)."""
+    r = retrievability(elapsed, stability)
+    d0 = w[4]  # init_state(3) zorluğu
+    difficulty = _clamp_d(w[7] * d0 + (1 - w[7]) * (difficulty - w[6] * (g - 3)))
+    if g == 1:
+        s = (w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1)
+             * math.exp(w[14] * (1 - r)))
+        return max(min(s, stability), 0.1), difficulty
+    bonus = w[15] if g == 2 else (w[16] if g == 4 else 1.0)
+    s = stability * (1 + math.exp(w[8]) * (11 - difficulty) * stability ** -w[9]
+                     * (math.exp(w[10] * (1 - r)) - 1) * bonus)
+    return s, difficulty
+
+
+def state_from_sm2(ease_factor, interval):
+    """SM-2 ile planlanmış bir kart için başlangıç (stability, difficulty) tahmini."""
+    stability = max(float(interval or 0), 0.5)
+    difficulty = _clamp_d(5 + (2.5 - ease_factor) * 5)
+    return stability, difficulty
+
+
+# --- Parametre uydurma ---
+
+def _loss_python(histories, w):
+    total = 0.0
+    count = 0
+    for events in histories:
+        s, d = init_state(events[0][1], w)
+        for elapsed, g in events[1:]:
+            r = min(max(retrievability(elapsed, s), 1e-6), 1 - 1e-6)
+            total -= math.log(r) if g > 1 else math.log(1 - r)
+            count += 1
+            s, d = next_state(s, d, elapsed, g, w)
+    return total / count if count else 0.0
+
+
+def _pack(histories):
+    """Geçmişleri (kart x tekrar) dizilerine diz: aynı adımdaki tüm kartlar
+    tek vektör işlemiyle ilerletilir."""
+    n = max(len(h) for h in histories)
+    elapsed = np.zeros((len(histories), n))
+    grades = np.zeros((len(histories), n), dtype=np.int64)
+    for i, h in enumerate(histories):
+        for j, (e, g) in enumerate(h):
+            elapsed[i, j] = e
+            grades[i, j] = g
+    return elapsed, grades
+
+
+def _loss_numpy(packed, w):
+    elapsed, grades = packed
+    w = np.asarray(w)
+    g = grades[:, 0]
+    s = np.maximum(w[np.maximum(g, 1) - 1], 0.1)
+    d = np.clip(w[4] - (g - 3) * w[5], 1, 10)
+    total = 0.0
+    count = 0
+    for j in range(1, grades.shape[1]):
+        g = grades[:, j]
+        live = g > 0
+        if not live.any():
+            break
+        t = elapsed[:, j]
+        r = np.clip((1 + FACTOR * t / s) ** DECAY, 1e-6, 1 - 1e-6)
+        total -= np.where(g > 1, np.log(r), np.log(1 - r))[live].sum()
+        count += int(live.sum())
+        nd = np.clip(w[7] * w[4] + (1 - w[7]) * (d - w[6] * (g - 3)), 1, 10)
+        forget = np.minimum(
+            w[11] * nd ** -w[12] * ((s + 1) ** w[13] - 1) * np.exp(w[14] * (1 - r)), s)
+        bonus = np.where(g == 2, w[15], np.where(g == 4, w[16], 1.0))
+        recall = s * (1 + np.exp(w[8]) * (11 - nd) * s ** -w[9]
+                      * (np.exp(w[10] * (1 - r)) - 1) * bonus)
+        ns = np.maximum(np.where(g == 1, forget, recall), 0.1)
+        s = np.where(live, ns, s)
+        d = np.where(live, nd, d)
+    return total / count if count else 0.0
+
+
+def fit_parameters(histories, params=DEFAULT_PARAMS, max_seconds=5.0, tol=1e-4):
+    """Tekrar geçmişinden model parametrelerini uydur (log-kayıp minimizasyonu).
+
+    Args:
+        histories: kart başına [(geçen_gün, kalite_0_5), ...] listeleri,
+            zamana göre sıralı; ilk kaydın geçen_gün değeri kullanılmaz
+        params: başlangıç parametreleri
+        max_seconds: zaman bütçesi
+
+    Returns:
+        (params, loss_before, loss_after)
+
+    Koordinat bazlı örüntü araması kullanır: her parametre sırayla küçük
+    çarpanlarla denenir, iyileşme yoksa adım yarıya iner. Gradyan ya da
+    ek bağımlılık gerektirmez; NumPy varsa kayıp tüm kartlar üzerinde
+    vektörel hesaplanır.
+    """
+    histories = [[(e, grade(q)) for e, q in h] for h in histories if len(h) >= 2]
+    w = list(params)
+    if not histories:
+        return tuple(w), 0.0, 0.0
+
+    if np is not None:
+        packed = _pack(histories)
+        loss = lambda p: _loss_numpy(packed, p)  # noqa: E731
+    else:
+        loss = lambda p: _loss_python(histories, p)  # noqa: E731
+
+    start = time.monotonic()
+    best = before = loss(w)
+    step = 0.2
+    while step > tol and time.monotonic() - start < max_seconds:
+        improved = False
+        for i, (lo, hi) in enumerate(_BOUNDS):
+            for direction in (1, -1):
+                trial = list(w)
+                delta = step * max(abs(w[i]), 0.05) * direction
+                trial[i] = min(max(w[i] + delta, lo), hi)
+                if trial[i] == w[i]:
+                    continue
+                value = loss(trial)
+                if value < best - 1e-9:
+                    w, best, improved = trial, value, True
+                    break
+        if not improved:
+            step /= 2
+    return tuple(round(float(x), 4) for x in w), float(before), float(best)
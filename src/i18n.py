@@ -143,6 +143,22 @@ def set_card_limit(limit):
     _save_config_key("card_limit", limit)
 
 
+def get_db_profile():
+    """Veritabani PRAGMA profilinin adini dondur (bkz. db.PRAGMA_PROFILES)."""
+    config = _load_config()
+    return config.get("db_profile", "wal")
+
+
+def get_scheduler():
+    """Tekrar planlayıcısının adını döndür (bkz. srs.SCHEDULERS)."""
+    config = _load_config()
+    return config.get("scheduler", "sm2")
+
+
+def set_scheduler(name):
+    _save_config_key("scheduler", name)
+
+
 def _save_config_key(key, value):
     config = _load_config()
     config[key] = value
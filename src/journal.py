@@ -0,0 +1,234 @@
+"""Seans yazma tamponu - tekrar ve istatistik yazımlarını biriktirir.
+
+Her cevapta DB'ye commit atmak yerine SRS güncellemeleri ve istatistik
+artışları bellekte toplanır, seans sonunda (veya 'q' ile çıkışta, ya da
+FLUSH_INTERVAL saniyede bir) tek transaction ile yazılır.
+
+Çökmeye karşı her kayıt önce JOURNAL_PATH'e (append-only, satır başına bir
+JSON) eklenir. Bir sonraki açılışta yazılmamış kayıtlar tekrar oynatılır.
+Kayıtlar sıra numarası taşır; DB'ye yazılan son numara meta tablosunda
+tutulur, böylece aynı kayıt iki kez uygulanmaz.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date
+from functools import wraps
+
+import db
+from paths import JOURNAL_PATH
+
+FLUSH_INTERVAL = 60  # saniye
+
+_active = None
+
+
+class WriteBuffer:
+    """Seans boyunca tekrar/istatistik yazımlarını tutan tampon."""
+
+    def __init__(self, path=JOURNAL_PATH, interval=FLUSH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.reviews = {}  # (card_type, card_id) -> review tuple
+        self.stats = {}    # date -> [reviewed, correct, new, seconds]
+        self.log = []      # review_log satirlari (db.LOG_COLS)
+        self.seq = int(db.get_meta("journal_seq", 0))
+        self.last_flush = time.monotonic()
+        self._file = None
+
+    # --- kayıt ---
+
+    def add_review(self, card_type, card_id, ease_factor, interval, repetitions,
+                   next_review, weak_kanji=None, last_review=None,
+                   stability=None, difficulty=None):
+        last_review = last_review or date.today().isoformat()
+        self._log({"op": "review", "card_type": card_type, "card_id": card_id,
+                   "ease_factor": ease_factor, "interval": interval,
+                   "repetitions": repetitions, "next_review": next_review,
+                   "last_review": last_review, "weak_kanji": weak_kanji,
+                   "stability": stability, "difficulty": difficulty})
+        self._merge_review(card_type, card_id, ease_factor, interval, repetitions,
+                           next_review, last_review, weak_kanji, stability, difficulty)
+        self._maybe_flush()
+
+    def add_stats(self, reviewed=0, correct=0, new=0, seconds=0, day=None):
+        day = day or date.today().isoformat()
+        self._log({"op": "stats", "date": day, "reviewed": reviewed,
+                   "correct": correct, "new": new, "seconds": seconds})
+        self._merge_stats(day, reviewed, correct, new, seconds)
+        self._maybe_flush()
+
+    def add_log(self, row):
+        entry = dict(zip(db.LOG_COLS, row))
+        entry["op"] = "log"
+        self._log(entry)
+        self.log.append(tuple(row))
+        self._maybe_flush()
+
+    def get_review(self, card_type, card_id):
+        """Tampondaki (henüz yazılmamış) review durumunu dict olarak döndür."""
+        pending = self.reviews.get((card_type, card_id))
+        if pending is None:
+            return None
+        keys = ("card_type", "card_id", "ease_factor", "interval", "repetitions",
+                "next_review", "last_review", "weak_kanji", "stability", "difficulty")
+        return dict(zip(keys, pending))
+
+    def _merge_review(self, card_type, card_id, ease_factor, interval, repetitions,
+                      next_review, last_review, weak_kanji, stability=None, difficulty=None):
+        key = (card_type, card_id)
+        prev = self.reviews.get(key)
+        if prev is not None:
+            weak_kanji = prev[7] if weak_kanji is None else weak_kanji
+            stability = prev[8] if stability is None else stability
+            difficulty = prev[9] if difficulty is None else difficulty
+        self.reviews[key] = (card_type, card_id, ease_factor, interval, repetitions,
+                             next_review, last_review, weak_kanji, stability, difficulty)
+
+    def _merge_stats(self, day, reviewed, correct, new, seconds):
+        acc = self.stats.setdefault(day, [0, 0, 0, 0])
+        acc[0] += reviewed
+        acc[1] += correct
+        acc[2] += new
+        acc[3] += seconds
+
+    # --- journal ---
+
+    def _log(self, entry):
+        self.seq += 1
+        entry["seq"] = self.seq
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def replay(self):
+        """Önceki çalışmadan kalan journal kayıtlarını tampona al ve yaz."""
+        if not os.path.exists(self.path):
+            return 0
+        applied = int(db.get_meta("journal_seq", 0))
+        count = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # yarım yazılmış son satır
+                seq = entry.get("seq", 0)
+                self.seq = max(self.seq, seq)
+                if seq <= applied:
+                    continue
+                if entry["op"] == "review":
+                    self._merge_review(entry["card_type"], entry["card_id"], entry["ease_factor"],
+                                       entry["interval"], entry["repetitions"], entry["next_review"],
+                                       entry["last_review"], entry["weak_kanji"],
+                                       entry.get("stability"), entry.get("difficulty"))
+                elif entry["op"] == "stats":
+                    self._merge_stats(entry["date"], entry["reviewed"], entry["correct"],
+                                      entry["new"], entry["seconds"])
+                elif entry["op"] == "log":
+                    self.log.append(tuple(entry[c] for c in db.LOG_COLS))
+                count += 1
+        self.flush(force=bool(count))  # bos journal icin DB'ye yazilmaz
+        return count
+
+    # --- yazma ---
+
+    def _maybe_flush(self):
+        if time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self, force=False):
+        """Biriken kayıtları tek transaction ile DB'ye yaz ve journal'ı temizle."""
+        if self.reviews or self.stats or self.log or force:
+            db.apply_review_batch(list(self.reviews.values()), self.stats,
+                                  journal_seq=self.seq, log=self.log)
+            self.reviews = {}
+            self.stats = {}
+            self.log = []
+        self._close_file()
+        if os.path.exists(self.path):
+            open(self.path, "w").close()
+        self.last_flush = time.monotonic()
+
+
+def replay_journal():
+    """Açılışta bir kez çağrılır: yazılmamış journal kayıtlarını DB'ye uygula."""
+    return WriteBuffer().replay()
+
+
+@contextmanager
+def session():
+    """Seans boyunca yazımları tamponla; çıkışta (hata/q dahil) tek seferde yaz."""
+    global _active
+    if _active is not None:
+        yield _active
+        return
+    buf = WriteBuffer()  # cokmeden kalan kayitlar acilista (replay_journal) yazildi
+    _active = buf
+    try:
+        yield buf
+    finally:
+        _active = None
+        try:
+            buf.flush()
+        except sqlite3.Error:
+            buf._close_file()  # journal diskte kalır, sonraki açılışta oynatılır
+
+
+def buffered(fn):
+    """Fonksiyonu bir yazma seansı içinde çalıştıran dekoratör."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with session():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# --- db.py ile aynı imzalı yazma/okuma fonksiyonları ---
+
+def get_review(card_type, card_id):
+    if _active is not None:
+        pending = _active.get_review(card_type, card_id)
+        if pending is not None:
+            return pending
+    return db.get_review(card_type, card_id)
+
+
+def get_reviews(card_type, card_ids):
+    result = db.get_reviews(card_type, card_ids)
+    if _active is not None:
+        for card_id in card_ids:
+            pending = _active.get_review(card_type, card_id)
+            if pending is not None:
+                result[card_id] = pending
+    return result
+
+
+def upsert_reviews(reviews, log=()):
+    """(card_type, card_id, ease_factor, interval, repetitions, next_review,
+    last_review, weak_kanji[, stability, difficulty]) tuple'larini ve
+    review_log satirlarini toplu yaz."""
+    if _active is None:
+        return db.apply_review_batch(list(reviews), {}, log=list(log))
+    for r in reviews:
+        r = tuple(r) + (None,) * (10 - len(r))
+        _active.add_review(r[0], r[1], r[2], r[3], r[4], r[5], weak_kanji=r[7], last_review=r[6],
+                           stability=r[8], difficulty=r[9])
+    for row in log:
+        _active.add_log(row)
+
+
+def update_stats(reviewed=0, correct=0, new=0, seconds=0):
+    if _active is None:
+        return db.update_stats(reviewed=reviewed, correct=correct, new=new, seconds=seconds)
+    _active.add_stats(reviewed=reviewed, correct=correct, new=new, seconds=seconds)
@@ -0,0 +1,216 @@
+"""Kana normalizasyonu - hiragana/katakana katlama ve Hepburn romaji.
+
+Arama indeksi okumaları tek bir kanonik forma (hiragana) katlar ve romaji
+karşılığını saklar. Kullanıcı sorgusu da aynı şekilde katlanır; böylece
+"taberu", "tabe", "タベル" veya "たべる" aynı kelimeyi bulur.
+"""
+
+import re
+from itertools import islice
+
+_KATA_START, _KATA_END = 0x30A1, 0x30F6  # ァ..ヶ
+_KANA_OFFSET = 0x60
+
+# Hiragana -> Hepburn romaji (tek karakterler)
+_ROMAJI = {
+    "あ": "a", "い": "i", "う": "u", "え": "e", "お": "o",
+    "か": "ka", "き": "ki", "く": "ku", "け": "ke", "こ": "ko",
+    "さ": "sa", "し": "shi", "す": "su", "せ": "se", "そ": "so",
+    "た": "ta", "ち": "chi", "つ": "tsu", "て": "te", "と": "to",
+    "な": "na", "に": "ni", "ぬ": "nu", "ね": "ne", "の": "no",
+    "は": "ha", "ひ": "hi", "ふ": "fu", "へ": "he", "ほ": "ho",
+    "ま": "ma", "み": "mi", "む": "mu", "め": "me", "も": "mo",
+    "や": "ya", "ゆ": "yu", "よ": "yo",
+    "ら": "ra", "り": "ri", "る": "ru", "れ": "re", "ろ": "ro",
+    "わ": "wa", "ゐ": "i", "ゑ": "e", "を": "o", "ん": "n",
+    "が": "ga", "ぎ": "gi", "ぐ": "gu", "げ": "ge", "ご": "go",
+    "ざ": "za", "じ": "ji", "ず": "zu", "ぜ": "ze", "ぞ": "zo",
+    "だ": "da", "ぢ": "ji", "づ": "zu", "で": "de", "ど": "do",
+    "ば": "ba", "び": "bi", "ぶ": "bu", "べ": "be", "ぼ": "bo",
+    "ぱ": "pa", "ぴ": "pi", "ぷ": "pu", "ぺ": "pe", "ぽ": "po",
+    "ぁ": "a", "ぃ": "i", "ぅ": "u", "ぇ": "e", "ぉ": "o",
+    "ゃ": "ya", "ゅ": "yu", "ょ": "yo", "ゎ": "wa", "ゔ": "vu",
+}
+
+# Yoon (きゃ vb.) - ilk karakterin ünsüz kökü + küçük ya/yu/yo
+_YOON_BASE = {
+    "き": "k", "ぎ": "g", "に": "n", "ひ": "h", "び": "b", "ぴ": "p",
+    "み": "m", "り": "r", "し": "sh", "じ": "j", "ち": "ch", "ぢ": "j",
+}
+_SMALL_Y = {"ゃ": "a", "ゅ": "u", "ょ": "o"}
+# Dış kaynaklı kelimeler: ファ, ティ, ウィ ...
+_SMALL_VOWEL = {"ぁ": "a", "ぃ": "i", "ぅ": "u", "ぇ": "e", "ぉ": "o"}
+_FOREIGN_BASE = {"ふ": "f", "て": "t", "で": "d", "う": "w", "ゔ": "v", "つ": "ts", "し": "sh", "じ": "j", "ち": "ch"}
+
+
+def to_hiragana(text):
+    """Katakana karakterleri hiraganaya çevir (diğerleri aynen kalır)."""
+    return "".join(
+        chr(ord(ch) - _KANA_OFFSET) if _KATA_START <= ord(ch) <= _KATA_END else ch
+        for ch in text or ""
+    )
+
+
+def to_romaji(text):
+    """Kana metni Hepburn romajiye çevir. Kana olmayan karakterler aynen kalır."""
+    s = to_hiragana(text)
+    out = []
+    i = 0
+    geminate = False
+    while i < len(s):
+        ch = s[i]
+        nxt = s[i + 1] if i + 1 < len(s) else ""
+        if ch == "っ":
+            geminate = True
+            i += 1
+            continue
+        if ch == "ー":
+            # uzatma: önceki sesliyi tekrarla
+            if out and out[-1] and out[-1][-1] in "aeiou":
+                out.append(out[-1][-1])
+            i += 1
+            continue
+        if nxt in _SMALL_Y and ch in _YOON_BASE:
+            base = _YOON_BASE[ch]
+            syl = base + ("" if base in ("sh", "j", "ch") else "y") + _SMALL_Y[nxt]
+            i += 2
+        elif nxt in _SMALL_VOWEL and ch in _FOREIGN_BASE:
+            syl = _FOREIGN_BASE[ch] + _SMALL_VOWEL[nxt]
+            i += 2
+        elif ch in _ROMAJI:
+            syl = _ROMAJI[ch]
+            i += 1
+        else:
+            syl = ch
+            i += 1
+        if geminate:
+            if syl[0] not in "aeiou" and syl[0].isalpha():
+                syl = ("t" if syl.startswith("ch") else syl[0]) + syl
+            geminate = False
+        out.append(syl)
+    return "".join(out)
+
+
+# Romaji -> hiragana (Hepburn + Kunrei yazımları)
+_KANA_FROM_ROMAJI = {}
+for _kana, _rom in _ROMAJI.items():
+    if _kana not in _SMALL_Y and _kana not in _SMALL_VOWEL and _kana not in ("ゐ", "ゑ", "を", "ゎ", "ぢ", "づ"):
+        _KANA_FROM_ROMAJI.setdefault(_rom, _kana)
+for _kana, _base in _YOON_BASE.items():
+    if _kana in ("ぢ",):
+        continue
+    for _small, _v in _SMALL_Y.items():
+        _rom = _base + ("" if _base in ("sh", "j", "ch") else "y") + _v
+        _KANA_FROM_ROMAJI.setdefault(_rom, _kana + _small)
+_KANA_FROM_ROMAJI.update({
+    "si": "し", "ti": "ち", "tu": "つ", "hu": "ふ", "zi": "じ", "di": "ぢ", "du": "づ",
+    "sya": "しゃ", "syu": "しゅ", "syo": "しょ", "tya": "ちゃ", "tyu": "ちゅ", "tyo": "ちょ",
+    "zya": "じゃ", "zyu": "じゅ", "zyo": "じょ", "jya": "じゃ", "jyu": "じゅ", "jyo": "じょ",
+    "wo": "を", "nn": "ん", "n'": "ん",
+    "fa": "ふぁ", "fi": "ふぃ", "fe": "ふぇ", "fo": "ふぉ", "thi": "てぃ", "dhi": "でぃ",
+    "she": "しぇ", "je": "じぇ", "che": "ちぇ", "va": "ゔぁ", "vi": "ゔぃ", "vu": "ゔ",
+    "wi": "うぃ", "we": "うぇ",
+})
+_MAX_ROMAJI = max(len(k) for k in _KANA_FROM_ROMAJI)
+_ROMAJI_RE = re.compile(r"^[a-z' -]+$")
+
+
+def is_romaji(text):
+    return bool(text) and bool(_ROMAJI_RE.match(text.lower()))
+
+
+def _syllables(s, i):
+    """s[i]'den başlayan hecenin olası (uzunluk, kana) okumaları, öncelik sırasıyla."""
+    ch = s[i]
+    if ch == "ー":
+        return [(1, "ー")]
+    # çift ünsüz -> っ (nn hariç)
+    if i + 1 < len(s) and ch == s[i + 1] and ch not in "aeioun'":
+        return [(1, "っ")]
+    if ch == "t" and s[i + 1:i + 3] == "ch":
+        return [(1, "っ")]
+    if ch == "n":
+        nxt = s[i + 1:i + 2]
+        if nxt == "n":
+            # "nn" sesli/y önünde ん + yeni hece (konnichi, onna), değilse tek ん
+            after = s[i + 2:i + 3]
+            return [(1, "ん")] if after and after in "aeiouy" else [(2, "ん")]
+        if not nxt or nxt not in "aeiouy'":
+            return [(1, "ん")]
+    if s[i:i + 2] == "wa" and i + 2 == len(s):
+        return [(2, "わ"), (2, "は")]  # sondaki "wa" konuşma dilinde は (konnichiwa)
+    for size in range(min(_MAX_ROMAJI, len(s) - i), 0, -1):
+        kana = _KANA_FROM_ROMAJI.get(s[i:i + size])
+        if kana:
+            if s[i:i + size] == "n":
+                return []  # sesli önündeki tek n, na/ni... hecesi bulunamadı
+            # "ny" + sesli: にゃ satırı ya da ん + や satırı (kinyou -> きんよう)
+            if ch == "n" and s[i + 1] == "y" and i > 0 and s[i - 1] != "n":
+                return [(size, kana), (1, "ん")]
+            return [(size, kana)]
+    return []
+
+
+def _readings(s):
+    """s'nin okumaları, öncelik sırasıyla (tembel üreteç).
+
+    Önce sondan başa hangi konumlardan metnin sonuna ulaşılabildiği
+    hesaplanır; dallanma yalnızca bu konumlara gider. Böylece çevrilemeyen
+    girdide geri izleme üstel değil, doğrusal kalır.
+    """
+    steps = [[]] * (len(s) + 1)
+    live = [False] * len(s) + [True]
+    for i in range(len(s) - 1, -1, -1):
+        steps[i] = [(size, kana) for size, kana in _syllables(s, i) if live[i + size]]
+        live[i] = bool(steps[i])
+    if not live[0]:
+        return
+
+    def walk(i):
+        if i == len(s):
+            yield ""
+            return
+        for size, kana in steps[i]:
+            for rest in walk(i + size):
+                yield kana + rest
+
+    yield from walk(0)
+
+
+# Bundan uzun girdi romaji olarak okunmaz (yapıştırılmış uzun metin)
+MAX_ROMAJI_INPUT = 64
+
+
+def romaji_readings(text, limit=8):
+    """Romajinin olası hiragana okumaları; ilki en olası olanıdır.
+
+    Belirsiz yazımlar dallanır: "ny" + sesli hem にゃ satırı hem ん + や satırı
+    (kinyou -> きにょう, きんよう), sondaki "wa" hem わ hem は (konnichiwa).
+    MAX_ROMAJI_INPUT karakterden uzun girdi için boş liste döner.
+    """
+    s = text.lower().replace("-", "ー").replace(" ", "")
+    if not s or len(s) > MAX_ROMAJI_INPUT:
+        return []
+    return list(islice(_readings(s), limit))
+
+
+def romaji_to_hiragana(text):
+    """Romajiyi hiraganaya çevir. Tamamen çevrilemezse None döndür."""
+    readings = romaji_readings(text, limit=1)
+    return readings[0] if readings else None
+
+
+def is_kana(text):
+    """Metin sadece hiragana/katakana (ve ー) içeriyor mu?"""
+    return bool(text) and all("\u3040" <= ch <= "\u30ff" for ch in text)
+
+
+def reading_forms(text):
+    """Okuma alanını (ör. 'た.べる、ショク') (hiragana, romaji) listesine ayır."""
+    forms = []
+    for part in re.split(r"[、,;/・\s]+", text or ""):
+        clean = part.replace(".", "").replace("-", "").replace("〜", "").replace("～", "").strip()
+        if clean:
+            hira = to_hiragana(clean)
+            forms.append((hira, to_romaji(hira)))
+    return forms
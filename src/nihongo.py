@@ -6,6 +6,10 @@ Kullanim:
     python nihongo.py --init     # Veritabanini sifirdan olustur
     python nihongo.py --stats    # Istatistikleri goster
     python nihongo.py --version  # Surum bilgisi
+    python nihongo.py --db-profile    # Aktif veritabani PRAGMA profilini goster
+    python nihongo.py --rebuild-streak  # Calisma serisini istatistiklerden yeniden hesapla
+    python nihongo.py --fit-scheduler   # FSRS parametrelerini tekrar gecmisinden uydur
+    python nihongo.py --forecast [gun]  # Onumuzdeki gunlerin tekrar yuku tahmini
     python nihongo.py --update        # En son surume guncelle
     python nihongo.py --update-beta   # Beta dahil en son surume guncelle
     python nihongo.py --delete        # Uygulamayi kaldir
@@ -34,7 +38,7 @@ if not getattr(sys, "frozen", False):
         os.execv(sys.executable, [sys.executable] + sys.argv)
 
 from version import __version__
-from paths import DB_PATH
+from paths import DB_PATH, JOURNAL_PATH
 
 # --- --version flag ---
 if "--version" in sys.argv:
@@ -62,7 +66,8 @@ if "--delete" in sys.argv:
     sys.exit(0)
 
 import db
-from ui import console, show_main_menu, show_level_select, show_vocab_list, show_kanji_list, show_vocab_card, show_kanji_card, show_grammar_card, show_stats, show_quiz_menu, show_search_results, show_settings_menu, show_language_select, clear, banner
+import srs
+from ui import console, show_main_menu, show_level_select, show_vocab_list, show_kanji_list, show_vocab_card, show_kanji_card, show_grammar_card, show_stats, show_quiz_menu, show_search_results, show_settings_menu, show_language_select, show_forecast, clear, banner
 from rich.prompt import Prompt, IntPrompt
 import quiz
 
@@ -76,26 +81,18 @@ def migrate_old_db():
 
 
 def ensure_db():
-    """Veritabani yoksa olustur ve seed et."""
+    """İçerik DB'sini (gerekirse) derle, kullanıcı DB'sini oluştur/güncelle."""
     migrate_old_db()
+    from data.init_db import ensure_content_db
+    ensure_content_db()
     if not os.path.exists(DB_PATH):
         console.print(f"[yellow]{t('db.not_found')}[/yellow]")
-        from data.init_db import main as init_main
-        init_main()
-        console.print(f"[green]{t('db.ready')}[/green]\n")
-    else:
         db.init_db()
-        from data.init_db import (migrate_grammar_unique, seed_vocabulary, seed_kanji,
-                                  seed_grammar, migrate_extra_examples, update_extra_examples,
-                                  migrate_meanings, update_meanings)
-        migrate_meanings()
-        migrate_extra_examples()
-        migrate_grammar_unique()
-        seed_vocabulary()
-        seed_kanji()
-        seed_grammar()
-        update_extra_examples()
-        update_meanings()
+        console.print(f"[green]{t('db.ready')}[/green]\n")
+        return
+    db.init_db()
+    import journal
+    journal.replay_journal()
 
 
 def handle_study_vocab():
@@ -165,29 +162,16 @@ def _detail_loop(card, show_fn):
             break
 
 
-def _list_search(items, query):
-    """Filter items by query matching word/reading/meaning fields."""
-    from i18n import meaning_field
-    q = query.lower()
-    mf = meaning_field()
-    results = []
-    for item in items:
-        fields = [
-            _row_get(item, "word"), _row_get(item, "reading"),
-            _row_get(item, "kanji"), _row_get(item, "on_yomi"), _row_get(item, "kun_yomi"),
-            _row_get(item, "meaning_tr"), _row_get(item, "meaning_en"),
-            _row_get(item, "pattern"),
-        ]
-        if any(q in (f or "").lower() for f in fields):
-            results.append(item)
-    return results
+def _list_search(card_type, level, query):
+    """Seviye listesinde ara (search_index: kelime/okuma/kana/romaji/anlam;
+    çekimli fiiller deinflections ile sözlük formuna gider)."""
+    return db.search_cards(card_type, query, level=level, limit=None)
 
 
 def handle_vocab_list():
     level = show_level_select(t("vocab_list_level"))
     if not level:
         return
-    all_vocabs = db.get_vocabulary(level=level)
     filtered = None
     while True:
         clear()
@@ -204,7 +188,7 @@ def handle_vocab_list():
         if choice.lower() == "s":
             query = Prompt.ask(f"[cyan]{t('list.search_prompt')}[/cyan]")
             if query.strip():
-                filtered = _list_search(all_vocabs, query.strip())
+                filtered = _list_search("vocabulary", level, query.strip())
                 if not filtered:
                     console.print(f"[yellow]{t('list.no_match')}[/yellow]")
                     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
@@ -220,7 +204,6 @@ def handle_kanji_list():
     level = show_level_select(t("kanji_list_level"))
     if not level:
         return
-    all_kanjis = db.get_kanji(level=level)
     filtered = None
     while True:
         clear()
@@ -237,7 +220,7 @@ def handle_kanji_list():
         if choice.lower() == "s":
             query = Prompt.ask(f"[cyan]{t('list.search_prompt')}[/cyan]")
             if query.strip():
-                filtered = _list_search(all_kanjis, query.strip())
+                filtered = _list_search("kanji", level, query.strip())
                 if not filtered:
                     console.print(f"[yellow]{t('list.no_match')}[/yellow]")
                     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
@@ -376,6 +359,9 @@ def handle_settings():
             src = Prompt.ask(t("settings.restore_prompt"))
             try:
                 db.restore_db(src.strip())
+                srs.invalidate_learned_kanji()
+                srs.invalidate_due_load()
+                srs.invalidate_scheduler()
                 console.print(f"[green]{t('settings.restore_done')}[/green]")
             except FileNotFoundError as e:
                 console.print(f"[red]{e}[/red]")
@@ -409,16 +395,62 @@ def handle_settings():
             set_card_limit(new_limit)
             console.print(f"\n[green]{t('settings.card_limit_set', limit=new_limit)}[/green]")
             Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
+        elif choice == "7":
+            # Tekrar planlayicisi (SM-2 / FSRS)
+            from i18n import get_scheduler, set_scheduler
+            name = Prompt.ask(t("settings.scheduler_prompt", current=get_scheduler()),
+                              choices=list(srs.SCHEDULERS), default=get_scheduler())
+            set_scheduler(name)
+            srs.invalidate_scheduler()
+            console.print(f"\n[green]{t('settings.scheduler_set', name=name)}[/green]")
+            Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
+        elif choice == "8":
+            console.print()
+            show_forecast()
+            Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
 def main():
+    if "--db-profile" in sys.argv:
+        i18n.init()
+        ensure_db()
+        name, rows = db.describe_profile()
+        print(f"db profile: {name}  ({DB_PATH})")
+        for pragma, expected, actual in rows:
+            print(f"  {pragma:<14} {str(actual):<10} (profil: {expected})")
+        return
+
+    if "--rebuild-streak" in sys.argv:
+        i18n.init()
+        ensure_db()
+        record = db.rebuild_streak()
+        console.print(t("streak.rebuilt", current=record["current"], longest=record["longest"],
+                        last=record["last_active"] or "—"))
+        return
+
+    if "--fit-scheduler" in sys.argv:
+        i18n.init()
+        ensure_db()
+        _, before, after, cards = srs.fit_scheduler()
+        console.print(t("scheduler.fitted", cards=cards, before=f"{before:.4f}", after=f"{after:.4f}"))
+        return
+
+    if "--forecast" in sys.argv:
+        i18n.init()
+        ensure_db()
+        pos = sys.argv.index("--forecast") + 1
+        days = int(sys.argv[pos]) if pos < len(sys.argv) and sys.argv[pos].isdigit() else None
+        show_forecast(days)
+        return
+
     if "--init" in sys.argv:
         i18n.init()
         if os.path.exists(DB_PATH):
-            os.remove(DB_PATH)
+            db.delete_db()
+            if os.path.exists(JOURNAL_PATH):
+                os.remove(JOURNAL_PATH)
             console.print(f"[yellow]{t('db.old_deleted')}[/yellow]")
-        from data.init_db import main as init_main
-        init_main()
+        ensure_db()
         return
 
     if "--stats" in sys.argv:
@@ -15,6 +15,8 @@ else:
 
 # JSON veri dosyaları dizini (data/*.json)
 DATA_DIR = os.path.join(_BASE_DIR, "data")
+# Derleme adımında JSON'dan üretilen salt okunur içerik DB'si
+CONTENT_DB_PATH = os.path.join(DATA_DIR, "content.db")
 
 # Veritabanı: kullanıcı dizininde (OS'e göre)
 if sys.platform == "win32":
@@ -26,3 +28,5 @@ else:
 os.makedirs(_DB_DIR, exist_ok=True)
 DB_PATH = os.path.join(_DB_DIR, "nihongo.db")
 CONFIG_PATH = os.path.join(_DB_DIR, "config.json")
+# Henüz DB'ye yazılmamış tekrar/istatistik kayıtları (çökmeye karşı)
+JOURNAL_PATH = os.path.join(_DB_DIR, "reviews.journal")
@@ -10,6 +10,9 @@ import srs
 import ui
 import tts
 import conjugation
+import journal
+import quiz_pool
+import sentences
 from i18n import t, meaning_field, get_card_limit
 
 
@@ -21,6 +24,50 @@ def _quality_from_choice(choice, vocab_mode=False):
     return {"1": 1, "2": 3, "3": 4, "4": 5}.get(choice, 4)
 
 
+def _elapsed_ms(start):
+    """time.monotonic() baslangicindan bu yana gecen sure (ms), review_log icin."""
+    return int((time.monotonic() - start) * 1000)
+
+
+def _next_due_key(due_cards):
+    """Bekleyen sayfasi doluysa (birikim suruyor) sonraki sayfanin keyset anahtari."""
+    if len(due_cards) < db.DUE_PAGE:
+        return None
+    return db.due_review_key(due_cards[-1][1])
+
+
+def _extend_due(card_type, level, cards, after):
+    """Birikimin sonraki bekleyen sayfasini seansa ekle, yeni anahtari dondur.
+
+    Seanstaki cevaplar journal'da bekledigi icin DB'de hala bekleyen
+    gorunurler; keyset (after) onlari atlar, ayni kart iki kez gelmez.
+    """
+    due, _ = db.get_study_cards(card_type, level, new_limit=0, after=after)
+    key = _next_due_key(due)
+    random.shuffle(due)
+    cards.extend(due)
+    return key
+
+
+def _choose_distractors(q, index, by_id, items, k=3, top=6):
+    """Onceden hesaplanmis indeksten k celdirici sec (en benzer `top` icinden).
+
+    Indeks yoksa ya da yetmezse havuzdan rastgele tamamlanir. Secilen
+    siklarin anlamlari birbirinden ve dogru cevaptan farklidir.
+    """
+    candidates = [by_id[i] for i in index.get(q.id, ())[:top] if i in by_id]
+    chosen = random.sample(candidates, min(k, len(candidates)))
+    seen = {q.meaning} | {c.meaning for c in chosen}
+    for _ in range(len(items) * 2):
+        if len(chosen) >= k:
+            break
+        cand = random.choice(items)
+        if cand.meaning not in seen:
+            seen.add(cand.meaning)
+            chosen.append(cand)
+    return chosen
+
+
 def _review_wrong_cards(wrong_cards, card_type, show_fn):
     """Yanlis yapilanları tekrar goster. Kart listesi + gosterim fonksiyonu alir."""
     if not wrong_cards:
@@ -33,6 +80,8 @@ def _review_wrong_cards(wrong_cards, card_type, show_fn):
     ui.clear()
     ui.console.print(f"\n[bold red]{t('quiz.wrong_review_title')}[/bold red]\n")
 
+    # Havuz kayitlari sadece quiz alanlarini tutar; kart gosterimi icin tam satirlar
+    wrong_cards = db.get_cards_by_ids(card_type, [c.id for c in wrong_cards])
     for i, card in enumerate(wrong_cards):
         ui.console.print(f"[dim]── {i+1}/{len(wrong_cards)} ──[/dim]\n")
         show_fn(card, show_answer=True)
@@ -53,22 +102,16 @@ def _review_wrong_cards(wrong_cards, card_type, show_fn):
         ui.clear()
 
 
+@journal.buffered
 def study_vocabulary(level):
     """Kelime kartlari ile SRS calismasi."""
     ui.clear()
     ui.console.print(f"\n[bold magenta]{t('study.vocab_title', level=level)}[/bold magenta]\n")
 
-    # Bekleyen tekrarlar
-    due_reviews = db.get_due_reviews(card_type="vocabulary")
-    due_cards = []
-    for r in due_reviews:
-        vocab = db.get_vocab_by_id(r["card_id"])
-        if vocab and vocab["level"] == level:
-            due_cards.append(vocab)
-
-    new_cards = db.get_new_cards("vocabulary", level, limit=get_card_limit())
+    # Bekleyen tekrarlar + yeni kartlar (review satirlariyla birlikte)
+    due_cards, new_cards = db.get_study_cards("vocabulary", level, new_limit=get_card_limit())
 
-    cards = due_cards + list(new_cards)
+    cards = due_cards + new_cards
     if not cards:
         ui.console.print(f"[yellow]{t('study.no_cards_vocab')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
@@ -81,15 +124,20 @@ def study_vocabulary(level):
     reviewed = 0
     correct = 0
     new_count = 0
+    after = _next_due_key(due_cards)
+    scheduler = srs.get_scheduler()
 
-    for i, card in enumerate(cards):
-        review = db.get_review("vocabulary", card["id"])
+    for i, (card, review) in enumerate(cards):
+        if after and i == len(cards) - 1:
+            after = _extend_due("vocabulary", level, cards, after)
         status = ui.card_status_label(review)
         ui.console.print(f"[dim]── {t('quiz.card_n', n=i+1, total=len(cards))} {status} ──[/dim]\n")
 
+        shown = time.monotonic()
         ui.show_vocab_card(card, show_answer=False)
         tts.speak(card["word"])
         input()
+        response_ms = _elapsed_ms(shown)
 
         ui.clear()
         ui.console.print(f"[dim]── {t('quiz.card_n', n=i+1, total=len(cards))} {status} ──[/dim]\n")
@@ -114,7 +162,9 @@ def study_vocabulary(level):
         else:
             weak_kanji = None  # 1=bilmiyorum, flag degistirme
 
-        interval, next_date = srs.review_card("vocabulary", card["id"], quality, weak_kanji=weak_kanji)
+        interval, next_date = srs.review_card("vocabulary", card["id"], quality, weak_kanji=weak_kanji,
+                                             mode="study", response_ms=response_ms,
+                                             scheduler=scheduler)
 
         reviewed += 1
         if quality >= 3:
@@ -127,27 +177,21 @@ def study_vocabulary(level):
         ui.clear()
 
     elapsed = int(time.time() - start_time)
-    db.update_stats(reviewed=reviewed, correct=correct, new=new_count, seconds=elapsed)
+    journal.update_stats(reviewed=reviewed, correct=correct, new=new_count, seconds=elapsed)
 
     ui.console.print(f"\n[green]{t('study.done', reviewed=reviewed, correct=correct, minutes=elapsed//60)}[/green]")
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+@journal.buffered
 def study_kanji(level):
     """Kanji kartlari ile SRS calismasi."""
     ui.clear()
     ui.console.print(f"\n[bold blue]{t('study.kanji_title', level=level)}[/bold blue]\n")
 
-    due_reviews = db.get_due_reviews(card_type="kanji")
-    due_cards = []
-    for r in due_reviews:
-        kanji = db.get_kanji_by_id(r["card_id"])
-        if kanji and kanji["level"] == level:
-            due_cards.append(kanji)
+    due_cards, new_cards = db.get_study_cards("kanji", level, new_limit=get_card_limit())
 
-    new_cards = db.get_new_cards("kanji", level, limit=get_card_limit())
-
-    cards = due_cards + list(new_cards)
+    cards = due_cards + new_cards
     if not cards:
         ui.console.print(f"[yellow]{t('study.no_cards_kanji')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
@@ -160,15 +204,20 @@ def study_kanji(level):
     reviewed = 0
     correct = 0
     new_count = 0
+    after = _next_due_key(due_cards)
+    scheduler = srs.get_scheduler()
 
-    for i, card in enumerate(cards):
-        review = db.get_review("kanji", card["id"])
+    for i, (card, review) in enumerate(cards):
+        if after and i == len(cards) - 1:
+            after = _extend_due("kanji", level, cards, after)
         status = ui.card_status_label(review)
         ui.console.print(f"[dim]── {t('quiz.card_n', n=i+1, total=len(cards))} {status} ──[/dim]\n")
 
+        shown = time.monotonic()
         ui.show_kanji_card(card, show_answer=False)
         tts.speak(card["kanji"])
         input()
+        response_ms = _elapsed_ms(shown)
 
         ui.clear()
         ui.console.print(f"[dim]── {t('quiz.card_n', n=i+1, total=len(cards))} {status} ──[/dim]\n")
@@ -182,7 +231,9 @@ def study_kanji(level):
 
         quality = _quality_from_choice(choice)
         is_new = review is None
-        interval, next_date = srs.review_card("kanji", card["id"], quality)
+        interval, next_date = srs.review_card("kanji", card["id"], quality,
+                                             mode="study", response_ms=response_ms,
+                                             scheduler=scheduler)
 
         reviewed += 1
         if quality >= 3:
@@ -195,27 +246,21 @@ def study_kanji(level):
         ui.clear()
 
     elapsed = int(time.time() - start_time)
-    db.update_stats(reviewed=reviewed, correct=correct, new=new_count, seconds=elapsed)
+    journal.update_stats(reviewed=reviewed, correct=correct, new=new_count, seconds=elapsed)
 
     ui.console.print(f"\n[green]{t('study.done', reviewed=reviewed, correct=correct, minutes=elapsed//60)}[/green]")
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+@journal.buffered
 def study_grammar(level):
     """Dilbilgisi kartlari ile SRS calismasi."""
     ui.clear()
     ui.console.print(f"\n[bold yellow]{t('study.grammar_title', level=level)}[/bold yellow]\n")
 
-    due_reviews = db.get_due_reviews(card_type="grammar")
-    due_cards = []
-    for r in due_reviews:
-        gram = db.get_grammar_by_id(r["card_id"])
-        if gram and gram["level"] == level:
-            due_cards.append(gram)
-
-    new_cards = db.get_new_cards("grammar", level, limit=get_card_limit())
+    due_cards, new_cards = db.get_study_cards("grammar", level, new_limit=get_card_limit())
 
-    cards = due_cards + list(new_cards)
+    cards = due_cards + new_cards
     if not cards:
         ui.console.print(f"[yellow]{t('study.no_cards_grammar')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
@@ -228,15 +273,20 @@ def study_grammar(level):
     reviewed = 0
     correct = 0
     new_count = 0
+    after = _next_due_key(due_cards)
+    scheduler = srs.get_scheduler()
 
-    for i, card in enumerate(cards):
-        review = db.get_review("grammar", card["id"])
+    for i, (card, review) in enumerate(cards):
+        if after and i == len(cards) - 1:
+            after = _extend_due("grammar", level, cards, after)
         status = ui.card_status_label(review)
         ui.console.print(f"[dim]── {t('quiz.card_n', n=i+1, total=len(cards))} {status} ──[/dim]\n")
 
+        shown = time.monotonic()
         ui.show_grammar_card(card, show_answer=False)
         tts.speak(card["pattern"])
         input()
+        response_ms = _elapsed_ms(shown)
 
         ui.clear()
         ui.console.print(f"[dim]── {t('quiz.card_n', n=i+1, total=len(cards))} {status} ──[/dim]\n")
@@ -252,7 +302,9 @@ def study_grammar(level):
 
         quality = _quality_from_choice(choice)
         is_new = review is None
-        interval, next_date = srs.review_card("grammar", card["id"], quality)
+        interval, next_date = srs.review_card("grammar", card["id"], quality,
+                                             mode="study", response_ms=response_ms,
+                                             scheduler=scheduler)
 
         reviewed += 1
         if quality >= 3:
@@ -265,45 +317,48 @@ def study_grammar(level):
         ui.clear()
 
     elapsed = int(time.time() - start_time)
-    db.update_stats(reviewed=reviewed, correct=correct, new=new_count, seconds=elapsed)
+    journal.update_stats(reviewed=reviewed, correct=correct, new=new_count, seconds=elapsed)
 
     ui.console.print(f"\n[green]{t('study.done', reviewed=reviewed, correct=correct, minutes=elapsed//60)}[/green]")
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+@journal.buffered
 def quiz_jp_to_tr(level, count=10):
     """Japonca -> native quiz. 4 sikli coktan secmeli."""
     mf = meaning_field()
     ui.clear()
     ui.console.print(f"\n[bold]{t('quiz.jp_to_native_title', level=level)}[/bold]\n")
 
-    all_vocab = db.get_vocabulary(level=level)
-    if len(all_vocab) < 4:
+    pool = quiz_pool.get_pool("vocabulary", level, mf)
+    if len(pool) < 4:
         ui.console.print(f"[yellow]{t('quiz.not_enough_vocab')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
         return
 
-    questions = random.sample(list(all_vocab), min(count, len(all_vocab)))
+    questions = pool.sample(count)
     correct_count = 0
     total = len(questions)
     wrong_cards = []
+    index = db.get_distractors("vocabulary", mf[len("meaning_"):], [q.id for q in questions])
 
     for i, q in enumerate(questions):
+        shown = time.monotonic()
         ui.console.print(f"[dim]── {t('quiz.question_n', n=i+1, total=total)} ──[/dim]")
-        ui.console.print(f"\n  [bold white on red] {q['word']} [/bold white on red]  [green]({q['reading']})[/green]\n")
+        ui.console.print(f"\n  [bold white on red] {q.word} [/bold white on red]  [green]({q.reading})[/green]\n")
 
-        # 4 sik olustur
-        wrong = [v for v in all_vocab if v["id"] != q["id"]]
-        distractors = random.sample(wrong, min(3, len(wrong)))
-        options = [q[mf]] + [d[mf] for d in distractors]
+        # 4 sik olustur: benzer kelimelerden (anlam/okuma/kanji/tur)
+        distractors = _choose_distractors(q, index, pool.by_id, pool.items)
+        options = [q.meaning] + [d.meaning for d in distractors]
         random.shuffle(options)
 
-        correct_idx = options.index(q[mf])
+        correct_idx = options.index(q.meaning)
 
         for j, opt in enumerate(options):
             ui.console.print(f"  [cyan]{j+1}[/cyan]) {opt}")
 
         answer = Prompt.ask(f"\n{t('quiz.your_answer')}", choices=["1","2","3","4","q"], default="1")
+        response_ms = _elapsed_ms(shown)
         if answer == "q":
             ui.show_quiz_result(correct_count, i)
             _review_wrong_cards(wrong_cards, "vocabulary", ui.show_vocab_card)
@@ -312,13 +367,13 @@ def quiz_jp_to_tr(level, count=10):
         if int(answer) - 1 == correct_idx:
             ui.console.print(f"[bold green]  ✓ {t('quiz.correct')}[/bold green]")
             correct_count += 1
-            srs.review_card("vocabulary", q["id"], 4)
+            srs.review_card("vocabulary", q.id, 4, mode="jp_to_native", response_ms=response_ms)
         else:
-            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red] {t('quiz.correct_answer', answer=q[mf])}")
-            srs.review_card("vocabulary", q["id"], 1)
+            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red] {t('quiz.correct_answer', answer=q.meaning)}")
+            srs.review_card("vocabulary", q.id, 1, mode="jp_to_native", response_ms=response_ms)
             wrong_cards.append(q)
 
-        db.update_stats(reviewed=1, correct=1 if int(answer) - 1 == correct_idx else 0)
+        journal.update_stats(reviewed=1, correct=1 if int(answer) - 1 == correct_idx else 0)
         ui.console.print()
 
     ui.show_quiz_result(correct_count, total)
@@ -326,6 +381,7 @@ def quiz_jp_to_tr(level, count=10):
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+@journal.buffered
 def quiz_tr_to_jp(level, count=10):
     """Native -> Japonca quiz. Yazarak cevaplama."""
     mf = meaning_field()
@@ -333,41 +389,43 @@ def quiz_tr_to_jp(level, count=10):
     ui.console.print(f"\n[bold]{t('quiz.native_to_jp_title', level=level)}[/bold]")
     ui.console.print(f"[dim]{t('quiz.native_to_jp_hint')}[/dim]\n")
 
-    all_vocab = db.get_vocabulary(level=level)
-    if not all_vocab:
+    pool = quiz_pool.get_pool("vocabulary", level, mf)
+    if not pool:
         ui.console.print(f"[yellow]{t('quiz.no_vocab')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
         return
 
-    questions = random.sample(list(all_vocab), min(count, len(all_vocab)))
+    questions = pool.sample(count)
     correct_count = 0
     total = len(questions)
     wrong_cards = []
 
     for i, q in enumerate(questions):
+        shown = time.monotonic()
         ui.console.print(f"[dim]── {t('quiz.question_n', n=i+1, total=total)} ──[/dim]")
-        ui.console.print(f"\n  {t('meaning_label')}: [bold yellow]{q[mf]}[/bold yellow]")
+        ui.console.print(f"\n  {t('meaning_label')}: [bold yellow]{q.meaning}[/bold yellow]")
         if mf == "meaning_tr":
-            ui.console.print(f"  {t('english_meaning')}: [dim]{q['meaning_en']}[/dim]\n")
+            ui.console.print(f"  {t('english_meaning')}: [dim]{q.meaning_en}[/dim]\n")
         else:
             ui.console.print()
 
         answer = Prompt.ask(t("quiz.japanese_label")).strip()
+        response_ms = _elapsed_ms(shown)
         if answer == "q":
             ui.show_quiz_result(correct_count, i)
             _review_wrong_cards(wrong_cards, "vocabulary", ui.show_vocab_card)
             return
 
-        if answer == q["word"] or answer == q["reading"]:
+        if answer == q.word or answer == q.reading:
             ui.console.print(f"[bold green]  ✓ {t('quiz.correct')}[/bold green]")
             correct_count += 1
-            srs.review_card("vocabulary", q["id"], 4)
+            srs.review_card("vocabulary", q.id, 4, mode="native_to_jp", response_ms=response_ms)
         else:
-            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red] {t('quiz.correct_was', word=q['word'], reading=q['reading'])}")
-            srs.review_card("vocabulary", q["id"], 1)
+            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red] {t('quiz.correct_was', word=q.word, reading=q.reading)}")
+            srs.review_card("vocabulary", q.id, 1, mode="native_to_jp", response_ms=response_ms)
             wrong_cards.append(q)
 
-        db.update_stats(reviewed=1, correct=1 if answer in (q["word"], q["reading"]) else 0)
+        journal.update_stats(reviewed=1, correct=1 if answer in (q.word, q.reading) else 0)
         ui.console.print()
 
     ui.show_quiz_result(correct_count, total)
@@ -375,53 +433,55 @@ def quiz_tr_to_jp(level, count=10):
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+@journal.buffered
 def quiz_kanji_reading(level, count=10):
     """Kanji okuma quiz'i. Kanji goster, okumayi sor."""
     ui.clear()
     ui.console.print(f"\n[bold]{t('quiz.kanji_reading_title', level=level)}[/bold]")
     ui.console.print(f"[dim]{t('quiz.kanji_reading_hint')}[/dim]\n")
 
-    all_kanji = db.get_kanji(level=level)
-    if not all_kanji:
+    pool = quiz_pool.get_pool("kanji", level, meaning_field())
+    if not pool:
         ui.console.print(f"[yellow]{t('quiz.no_kanji')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
         return
 
-    mf = meaning_field()
-    questions = random.sample(list(all_kanji), min(count, len(all_kanji)))
+    questions = pool.sample(count)
     correct_count = 0
     total = len(questions)
     wrong_cards = []
 
     for i, q in enumerate(questions):
+        shown = time.monotonic()
         ui.console.print(f"[dim]── {t('quiz.question_n', n=i+1, total=total)} ──[/dim]")
-        ui.console.print(f"\n  {t('kanji')}: [bold white on red] {q['kanji']} [/bold white on red]\n")
+        ui.console.print(f"\n  {t('kanji')}: [bold white on red] {q.kanji} [/bold white on red]\n")
 
         answer = Prompt.ask(t("quiz.reading_label")).strip()
+        response_ms = _elapsed_ms(shown)
         if answer == "q":
             ui.show_quiz_result(correct_count, i)
             _review_wrong_cards(wrong_cards, "kanji", ui.show_kanji_card)
             return
 
         valid_readings = []
-        for reading_field in [q["kun_yomi"], q["on_yomi"]]:
+        for reading_field in [q.kun_yomi, q.on_yomi]:
             for part in reading_field.replace("\u3001", ",").split(","):
                 clean = part.strip().split(".")[0].strip()
                 if clean:
                     valid_readings.append(clean)
 
-        if answer in valid_readings or answer == q["kun_yomi"].split("\u3001")[0].split(".")[0].strip():
+        if answer in valid_readings or answer == q.kun_yomi.split("\u3001")[0].split(".")[0].strip():
             ui.console.print(f"[bold green]  ✓ {t('quiz.correct')}[/bold green]")
             correct_count += 1
-            srs.review_card("kanji", q["id"], 4)
+            srs.review_card("kanji", q.id, 4, mode="kanji_reading", response_ms=response_ms)
         else:
-            readings_str = f"On: {q['on_yomi']} / Kun: {q['kun_yomi']}"
+            readings_str = f"On: {q.on_yomi} / Kun: {q.kun_yomi}"
             ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red] {t('quiz.readings', readings=readings_str)}")
-            srs.review_card("kanji", q["id"], 1)
+            srs.review_card("kanji", q.id, 1, mode="kanji_reading", response_ms=response_ms)
             wrong_cards.append(q)
 
-        ui.console.print(f"  {t('quiz.meaning_line', meaning=q[mf])}")
-        db.update_stats(reviewed=1, correct=1 if answer in valid_readings else 0)
+        ui.console.print(f"  {t('quiz.meaning_line', meaning=q.meaning)}")
+        journal.update_stats(reviewed=1, correct=1 if answer in valid_readings else 0)
         ui.console.print()
 
     ui.show_quiz_result(correct_count, total)
@@ -429,37 +489,40 @@ def quiz_kanji_reading(level, count=10):
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+@journal.buffered
 def quiz_kanji_meaning(level, count=10):
     """Kanji anlam quiz'i. 4 sikli."""
     mf = meaning_field()
     ui.clear()
     ui.console.print(f"\n[bold]{t('quiz.kanji_meaning_title', level=level)}[/bold]\n")
 
-    all_kanji = db.get_kanji(level=level)
-    if len(all_kanji) < 4:
+    pool = quiz_pool.get_pool("kanji", level, mf)
+    if len(pool) < 4:
         ui.console.print(f"[yellow]{t('quiz.not_enough_kanji')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
         return
 
-    questions = random.sample(list(all_kanji), min(count, len(all_kanji)))
+    questions = pool.sample(count)
     correct_count = 0
     total = len(questions)
     wrong_cards = []
+    index = db.get_distractors("kanji", mf[len("meaning_"):], [q.id for q in questions])
 
     for i, q in enumerate(questions):
+        shown = time.monotonic()
         ui.console.print(f"[dim]── {t('quiz.question_n', n=i+1, total=total)} ──[/dim]")
-        ui.console.print(f"\n  {t('kanji')}: [bold white on red] {q['kanji']} [/bold white on red]\n")
+        ui.console.print(f"\n  {t('kanji')}: [bold white on red] {q.kanji} [/bold white on red]\n")
 
-        wrong = [k for k in all_kanji if k["id"] != q["id"]]
-        distractors = random.sample(wrong, min(3, len(wrong)))
-        options = [q[mf]] + [d[mf] for d in distractors]
+        distractors = _choose_distractors(q, index, pool.by_id, pool.items)
+        options = [q.meaning] + [d.meaning for d in distractors]
         random.shuffle(options)
-        correct_idx = options.index(q[mf])
+        correct_idx = options.index(q.meaning)
 
         for j, opt in enumerate(options):
             ui.console.print(f"  [cyan]{j+1}[/cyan]) {opt}")
 
         answer = Prompt.ask(f"\n{t('quiz.your_answer')}", choices=["1","2","3","4","q"], default="1")
+        response_ms = _elapsed_ms(shown)
         if answer == "q":
             ui.show_quiz_result(correct_count, i)
             _review_wrong_cards(wrong_cards, "kanji", ui.show_kanji_card)
@@ -468,14 +531,14 @@ def quiz_kanji_meaning(level, count=10):
         if int(answer) - 1 == correct_idx:
             ui.console.print(f"[bold green]  ✓ {t('quiz.correct')}[/bold green]")
             correct_count += 1
-            srs.review_card("kanji", q["id"], 4)
+            srs.review_card("kanji", q.id, 4, mode="kanji_meaning", response_ms=response_ms)
         else:
-            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red] {t('quiz.correct_answer', answer=q[mf])}")
-            srs.review_card("kanji", q["id"], 1)
+            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red] {t('quiz.correct_answer', answer=q.meaning)}")
+            srs.review_card("kanji", q.id, 1, mode="kanji_meaning", response_ms=response_ms)
             wrong_cards.append(q)
 
-        ui.console.print(f"  {t('reading')}: On: {q['on_yomi']} / Kun: {q['kun_yomi']}")
-        db.update_stats(reviewed=1, correct=1 if int(answer) - 1 == correct_idx else 0)
+        ui.console.print(f"  {t('reading')}: On: {q.on_yomi} / Kun: {q.kun_yomi}")
+        journal.update_stats(reviewed=1, correct=1 if int(answer) - 1 == correct_idx else 0)
         ui.console.print()
 
     ui.show_quiz_result(correct_count, total)
@@ -483,40 +546,7 @@ def quiz_kanji_meaning(level, count=10):
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
-def _split_japanese(sentence):
-    """Japonca cumleyi parcalara ayir. Particle-aware bolme."""
-    # Noktalama temizle
-    clean = sentence.replace("。", "").replace("、", "").replace("！", "").replace("？", "").strip()
-    if not clean:
-        return []
-
-    # Particle'lardan sonra bol
-    import re
-    # Particle: は が を に で へ の と も か ね よ
-    # Ayrica: です ます した ない から まで より けど
-    parts = re.split(r'(は|が|を|に|で|へ|の|と|も|か|ね|よ|から|まで|より|けど)', clean)
-
-    # Particle'lari onceki chunk'a yap (は → 私は)
-    chunks = []
-    i = 0
-    while i < len(parts):
-        if not parts[i]:
-            i += 1
-            continue
-        chunk = parts[i]
-        # Sonraki parca particle mi?
-        if i + 1 < len(parts) and len(parts[i+1]) <= 3:
-            chunk += parts[i+1]
-            i += 2
-        else:
-            i += 1
-        if chunk.strip():
-            chunks.append(chunk)
-
-    # 2'den az parca varsa kullanilamaz
-    return chunks if len(chunks) >= 2 else []
-
-
+@journal.buffered
 def quiz_sentence_order(level, count=10):
     """Cumle siralama quiz'i. Karisik parcalari dogru siraya diz."""
     mf = meaning_field()
@@ -524,28 +554,23 @@ def quiz_sentence_order(level, count=10):
     ui.console.print(f"\n[bold]{t('quiz.sentence_order_title', level=level)}[/bold]")
     ui.console.print(f"[dim]{t('quiz.sentence_order_hint')}[/dim]\n")
 
-    all_vocab = db.get_vocabulary(level=level)
-    # Ornek cumlesi olan ve parcalanabilen kelimeleri filtrele
-    with_examples = []
-    for v in all_vocab:
-        if v["example_jp"] and len(v["example_jp"]) >= 6:
-            chunks = _split_japanese(v["example_jp"])
-            if len(chunks) >= 3:
-                with_examples.append(v)
+    # Uygun cumleler derlemede parcalanmis halde sentence_chunks'ta
+    pool = quiz_pool.get_pool("vocabulary", level, mf)
+    questions = [(pool.by_id[vocab_id], sentence, chunks)
+                 for vocab_id, sentence, chunks in db.get_sentence_chunks(level, sentences.MIN_CHUNKS, count)
+                 if vocab_id in pool.by_id]
 
-    if len(with_examples) < 3:
+    if len(questions) < 3:
         ui.console.print(f"[yellow]{t('quiz.not_enough_vocab')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
         return
 
-    questions = random.sample(with_examples, min(count, len(with_examples)))
     correct_count = 0
     total = len(questions)
     wrong_cards = []
 
-    for i, q in enumerate(questions):
-        sentence = q["example_jp"]
-        chunks = _split_japanese(sentence)
+    for i, (q, sentence, chunks) in enumerate(questions):
+        shown = time.monotonic()
 
         # Karistir (dogru sirayla ayni olmayana kadar)
         shuffled = chunks[:]
@@ -558,9 +583,9 @@ def quiz_sentence_order(level, count=10):
         ui.console.print(f"[dim]── {t('quiz.question_n', n=i+1, total=total)} ──[/dim]")
 
         # Anlami goster
-        meaning = q[mf] or q["meaning_en"]
+        meaning = q.meaning or q.meaning_en
         ui.console.print(f"\n  {t('meaning_label')}: [bold yellow]{meaning}[/bold yellow]")
-        ui.console.print(f"  {t('word')}: [bold white]{q['word']}[/bold white] ({q['reading']})\n")
+        ui.console.print(f"  {t('word')}: [bold white]{q.word}[/bold white] ({q.reading})\n")
 
         # Karisik parcalari numarayla goster
         for j, chunk in enumerate(shuffled):
@@ -568,6 +593,7 @@ def quiz_sentence_order(level, count=10):
 
         ui.console.print(f"\n  [dim]{t('quiz.sentence_order_input')}[/dim]")
         answer = Prompt.ask(t("quiz.your_answer")).strip()
+        response_ms = _elapsed_ms(shown)
         if answer == "q":
             ui.show_quiz_result(correct_count, i)
             _review_wrong_cards(wrong_cards, "vocabulary", ui.show_vocab_card)
@@ -587,15 +613,15 @@ def quiz_sentence_order(level, count=10):
             ui.console.print(f"\n[bold green]  ✓ {t('quiz.correct')}[/bold green]")
             ui.console.print(f"  {sentence}")
             correct_count += 1
-            srs.review_card("vocabulary", q["id"], 4)
+            srs.review_card("vocabulary", q.id, 4, mode="sentence_order", response_ms=response_ms)
         else:
             ui.console.print(f"\n[bold red]  ✗ {t('quiz.wrong')}[/bold red]")
             ui.console.print(f"  {t('quiz.correct_sentence')}: {sentence}")
-            srs.review_card("vocabulary", q["id"], 1)
+            srs.review_card("vocabulary", q.id, 1, mode="sentence_order", response_ms=response_ms)
             wrong_cards.append(q)
 
         tts.speak(sentence)
-        db.update_stats(reviewed=1, correct=1 if user_sentence == correct_sentence else 0)
+        journal.update_stats(reviewed=1, correct=1 if user_sentence == correct_sentence else 0)
         Prompt.ask(f"\n[dim]{t('continue_enter')}[/dim]", default="")
 
     ui.show_quiz_result(correct_count, total)
@@ -603,49 +629,57 @@ def quiz_sentence_order(level, count=10):
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+@journal.buffered
 def quiz_conjugation(level, count=10):
     """Fiil çekim drilli. Fiil + hedef form verilir, kullanıcı çekimler."""
     ui.clear()
     ui.console.print(f"\n[bold]{t('quiz.conjugation_title', level=level)}[/bold]")
     ui.console.print(f"[dim]{t('quiz.conjugation_hint')}[/dim]\n")
 
-    all_vocab = db.get_vocabulary(level=level)
-    # Sadece fiilleri filtrele
-    verbs = [v for v in all_vocab if v["part_of_speech"] in ("fiil", "動詞")]
-    if len(verbs) < 3:
+    # Fiillerin cekim tablolari derlemede hesaplanmis halde conjugations'ta
+    pool = quiz_pool.get_pool("vocabulary", level, meaning_field())
+    questions = [(pool.by_id[vocab_id], verb_class, forms)
+                 for vocab_id, verb_class, forms in db.get_conjugations(level, count)
+                 if vocab_id in pool.by_id and forms]
+    if len(questions) < 3:
         ui.console.print(f"[yellow]{t('quiz.not_enough_vocab')}[/yellow]")
         Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
         return
 
-    questions = random.sample(verbs, min(count, len(verbs)))
     correct_count = 0
     total = len(questions)
 
-    for i, q in enumerate(questions):
-        form = random.choice(conjugation.FORMS)
+    for i, (q, verb_class, forms) in enumerate(questions):
+        shown = time.monotonic()
+        form = random.choice(list(forms))
         form_jp, form_en = conjugation.FORM_NAMES[form]
-        correct_answer = conjugation.conjugate(q["word"], q["reading"], form)
+        correct_answer, correct_kanji = forms[form]
 
         ui.clear()
         ui.console.print(f"[dim]── {t('quiz.question_n', n=i+1, total=total)} ──[/dim]")
-        ui.console.print(f"\n  {t('word')}: [bold white on red] {q['word']} [/bold white on red]  [green]({q['reading']})[/green]")
+        ui.console.print(f"\n  {t('word')}: [bold white on red] {q.word} [/bold white on red]  [green]({q.reading})[/green]")
         ui.console.print(f"  {t('quiz.target_form')}: [bold yellow]{form_jp}[/bold yellow] ({form_en})\n")
 
         answer = Prompt.ask(t("quiz.conjugation_label")).strip()
+        response_ms = _elapsed_ms(shown)
         if answer == "q":
             ui.show_quiz_result(correct_count, i)
             return
 
-        if answer == correct_answer:
-            ui.console.print(f"[bold green]  ✓ {t('quiz.correct')}[/bold green]")
+        # Hem kana hem kanji yazilis kabul edilir
+        correct = answer in (correct_answer, correct_kanji)
+        shown_answer = correct_answer if correct_kanji == correct_answer else f"{correct_kanji} ({correct_answer})"
+        if correct:
+            ui.console.print(f"[bold green]  ✓ {t('quiz.correct')}[/bold green]  {shown_answer}")
             correct_count += 1
-            srs.review_card("vocabulary", q["id"], 4)
+            srs.review_card("vocabulary", q.id, 4, mode="conjugation", response_ms=response_ms)
         else:
-            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red]  {correct_answer}")
-            srs.review_card("vocabulary", q["id"], 1)
+            ui.console.print(f"[bold red]  ✗ {t('quiz.wrong')}[/bold red]  {shown_answer}")
+            srs.review_card("vocabulary", q.id, 1, mode="conjugation", response_ms=response_ms)
+        ui.console.print(f"  [dim]{conjugation.CLASS_NAMES[verb_class]}[/dim]")
 
         tts.speak(correct_answer)
-        db.update_stats(reviewed=1, correct=1 if answer == correct_answer else 0)
+        journal.update_stats(reviewed=1, correct=1 if correct else 0)
         Prompt.ask(f"\n[dim]{t('continue_enter')}[/dim]", default="")
 
     ui.show_quiz_result(correct_count, total)
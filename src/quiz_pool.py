@@ -0,0 +1,72 @@
+"""Quiz havuzları - seviye ve anlam dili başına önbellekli kart kayıtları.
+
+Quizler her turda tüm seviyeyi sqlite3.Row olarak okumak yerine
+(card_type, seviye, anlam alanı) başına bir kez yüklenen havuzdan örnekler.
+Kayıtlar sadece quizlerin kullandığı alanları tutan __slots__ nesneleridir;
+anlam, seçili dildeki alandan `meaning` olarak gelir.
+
+Havuzlar content.db sürümü (db.content_version) değişince atılır.
+"""
+
+import random
+
+import db
+
+
+class _Item:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.id})"
+
+
+class VocabItem(_Item):
+    __slots__ = ("id", "word", "reading", "meaning", "meaning_en")
+
+
+class KanjiItem(_Item):
+    __slots__ = ("id", "kanji", "on_yomi", "kun_yomi", "meaning")
+
+
+# card_type -> kayıt sınıfı; sütunlar __slots__ sırasıyla, "meaning" seçili anlam alanından
+_RECORDS = {"vocabulary": VocabItem, "kanji": KanjiItem}
+
+
+class Pool:
+    """Bir seviyenin kayıtları; örnekleme O(k)."""
+
+    __slots__ = ("items", "by_id")
+
+    def __init__(self, items):
+        self.items = items
+        self.by_id = {item.id: item for item in items}
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, k):
+        return random.sample(self.items, min(k, len(self.items)))
+
+
+_pools = {}
+_version = None
+
+
+def get_pool(card_type, level, meaning_field):
+    """(card_type, level, meaning_field) havuzunu döndür; yoksa yükle."""
+    global _version
+    version = db.content_version()
+    if version != _version:
+        _pools.clear()
+        _version = version
+    key = (card_type, level, meaning_field)
+    pool = _pools.get(key)
+    if pool is None:
+        record = _RECORDS[card_type]
+        columns = [meaning_field if c == "meaning" else c for c in record.__slots__]
+        pool = _pools[key] = Pool([record(*row) for row in db.get_card_columns(card_type, columns, level)])
+    return pool
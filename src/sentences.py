@@ -0,0 +1,68 @@
+"""Örnek cümleleri sıralama quiz'i için parçalara ayırma.
+
+Parçalama content.db derlenirken bir kez yapılır (data/init_db.py ->
+sentence_chunks tablosu); quiz çalışırken sadece hazır parçaları okur.
+Parçalama kuralı burada değiştirilebilir, çalışma zamanı maliyeti yoktur.
+"""
+
+import json
+import re
+
+MIN_LENGTH = 6   # bundan kısa cümleler quiz'e alınmaz
+MIN_CHUNKS = 3   # quiz için gereken en az parça
+
+_PUNCT_RE = re.compile(r"[。、！？]")
+# Parçacıklar; uzun olanlar önce (から, か'dan önce denenmeli)
+_PARTICLE_RE = re.compile(r"(から|まで|より|けど|は|が|を|に|で|へ|の|と|も|か|ね|よ)")
+
+
+def split_japanese(sentence):
+    """Japonca cümleyi parçacıklardan sonra bölerek parçalara ayır.
+
+    Parçacık önceki parçaya eklenir (私 + は -> 私は). 2'den az parça
+    çıkarsa cümle kullanılamaz, boş liste döner.
+    """
+    clean = _PUNCT_RE.sub("", sentence or "").strip()
+    if not clean:
+        return []
+
+    parts = _PARTICLE_RE.split(clean)
+    chunks = []
+    i = 0
+    while i < len(parts):
+        if not parts[i]:
+            i += 1
+            continue
+        chunk = parts[i]
+        # Sonraki parça parçacık mı?
+        if i + 1 < len(parts) and len(parts[i + 1]) <= 3:
+            chunk += parts[i + 1]
+            i += 2
+        else:
+            i += 1
+        if chunk.strip():
+            chunks.append(chunk)
+    return chunks if len(chunks) >= 2 else []
+
+
+def example_sentences(row):
+    """Kelimenin örnek cümleleri: example_jp + extra_examples[*].jp."""
+    sentences = [row["example_jp"]] if row["example_jp"] else []
+    extras = row["extra_examples"]
+    if extras:
+        try:
+            sentences += [ex.get("jp") for ex in json.loads(extras) if ex.get("jp")]
+        except (ValueError, AttributeError):
+            pass
+    return sentences
+
+
+def chunk_rows(row):
+    """sentence_chunks satırları: (vocab_id, level, cümle, parçalar_json, parça_sayısı)."""
+    for sentence in example_sentences(row):
+        if len(sentence) < MIN_LENGTH:
+            continue
+        chunks = split_japanese(sentence)
+        if chunks:
+            yield (row["id"], row["level"], sentence,
+                   json.dumps(chunks, ensure_ascii=False), len(chunks))
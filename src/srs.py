@@ -8,10 +8,41 @@ Kalite (quality) 0-5 arası:
   3 - Doğru, ama çok zorlandım
   4 - Doğru, biraz düşündüm
   5 - Doğru, hemen bildim
+
+Planlama bir Scheduler üzerinden yapılır: varsayılan SM2Scheduler, ayarlardan
+seçilebilen FSRSScheduler (bkz. fsrs.py). Aktif planlayıcı config'teki
+"scheduler" anahtarından okunur.
 """
 
-from datetime import date, timedelta
-from db import get_review, upsert_review
+import json
+from abc import ABC, abstractmethod
+from array import array
+from datetime import date, datetime, timedelta
+
+import db
+import fsrs
+import i18n
+from journal import get_review, get_reviews, upsert_reviews
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsiyonel; yoksa saf Python döngüsü
+    np = None
+
+# Öğrenilmiş kanji kümesi (furigana kararı için). İlk kullanımda DB'den
+# bir kez yüklenir, sonra review_card ile artımlı güncellenir.
+_learned_kanji = None
+_kanji_chars = {}
+
+# Gün başına vadesi gelen kart sayısı (yük dengeleme). İlk kullanımda
+# db.due_histogram'dan yüklenir, sonra her planlamada yerinde güncellenir.
+_due_load = None
+
+# Aktif planlayıcı (config + FSRS parametreleri). İlk kullanımda bir kez
+# kurulur; ayar değişince ve parametre uydurulunca invalidate_scheduler.
+_scheduler = None
+
+WEAK_KANJI_MAX_INTERVAL = 3
 
 
 def sm2(quality, repetitions, ease_factor, interval):
@@ -51,7 +82,295 @@ def sm2(quality, repetitions, ease_factor, interval):
     return new_repetitions, round(new_ease_factor, 2), new_interval
 
 
-def review_card(card_type, card_id, quality, weak_kanji=None):
+def sm2_batch(qualities, repetitions, ease_factors, intervals):
+    """sm2'nin dizi sürümü: tüm kartları tek geçişte planla.
+
+    Args:
+        qualities, repetitions, ease_factors, intervals: aynı uzunlukta diziler
+            (liste, array.array veya numpy dizisi)
+
+    Returns:
+        (new_repetitions, new_ease_factors, new_intervals) - NumPy varsa
+        numpy dizileri, yoksa array.array. Sonuçlar sm2 ile birebir aynıdır.
+    """
+    if np is not None:
+        q = np.asarray(qualities, dtype=np.int64)
+        reps = np.asarray(repetitions, dtype=np.int64)
+        ef = np.asarray(ease_factors, dtype=np.float64)
+        ivl = np.asarray(intervals, dtype=np.int64)
+        if q.size and (q.min() < 0 or q.max() > 5):
+            raise ValueError("Kalite puanı 0-5 arası olmalı")
+        correct = q >= 3
+        grown = np.round(ivl * ef).astype(np.int64)
+        new_ivl = np.where(reps == 0, 1, np.where(reps == 1, 6, grown))
+        new_ivl = np.where(correct, new_ivl, 1)
+        new_reps = np.where(correct, reps + 1, 0)
+        miss = 5 - q
+        new_ef = np.maximum(ef + (0.1 - miss * (0.08 + miss * 0.02)), 1.3)
+        return new_reps, np.round(new_ef, 2), new_ivl
+
+    new_reps, new_ef, new_ivl = array("q"), array("d"), array("q")
+    for q, r, e, i in zip(qualities, repetitions, ease_factors, intervals):
+        nr, ne, ni = sm2(q, r, e, i)
+        new_reps.append(nr)
+        new_ef.append(ne)
+        new_ivl.append(ni)
+    return new_reps, new_ef, new_ivl
+
+
+class Scheduler(ABC):
+    """Tekrar planlayıcısı arayüzü.
+
+    schedule_batch her kart için (ease_factor, interval, repetitions,
+    stability, difficulty) döndürür; stability/difficulty kullanmayan
+    planlayıcılar None döndürür (DB'deki değer korunur).
+    """
+
+    name = None
+
+    @abstractmethod
+    def schedule(self, review, quality, today):
+        """Tek kart: review mevcut kayıt (dict/Row) veya None."""
+
+    def schedule_batch(self, reviews, qualities, today):
+        return [self.schedule(r, q, today) for r, q in zip(reviews, qualities)]
+
+
+class SM2Scheduler(Scheduler):
+    name = "sm2"
+
+    def schedule(self, review, quality, today):
+        reps, ef, ivl = _sm2_state(review)
+        new_reps, new_ef, new_ivl = sm2(quality, reps, ef, ivl)
+        return new_ef, new_ivl, new_reps, None, None
+
+    def schedule_batch(self, reviews, qualities, today):
+        states = [_sm2_state(r) for r in reviews]
+        new_reps, new_efs, new_ivls = sm2_batch(
+            qualities, [s[0] for s in states], [s[1] for s in states], [s[2] for s in states])
+        return [(float(e), int(i), int(r), None, None)
+                for r, e, i in zip(new_reps, new_efs, new_ivls)]
+
+
+class FSRSScheduler(Scheduler):
+    """Kararlılık/zorluk modeli; aralık hedef hatırlama oranından hesaplanır.
+
+    ease_factor ve repetitions SM-2 kurallarıyla güncellenmeye devam eder,
+    böylece ilerleme sayaçları çalışır ve SM-2'ye geri dönülebilir.
+    """
+
+    name = "fsrs"
+
+    def __init__(self, params=fsrs.DEFAULT_PARAMS, retention=0.9):
+        self.params = tuple(params)
+        self.retention = retention
+
+    def schedule(self, review, quality, today):
+        reps, ef, ivl = _sm2_state(review)
+        new_reps, new_ef, _ = sm2(quality, reps, ef, ivl)
+        g = fsrs.grade(quality)
+        stability = _field(review, "stability")
+        if review is None or (reps == 0 and stability is None):
+            stability, difficulty = fsrs.init_state(g, self.params)
+        else:
+            difficulty = _field(review, "difficulty")
+            if stability is None or difficulty is None:
+                stability, difficulty = fsrs.state_from_sm2(ef, ivl)
+            last = _field(review, "last_review")
+            elapsed = (today - date.fromisoformat(last)).days if last else ivl
+            stability, difficulty = fsrs.next_state(
+                stability, difficulty, max(elapsed, 0), g, self.params)
+        new_ivl = 1 if g == 1 else fsrs.next_interval(stability, self.retention)
+        return new_ef, new_ivl, new_reps, round(stability, 4), round(difficulty, 4)
+
+
+SCHEDULERS = {"sm2": SM2Scheduler, "fsrs": FSRSScheduler}
+
+
+def _field(review, key):
+    if review is None or key not in review.keys():
+        return None
+    return review[key]
+
+
+def _sm2_state(review):
+    if review is None:
+        return 0, 2.5, 0
+    return review["repetitions"], review["ease_factor"], review["interval"]
+
+
+def _build_scheduler(name):
+    if name == "fsrs":
+        params = db.get_meta("fsrs_params")
+        return FSRSScheduler(json.loads(params) if params else fsrs.DEFAULT_PARAMS)
+    return SCHEDULERS.get(name, SM2Scheduler)()
+
+
+def get_scheduler(name=None):
+    """Aktif (önbellekli) veya adı verilen (her seferinde yeni) planlayıcı."""
+    global _scheduler
+    if name is not None:
+        return _build_scheduler(name)
+    if _scheduler is None:
+        _scheduler = _build_scheduler(i18n.get_scheduler())
+    return _scheduler
+
+
+def invalidate_scheduler():
+    """Planlayıcı ayarı veya FSRS parametreleri değişince önbelleği sıfırla."""
+    global _scheduler
+    _scheduler = None
+
+
+def fuzz_range(interval):
+    """Aralığın kaydırılabileceği gün penceresi (en az, en çok)."""
+    if interval < 3:
+        return interval, interval
+    if interval < 7:
+        spread = 1
+    elif interval < 30:
+        spread = max(2, round(interval * 0.15))
+    else:
+        spread = max(4, round(interval * 0.05))
+    return interval - spread, interval + spread
+
+
+def balance_interval(interval, today, previous=None, cap=None):
+    """Aralığı pencere içindeki en az yüklü güne kaydır.
+
+    Birlikte öğrenilen kartların aynı güne yığılmasını önler. Eşit yükte
+    planlayıcının önerdiği güne en yakın olan seçilir; sonuç belirleyicidir.
+
+    Args:
+        interval: planlayıcının önerdiği aralık (gün)
+        previous: kartın eski next_review değeri (yük tablosundan düşülür)
+        cap: en büyük aralık (weak_kanji)
+
+    Returns:
+        (interval, next_review)
+    """
+    load = due_load()
+    lo, hi = fuzz_range(interval)
+    if cap is not None:
+        hi = min(hi, cap)
+        lo = min(lo, hi)
+    best = min(range(lo, hi + 1), key=lambda d: (
+        load.get((today + timedelta(days=d)).isoformat(), 0), abs(d - interval), d))
+    next_review = (today + timedelta(days=best)).isoformat()
+    if previous:
+        load[previous] = load.get(previous, 0) - 1
+    load[next_review] = load.get(next_review, 0) + 1
+    return best, next_review
+
+
+def due_load():
+    """{gün: vadesi gelen kart} yük tablosu (önbellekli)."""
+    global _due_load
+    if _due_load is None:
+        _due_load = db.get_due_histogram()
+    return _due_load
+
+
+def invalidate_due_load():
+    """Tekrar kayıtları toplu değiştiğinde yük tablosunu sıfırla."""
+    global _due_load
+    _due_load = None
+
+
+def review_histories(since=None):
+    """review_log'dan kart başına [(geçen_gün, kalite), ...] listeleri üret."""
+    histories, key, prev, events = [], None, None, None
+    for row in db.get_review_log(since=since, by_card=True):
+        day = date.fromisoformat(row["reviewed_at"][:10])
+        if (row["card_type"], row["card_id"]) != key:
+            key, events = (row["card_type"], row["card_id"]), []
+            histories.append(events)
+            prev = day
+        events.append(((day - prev).days, row["quality"]))
+        prev = day
+    return histories
+
+
+def fit_scheduler(histories=None, max_seconds=5.0):
+    """FSRS parametrelerini tekrar geçmişinden uydur ve meta tablosuna kaydet.
+
+    Args:
+        histories: kart başına [(geçen_gün, kalite), ...] listeleri;
+            None ise review_log'dan okunur
+
+    Returns:
+        (params, loss_before, loss_after, kart_sayısı)
+    """
+    if histories is None:
+        histories = review_histories()
+    params = db.get_meta("fsrs_params")
+    start = json.loads(params) if params else fsrs.DEFAULT_PARAMS
+    fitted, before, after = fsrs.fit_parameters(histories, start, max_seconds=max_seconds)
+    if after < before:
+        db.set_meta("fsrs_params", json.dumps(fitted))
+        invalidate_scheduler()
+    return fitted, before, after, len(histories)
+
+
+def _log_row(card_type, card_id, quality, review, new_interval, now, response_ms, mode):
+    prev = review["interval"] if review else None
+    return (card_type, card_id, now, quality, prev, new_interval, response_ms, mode)
+
+
+def review_cards(card_type, card_ids, qualities, weak_kanji=None, mode=None, scheduler=None):
+    """Birden fazla kartı tek seferde tekrarla: tek okuma, toplu planlama,
+    tek executemany ile yazma (toplu işaretleme, içe aktarma vb. için).
+
+    Args:
+        card_ids: kart ID'leri
+        qualities: her kart için 0-5 kalite puanı (ya da hepsi için tek sayı)
+        weak_kanji: None=değiştirme, 0/1 tüm kartlar için
+        mode: review_log'a yazılacak çalışma modu
+        scheduler: planlayıcı; None ise aktif planlayıcı (get_scheduler)
+
+    Returns:
+        {card_id: (new_interval, next_review_date)}
+    """
+    card_ids = list(card_ids)
+    if isinstance(qualities, int):
+        qualities = [qualities] * len(card_ids)
+    if any(q < 0 or q > 5 for q in qualities):
+        raise ValueError("Kalite puanı 0-5 arası olmalı")
+    existing = get_reviews(card_type, card_ids)
+    today = date.today()
+    now = datetime.now().isoformat(timespec="seconds")
+    previous = [existing.get(card_id) for card_id in card_ids]
+    planned = (scheduler or get_scheduler()).schedule_batch(previous, qualities, today)
+
+    rows, log, result = [], [], {}
+    cap = WEAK_KANJI_MAX_INTERVAL if weak_kanji == 1 else None
+    for card_id, quality, review, (ne, ni, nr, stability, difficulty) in zip(
+            card_ids, qualities, previous, planned):
+        ni, next_review = balance_interval(
+            min(ni, cap) if cap else ni, today, review["next_review"] if review else None, cap)
+        rows.append((card_type, card_id, ne, ni, nr, next_review,
+                     today.isoformat(), weak_kanji, stability, difficulty))
+        log.append(_log_row(card_type, card_id, quality, review, ni, now, None, mode))
+        result[card_id] = (ni, next_review)
+        if card_type == "kanji":
+            _update_learned_kanji(card_id, nr)
+
+    upsert_reviews(rows, log)
+    return result
+
+
+def _update_learned_kanji(card_id, repetitions):
+    if _learned_kanji is None:
+        return
+    char = _kanji_chars.get(card_id)
+    if char and repetitions >= 1:
+        _learned_kanji.add(char)
+    elif char:
+        _learned_kanji.discard(char)
+
+
+def review_card(card_type, card_id, quality, weak_kanji=None, mode=None, response_ms=None,
+                scheduler=None):
     """Bir kartı tekrarla ve SRS bilgilerini güncelle.
 
     Args:
@@ -59,34 +378,55 @@ def review_card(card_type, card_id, quality, weak_kanji=None):
         card_id: kartın veritabanı ID'si
         quality: 0-5 arası kalite puanı
         weak_kanji: None=değiştirme, 0=kanji biliniyor, 1=kanji bilinmiyor
+        mode: çalışma/quiz modu (review_log için)
+        response_ms: kartın gösterilmesinden cevaba kadar geçen süre
+        scheduler: seans başında çözülen planlayıcı; None ise get_scheduler()
 
     Returns:
         (new_interval, next_review_date)
     """
+    if quality < 0 or quality > 5:
+        raise ValueError("Kalite puanı 0-5 arası olmalı")
     existing = get_review(card_type, card_id)
-
-    if existing:
-        repetitions = existing["repetitions"]
-        ease_factor = existing["ease_factor"]
-        interval = existing["interval"]
-    else:
-        repetitions = 0
-        ease_factor = 2.5
-        interval = 0
-
-    new_reps, new_ef, new_interval = sm2(quality, repetitions, ease_factor, interval)
+    today = date.today()
+    new_ef, new_interval, new_reps, stability, difficulty = (scheduler or get_scheduler()).schedule(
+        existing, quality, today)
 
     # weak_kanji: okumayı biliyor ama kanjiyi bilmiyor → max 3 gün aralık
-    if weak_kanji == 1 and new_interval > 3:
-        new_interval = 3
+    cap = WEAK_KANJI_MAX_INTERVAL if weak_kanji == 1 else None
+    if cap and new_interval > cap:
+        new_interval = cap
 
-    next_review = (date.today() + timedelta(days=new_interval)).isoformat()
+    new_interval, next_review = balance_interval(
+        new_interval, today, existing["next_review"] if existing else None, cap)
+    now = datetime.now().isoformat(timespec="seconds")
 
-    upsert_review(card_type, card_id, new_ef, new_interval, new_reps, next_review, weak_kanji=weak_kanji)
+    upsert_reviews(
+        [(card_type, card_id, new_ef, new_interval, new_reps, next_review,
+          today.isoformat(), weak_kanji, stability, difficulty)],
+        [_log_row(card_type, card_id, quality, existing, new_interval, now, response_ms, mode)])
+
+    if card_type == "kanji":
+        _update_learned_kanji(card_id, new_reps)
 
     return new_interval, next_review
 
 
+def learned_kanji():
+    """Öğrenilmiş kanji karakterleri kümesi (repetitions >= 1)."""
+    global _learned_kanji, _kanji_chars
+    if _learned_kanji is None:
+        _kanji_chars = db.get_kanji_chars()
+        _learned_kanji = db.get_learned_kanji()
+    return _learned_kanji
+
+
+def invalidate_learned_kanji():
+    """Tekrar kayıtları toplu değiştiğinde (geri yükleme vb.) kümeyi sıfırla."""
+    global _learned_kanji
+    _learned_kanji = None
+
+
 def quality_from_answer(correct, difficulty="normal"):
     """Cevap doğruluğu ve zorluğa göre kalite puanı döndür.
 
@@ -8,6 +8,7 @@ from rich.columns import Columns
 from rich.prompt import Prompt, IntPrompt
 from rich import box
 import db
+import srs
 from i18n import t, meaning_field, get_lang, translate_pos
 
 console = Console()
@@ -31,18 +32,17 @@ def show_main_menu():
     clear()
     banner()
 
-    today = db.get_today_stats()
-    due = db.count_due_reviews()
-
-    streak = db.get_streak()
+    summary = db.get_daily_summary()
+    due = summary["due"]
+    streak = summary["streak"]
 
     info_table = Table(show_header=False, box=None, padding=(0, 2))
     info_table.add_column(style="cyan")
     info_table.add_column(style="white")
     info_table.add_row(t("due_reviews"), f"[bold yellow]{due}[/bold yellow] {t('cards')}")
-    if today:
-        info_table.add_row(t("today_studied"), f"{today['cards_reviewed']} {t('cards')}")
-        info_table.add_row(t("accuracy"), f"{today['cards_correct']}/{today['cards_reviewed']}" if today['cards_reviewed'] > 0 else "—")
+    if summary["reviewed"] > 0:
+        info_table.add_row(t("today_studied"), f"{summary['reviewed']} {t('cards')}")
+        info_table.add_row(t("accuracy"), f"{summary['correct']}/{summary['reviewed']}")
     else:
         info_table.add_row(t("today_studied"), f"0 {t('cards')}")
     if streak > 0:
@@ -114,16 +114,8 @@ def _should_show_hiragana(word, level):
     has_kanji = any(unicodedata.category(ch) == "Lo" and ord(ch) >= 0x4E00 for ch in word)
     if not has_kanji:
         return False
-    # Kullanicinin ogrendigi kanjileri kontrol et
-    learned = set()
-    conn = db.get_connection()
-    rows = conn.execute("""
-        SELECT k.kanji FROM kanji k
-        JOIN reviews r ON r.card_type = 'kanji' AND r.card_id = k.id
-        WHERE r.repetitions >= 1
-    """).fetchall()
-    conn.close()
-    learned = {r["kanji"] for r in rows}
+    # Kullanicinin ogrendigi kanjiler (seans boyunca bellekte, DB'ye gitmez)
+    learned = srs.learned_kanji()
     # Kelimedeki her kanji ogrenilmis mi?
     for ch in word:
         if ord(ch) >= 0x4E00 and unicodedata.category(ch) == "Lo":
@@ -346,12 +338,14 @@ def show_stats():
     clear()
     banner()
 
-    total_vocab = db.count_vocabulary()
-    total_kanji = db.count_kanji()
-    learned_vocab = db.count_learned("vocabulary")
-    learned_kanji = db.count_learned("kanji")
-    learned_grammar = db.count_learned("grammar")
-    due_total = db.count_due_reviews()
+    dash = db.get_dashboard_stats()
+    vocab, kanji, grammar = dash["vocabulary"], dash["kanji"], dash["grammar"]
+    total_vocab = vocab["total"]
+    total_kanji = kanji["total"]
+    learned_vocab = vocab["learned"]
+    learned_kanji = kanji["learned"]
+    learned_grammar = grammar["learned"]
+    due_total = vocab["due"] + kanji["due"] + grammar["due"]
 
     general = Table(title=t("stats.title"), box=box.ROUNDED, border_style="green")
     general.add_column(t("stats.category"), style="cyan")
@@ -378,13 +372,14 @@ def show_stats():
     jlpt.add_column(t("stats.grammar"), justify="right")
     jlpt.add_column(t("stats.readiness"), justify="right", style="bold")
 
+    empty = {"total": 0, "learned": 0}
     for level in LEVELS:
-        vc = db.count_vocabulary(level)
-        kc = db.count_kanji(level)
-        gc = db.count_grammar(level)
-        lv = db.count_learned("vocabulary", level)
-        lk = db.count_learned("kanji", level)
-        lg = db.count_learned("grammar", level)
+        v = vocab["levels"].get(level, empty)
+        k = kanji["levels"].get(level, empty)
+        g = grammar["levels"].get(level, empty)
+        vc, lv = v["total"], v["learned"]
+        kc, lk = k["total"], k["learned"]
+        gc, lg = g["total"], g["learned"]
 
         v_pct = lv / vc * 100 if vc > 0 else 0
         k_pct = lk / kc * 100 if kc > 0 else 0
@@ -449,6 +444,41 @@ def show_stats():
     Prompt.ask(f"[dim]{t('continue_enter')}[/dim]", default="")
 
 
+def show_forecast(days=None):
+    """Onumuzdeki gunlerin tekrar yuku tahmini (card_limit senaryolari)."""
+    import forecast
+    from datetime import date, timedelta
+    from i18n import get_card_limit
+
+    days = days or forecast.DEFAULT_DAYS
+    current = get_card_limit()
+    results = forecast.scenarios(days)
+
+    summary = Table(title=t("forecast.title", days=days), box=box.ROUNDED, border_style="cyan")
+    summary.add_column(t("forecast.new_per_day"), style="cyan", justify="right")
+    summary.add_column(t("forecast.avg"), justify="right")
+    summary.add_column(t("forecast.peak"), justify="right")
+    summary.add_column(t("forecast.total"), style="yellow", justify="right")
+    today = date.today()
+    for limit, (reviews, new) in results.items():
+        peak = max(range(days), key=reviews.__getitem__)
+        label = f"{limit} *" if limit == current else str(limit)
+        summary.add_row(label, f"{sum(reviews) / days:.0f}",
+                        f"{reviews[peak]} ({(today + timedelta(days=peak)).strftime('%m-%d')})",
+                        str(sum(reviews)))
+    console.print(summary)
+    console.print()
+
+    reviews, new = results[current]
+    upcoming = Table(title=t("forecast.next_days"), box=box.ROUNDED, border_style="green")
+    upcoming.add_column(t("stats.date"), style="cyan")
+    upcoming.add_column(t("stats.due_reviews"), justify="right")
+    upcoming.add_column(t("stats.new"), justify="right")
+    for day in range(min(days, 14)):
+        upcoming.add_row((today + timedelta(days=day)).isoformat(), str(reviews[day]), str(new[day]))
+    console.print(upcoming)
+
+
 def show_quiz_menu():
     console.print(f"\n[bold]{t('quiz.select_mode')}[/bold]")
     menu = Table(show_header=False, box=box.SIMPLE, padding=(0, 2))
@@ -549,10 +579,12 @@ def show_settings_menu():
     menu.add_row("4", t("settings.change_language"))
     menu.add_row("5", t("settings.download_audio"))
     menu.add_row("6", t("settings.card_limit"))
+    menu.add_row("7", t("settings.scheduler"))
+    menu.add_row("8", t("settings.forecast"))
     menu.add_row("0", t("back"))
 
     console.print(menu)
-    return Prompt.ask(t("your_choice"), choices=["0", "1", "2", "3", "4", "5", "6"], default="0")
+    return Prompt.ask(t("your_choice"), choices=["0", "1", "2", "3", "4", "5", "6", "7", "8"], default="0")
 
 
 def show_quiz_result(correct, total):
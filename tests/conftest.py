@@ -0,0 +1,27 @@
+"""Testler arası ortak fixture'lar."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pytest  # noqa: E402
+
+import db  # noqa: E402
+import i18n  # noqa: E402
+import srs  # noqa: E402
+
+
+@pytest.fixture
+def user_db(tmp_path, monkeypatch):
+    """Geçici kullanıcı DB'si; içerik DB'si (data/content.db) derlenmiş olmalı."""
+    if not db.has_content_db():
+        pytest.skip("content.db yok (python src/data/init_db.py)")
+    db.close_connections()
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "nihongo.db"))
+    monkeypatch.setattr(i18n, "get_scheduler", lambda: "sm2")
+    srs.invalidate_scheduler()
+    db.init_db()
+    yield
+    srs.invalidate_scheduler()
+    db.close_connections()
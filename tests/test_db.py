@@ -0,0 +1,51 @@
+"""db.get_study_cards: seviye filtresi ve bekleyen kartlarda keyset sayfalama."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import db  # noqa: E402
+import srs  # noqa: E402
+
+
+def _make_due(level, count):
+    with db.connection() as conn:
+        ids = [r["id"] for r in conn.execute(
+            "SELECT id FROM vocabulary WHERE level = ? ORDER BY id LIMIT ?", (level, count))]
+    srs.review_cards("vocabulary", ids, 4)
+    with db.transaction() as conn:
+        conn.execute("UPDATE reviews SET next_review = '2000-01-01' WHERE card_id % 2 = 0")
+        conn.execute("UPDATE reviews SET next_review = '2000-01-02' WHERE card_id % 2 = 1")
+        conn.execute("UPDATE reviews SET weak_kanji = 1 WHERE card_id % 3 = 0")
+    return ids
+
+
+def test_due_pages_cover_backlog_in_order(user_db):
+    ids = _make_due("N5", 45)
+    _make_due("N4", 20)
+
+    pages, after = [], None
+    while True:
+        due, new = db.get_study_cards("vocabulary", "N5", new_limit=0, due_limit=10, after=after)
+        assert new == []
+        if not due:
+            break
+        pages.append(due)
+        after = db.due_review_key(due[-1][1])
+
+    assert [len(p) for p in pages] == [10, 10, 10, 10, 5]
+    reviews = [review for page in pages for _, review in page]
+    assert len(reviews) == len({r["id"] for r in reviews})
+    assert {card["id"] for page in pages for card, _ in page} == set(ids)
+    keys = [(-r["weak_kanji"], r["next_review"], r["id"]) for r in reviews]
+    assert keys == sorted(keys)
+
+
+def test_due_query_follows_index(user_db):
+    query, params = db._due_query("r.*", "vocabulary", "N5", after=(1, "2000-01-01", 1))
+    with db.connection() as conn:
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + query, params))
+    assert "idx_reviews_due_order" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,62 @@
+"""kana.romaji_to_hiragana / romaji_readings: n, nn ve ny yazımları."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pytest  # noqa: E402
+
+import kana  # noqa: E402
+
+
+@pytest.mark.parametrize("romaji, hiragana", [
+    ("konnichiha", "こんにちは"),
+    ("konnichiwa", "こんにちわ"),
+    ("onna", "おんな"),
+    ("konnyaku", "こんにゃく"),
+    ("kinyou", "きにょう"),
+    ("gyuunyuu", "ぎゅうにゅう"),
+    ("shinbun", "しんぶん"),
+    ("hon", "ほん"),
+    ("konbann", "こんばん"),
+    ("sen'en", "せんえん"),
+    ("kitte", "きって"),
+    ("matcha", "まっちゃ"),
+])
+def test_romaji_to_hiragana(romaji, hiragana):
+    assert kana.romaji_to_hiragana(romaji) == hiragana
+
+
+@pytest.mark.parametrize("romaji, reading", [
+    ("kinyou", "きんよう"),
+    ("konnichiwa", "こんにちは"),
+    ("konbanwa", "こんばんは"),
+])
+def test_ambiguous_readings(romaji, reading):
+    assert reading in kana.romaji_readings(romaji)
+
+
+def test_nn_before_vowel_is_not_doubled():
+    assert kana.romaji_readings("konnyaku") == ["こんにゃく"]
+    assert kana.romaji_readings("onna") == ["おんな"]
+
+
+def test_unconvertible():
+    assert kana.romaji_to_hiragana("kiny") is None
+    assert kana.romaji_readings("") == []
+
+
+def test_unconvertible_long_input_does_not_backtrack(monkeypatch):
+    # Her "ny" dalı eskiden kalan metni yeniden deniyordu (2^n)
+    text = "kinyo" * 12 + "q"
+    calls = []
+    syllables = kana._syllables
+    monkeypatch.setattr(kana, "_syllables", lambda s, i: calls.append(i) or syllables(s, i))
+    assert kana.romaji_readings(text) == []
+    assert len(calls) == len(text)
+
+
+def test_long_input_is_not_read_as_romaji():
+    assert kana.romaji_readings("a" * (kana.MAX_ROMAJI_INPUT + 1)) == []
+    assert kana.romaji_readings("a" * kana.MAX_ROMAJI_INPUT) == ["あ" * kana.MAX_ROMAJI_INPUT]
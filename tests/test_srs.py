@@ -0,0 +1,61 @@
+"""srs.review_cards: toplu planlama ve tek transaction'da yazma."""
+
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pytest  # noqa: E402
+
+import db  # noqa: E402
+import srs  # noqa: E402
+
+
+def _card_ids(limit):
+    with db.connection() as conn:
+        return [r["id"] for r in conn.execute(
+            "SELECT id FROM vocabulary WHERE level = 'N5' ORDER BY id LIMIT ?", (limit,))]
+
+
+def test_review_cards_matches_review_card(user_db):
+    ids = _card_ids(6)
+    qualities = [5, 4, 3, 2, 1, 0]
+    srs.review_cards("vocabulary", ids, 4)
+    result = srs.review_cards("vocabulary", ids, qualities, mode="import")
+
+    rows = db.get_reviews("vocabulary", ids)
+    assert set(rows) == set(ids)
+    first_reps, first_ef, first_ivl = srs.sm2(4, 0, 2.5, 0)
+    for card_id, quality in zip(ids, qualities):
+        reps, ef, _ = srs.sm2(quality, first_reps, first_ef, first_ivl)
+        row = rows[card_id]
+        assert (row["repetitions"], row["ease_factor"]) == (reps, ef)
+        assert (row["interval"], row["next_review"]) == result[card_id]
+        assert row["last_review"] == date.today().isoformat()
+
+    log = db.get_review_log(card_type="vocabulary")
+    assert len(log) == 2 * len(ids)
+    assert [r["quality"] for r in log if r["mode"] == "import"] == qualities
+
+
+def test_review_cards_rejects_bad_quality(user_db):
+    ids = _card_ids(2)
+    with pytest.raises(ValueError):
+        srs.review_cards("vocabulary", ids, [4, 6])
+    assert db.get_reviews("vocabulary", ids) == {}
+
+
+def test_scheduler_is_resolved_once(user_db, monkeypatch):
+    names = iter(["fsrs", "sm2"])
+    lookups = []
+    monkeypatch.setattr(srs.i18n, "get_scheduler", lambda: lookups.append(1) or next(names))
+    ids = _card_ids(3)
+    for card_id in ids:
+        srs.review_card("vocabulary", card_id, 4)
+    assert len(lookups) == 1
+    assert srs.get_scheduler().name == "fsrs"
+
+    srs.invalidate_scheduler()  # ayar değişti
+    assert srs.get_scheduler().name == "sm2"
+    assert len(lookups) == 2